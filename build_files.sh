@@ -11,3 +11,8 @@ python3.9 manage.py shell -c "from django.contrib.auth import get_user_model; Us
 
 # Collect static files
 python3.9 manage.py collectstatic --noinput --clear
+
+# Compile articles and build thumbnails (on Vercel the stores ship with the
+# build), and check the main pages render. Indexes live in each function
+# instance's memory, so there is nothing to keep from building them here.
+python3.9 manage.py warm_caches --skip indexes
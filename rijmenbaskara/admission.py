@@ -0,0 +1,200 @@
+"""
+Admission control for expensive endpoints.
+
+Each class of heavy work (backups, multi-image uploads, ...) has a fixed
+number of slots shared by every worker on the host. A slot is an advisory
+lock on a file, so it is released automatically if a worker dies. Requests
+wait briefly for a free slot and are shed with 503 once the queue timeout
+passes. Queue depth and admit/shed counts are kept in a small SQLite file so
+they can be reported across workers.
+"""
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: admission control is disabled
+    fcntl = None
+
+_POLL_SECONDS = 0.02
+
+
+def admission_dir() -> Path:
+    configured = getattr(settings, "ADMISSION_DIR", None)
+    return Path(configured) if configured else Path(tempfile.gettempdir()) / "rijmenbaskara-admission"
+
+
+class _Stats:
+    """Cross-worker counters: waiting (gauge), admitted and shed (totals)."""
+
+    def __init__(self, path: Path):
+        self.path = str(path)
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS stats ("
+                " name TEXT PRIMARY KEY, waiting INTEGER NOT NULL DEFAULT 0,"
+                " admitted INTEGER NOT NULL DEFAULT 0, shed INTEGER NOT NULL DEFAULT 0,"
+                " wait_ms_total REAL NOT NULL DEFAULT 0)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def bump(self, name, waiting=0, admitted=0, shed=0, wait_ms=0.0):
+        try:
+            self._conn().execute(
+                "INSERT INTO stats (name, waiting, admitted, shed, wait_ms_total) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT(name) DO UPDATE SET waiting = max(0, waiting + excluded.waiting),"
+                " admitted = admitted + excluded.admitted, shed = shed + excluded.shed,"
+                " wait_ms_total = wait_ms_total + excluded.wait_ms_total",
+                (name, waiting, admitted, shed, wait_ms),
+            )
+        except sqlite3.Error:
+            pass  # Stats are best-effort; never fail a request over them
+
+    def read(self):
+        try:
+            rows = self._conn().execute(
+                "SELECT name, waiting, admitted, shed, wait_ms_total FROM stats"
+            ).fetchall()
+        except sqlite3.Error:
+            return {}
+        return {
+            name: {"waiting": waiting, "admitted": admitted, "shed": shed, "wait_ms_total": round(wait_ms, 1)}
+            for name, waiting, admitted, shed, wait_ms in rows
+        }
+
+
+class AdmissionClass:
+    """One entry of ``settings.ADMISSION_CLASSES``."""
+
+    def __init__(self, name: str, config: dict, directory: Path, stats: _Stats):
+        self.name = name
+        self.views = set(config.get("views", ()))
+        self.methods = {m.upper() for m in config.get("methods", ("GET", "POST"))}
+        self.limit = int(config.get("limit", 1))
+        self.queue_timeout = float(config.get("queue_timeout", 2.0))
+        self.retry_after = int(config.get("retry_after", 10))
+        self.directory = directory / name
+        self.stats = stats
+
+    def applies(self, url_name, method) -> bool:
+        return url_name in self.views and method in self.methods
+
+    def _slot_paths(self):
+        return [self.directory / f"slot-{n}" for n in range(self.limit)]
+
+    def _try_slots(self):
+        for path in self._slot_paths():
+            fh = open(path, "a")
+            try:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                fh.close()
+                continue
+            return fh
+        return None
+
+    def acquire(self):
+        """
+        Wait up to ``queue_timeout`` for a slot. Returns a slot handle to pass
+        to ``release``, ``True`` when admission control is unavailable, or
+        ``None`` if the request should be shed.
+        """
+        if fcntl is None:
+            return True
+        self.directory.mkdir(parents=True, exist_ok=True)
+        slot = self._try_slots()
+        if slot is not None:
+            self.stats.bump(self.name, admitted=1)
+            return slot
+
+        started = time.monotonic()
+        deadline = started + self.queue_timeout
+        self.stats.bump(self.name, waiting=1)
+        try:
+            while time.monotonic() < deadline:
+                time.sleep(_POLL_SECONDS)
+                slot = self._try_slots()
+                if slot is not None:
+                    waited = (time.monotonic() - started) * 1000
+                    self.stats.bump(self.name, admitted=1, wait_ms=waited)
+                    return slot
+        finally:
+            self.stats.bump(self.name, waiting=-1)
+        self.stats.bump(self.name, shed=1)
+        return None
+
+    @staticmethod
+    def release(slot):
+        if slot is None or slot is True:
+            return
+        try:
+            fcntl.flock(slot.fileno(), fcntl.LOCK_UN)
+        finally:
+            slot.close()
+
+    def running(self) -> int:
+        """Slots currently held, probed without taking them for long."""
+        if fcntl is None or not self.directory.exists():
+            return 0
+        busy = 0
+        for path in self._slot_paths():
+            if not path.exists():
+                continue
+            with open(path, "a") as fh:
+                try:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+                except OSError:
+                    busy += 1
+        return busy
+
+
+class Governor:
+    def __init__(self, classes=None):
+        directory = admission_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        self.stats = _Stats(directory / "stats.sqlite3")
+        config = classes if classes is not None else getattr(settings, "ADMISSION_CLASSES", {})
+        self.classes = [AdmissionClass(name, conf, directory, self.stats) for name, conf in config.items()]
+
+    def match(self, url_name, method):
+        for admission_class in self.classes:
+            if admission_class.applies(url_name, method):
+                return admission_class
+        return None
+
+    def report(self) -> dict:
+        stats = self.stats.read()
+        report = {}
+        for admission_class in self.classes:
+            entry = {"limit": admission_class.limit, "running": admission_class.running(),
+                     "waiting": 0, "admitted": 0, "shed": 0, "wait_ms_total": 0}
+            entry.update(stats.get(admission_class.name, {}))
+            report[admission_class.name] = entry
+        return report
+
+
+_governor = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> Governor:
+    global _governor
+    if _governor is None:
+        with _governor_lock:
+            if _governor is None:
+                _governor = Governor()
+    return _governor
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'rijmenbaskara.settings')
 
 application = get_asgi_application()
+
+# 103 Early Hints for servers that support them (imported after setup)
+from rijmenbaskara.hints import EarlyHints  # noqa: E402
+
+application = EarlyHints(application)
@@ -0,0 +1,263 @@
+"""
+Per-page static bundles.
+
+``build()`` concatenates and minifies the stylesheets and scripts listed in
+``BUNDLES`` into ``static/bundles/`` and, for pages with a ``template``,
+extracts the critical CSS: the rules whose selectors only use classes, ids
+and tags found above the ``{# critical-fold #}`` marker of that template.
+``collectstatic`` runs the build first, so the static storage gives the
+bundles content-hashed names and WhiteNoise precompressed gzip/brotli copies.
+At runtime ``stylesheet_urls``/``script_urls`` point at the collected bundles,
+or at the source files until they exist.
+
+``rcssmin`` and ``rjsmin`` are used when installed (optional); otherwise a
+conservative built-in pass strips comments and indentation only.
+"""
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+
+try:
+    import rcssmin
+except ImportError:  # Optional: fall back to the built-in CSS pass
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:  # Optional: fall back to the built-in JS pass
+    rjsmin = None
+
+OUTPUT_DIR = "bundles"
+FOLD_MARKER = "{# critical-fold #}"
+
+BUNDLES = {
+    "home": {
+        "css": ["css/base.css", "css/home.css"],
+        "js": ["js/csrf-fill.js", "js/sw-register.js", "js/theme-toggle.js", "js/home.js"],
+        "template": "home.html",
+    },
+    "works": {
+        "css": ["css/base.css", "css/works.css"],
+        "js": ["js/csrf-fill.js", "js/sw-register.js", "js/theme-toggle.js", "js/lightbox.js", "js/carousel.js", "js/filter.js", "js/projects-loader.js"],
+        "template": "works.html",
+    },
+    "articles": {
+        "css": ["css/base.css", "css/articles.css"],
+        "js": ["js/csrf-fill.js", "js/sw-register.js", "js/theme-toggle.js", "js/search-suggest.js"],
+        "template": "articles.html",
+    },
+    "article": {
+        "css": ["css/base.css", "css/articles.css"],
+        "js": ["js/csrf-fill.js", "js/sw-register.js", "js/theme-toggle.js"],
+    },
+    "about": {
+        "css": ["css/base.css", "css/about.css"],
+        "js": ["js/csrf-fill.js", "js/sw-register.js", "js/theme-toggle.js"],
+    },
+    "contact": {
+        "css": ["css/base.css", "css/contact-page.css"],
+        "js": ["js/csrf-fill.js", "js/sw-register.js", "js/theme-toggle.js"],
+    },
+}
+
+# Always part of the critical set: the document itself and theme switching
+BASE_TAGS = {"html", "body", "*"}
+
+_CSS_TOKEN_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/|\s+', re.S)
+_CSS_PUNCT_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|\s*([{};,])\s*', re.S)
+_CLASS_ATTR_RE = re.compile(r'\bclass="([^"]*)"')
+_ID_ATTR_RE = re.compile(r'\bid="([^"{]*)"')
+_TAG_RE = re.compile(r"<([a-zA-Z][a-zA-Z0-9]*)")
+_INCLUDE_RE = re.compile(r"""{%\s*include\s+["']([^"']+)["'].*?%}""")
+_TEMPLATE_BITS_RE = re.compile(r"{%.*?%}|{{.*?}}|{#.*?#}", re.S)
+_PSEUDO_RE = re.compile(r"::?[\w-]+(?:\([^)]*\))?")
+_ATTR_SEL_RE = re.compile(r"\[[^\]]*\]")
+_KEYFRAMES_RE = re.compile(r"@(?:-webkit-)?keyframes\s+([\w-]+)")
+
+
+def source_dir() -> Path:
+    return Path(settings.BASE_DIR) / "static"
+
+
+def output_dir() -> Path:
+    return source_dir() / OUTPUT_DIR
+
+
+def bundle_path(name: str, kind: str) -> str:
+    """Static path of a bundle, e.g. ``bundles/works.css`` or ``bundles/works.critical.css``."""
+    return f"{OUTPUT_DIR}/{name}.{kind}"
+
+
+_collected = {}
+
+
+def collected_text(path: str):
+    """Contents of collected static file ``path``, or ``None``; read once per process."""
+    if path not in _collected:
+        try:
+            with staticfiles_storage.open(path) as fh:
+                _collected[path] = fh.read().decode("utf-8")
+        except (OSError, ValueError):
+            _collected[path] = None
+    return _collected[path]
+
+
+def use_bundles(name: str) -> bool:
+    """Whether page ``name`` should reference its built bundle rather than the source files."""
+    # The critical CSS (or the bundle itself) stands in for the whole build
+    spec = BUNDLES[name]
+    marker = bundle_path(name, "critical.css" if spec.get("template") else "css")
+    return settings.ASSET_BUNDLES and collected_text(marker) is not None
+
+
+def stylesheet_urls(name: str):
+    if use_bundles(name):
+        return [static(bundle_path(name, "css"))]
+    return [static(path) for path in BUNDLES[name]["css"]]
+
+
+def script_urls(name: str):
+    if use_bundles(name):
+        return [static(bundle_path(name, "js"))]
+    return [static(path) for path in BUNDLES[name].get("js", [])]
+
+
+def minify_css(text: str) -> str:
+    if rcssmin is not None:
+        return rcssmin.cssmin(text)
+    # Drop comments and collapse whitespace, leaving strings alone
+    text = _CSS_TOKEN_RE.sub(lambda m: m.group(1) or ("" if m.group(0).startswith("/*") else " "), text)
+    text = _CSS_PUNCT_RE.sub(lambda m: m.group(1) or m.group(2), text)
+    return text.replace(";}", "}").strip()
+
+
+def minify_js(text: str) -> str:
+    if rjsmin is not None:
+        return rjsmin.jsmin(text)
+    # Only whole-line comments, indentation and blank lines; multi-line
+    # template literals are copied verbatim
+    lines, in_template = [], False
+    for line in text.splitlines():
+        stripped = line if in_template else line.strip()
+        if in_template or (stripped and not stripped.startswith("//")):
+            lines.append(stripped)
+        if (line.count("`") - line.count("\\`")) % 2:
+            in_template = not in_template
+    return "\n".join(lines)
+
+
+def _template_source(template_name: str) -> str:
+    """Template text with ``{% include %}`` tags expanded (one level is all the pages use)."""
+    templates = Path(settings.BASE_DIR) / "templates"
+    source = (templates / template_name).read_text(encoding="utf-8")
+    return _INCLUDE_RE.sub(lambda m: (templates / m.group(1)).read_text(encoding="utf-8"), source)
+
+
+def _fold_tokens(template_name: str):
+    """Classes, ids and tag names used above the fold of ``template_name``."""
+    source = _template_source(template_name)
+    body = source[source.find("<body"):]
+    fold = body.find(FOLD_MARKER)
+    body = body[:fold] if fold != -1 else body
+    classes, ids = set(), set()
+    for value in _CLASS_ATTR_RE.findall(body):
+        classes.update(_TEMPLATE_BITS_RE.sub(" ", value).split())
+    for value in _ID_ATTR_RE.findall(body):
+        ids.update(value.split())
+    tags = {tag.lower() for tag in _TAG_RE.findall(body)} | BASE_TAGS
+    return classes, ids, tags
+
+
+def _split_rules(css: str):
+    """Top-level ``(prelude, block)`` pairs of minified CSS."""
+    rules, depth, start, brace = [], 0, 0, 0
+    for index, char in enumerate(css):
+        if char == "{":
+            if depth == 0:
+                brace = index
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                rules.append((css[start:brace].strip(), css[brace + 1:index]))
+                start = index + 1
+        elif char == ";" and depth == 0:
+            rules.append((css[start:index].strip(), None))  # @import / @charset
+            start = index + 1
+    return rules
+
+
+def _selector_matches(selector: str, classes, ids, tags) -> bool:
+    selector = _ATTR_SEL_RE.sub("", _PSEUDO_RE.sub("", selector))
+    for compound in re.split(r"[\s>+~]+", selector.strip()):
+        if not compound:
+            continue
+        tag = re.match(r"[a-zA-Z][\w-]*|\*", compound)
+        if tag and tag.group(0).lower() not in tags:
+            return False
+        if any(name not in classes for name in re.findall(r"\.([\w-]+)", compound)):
+            return False
+        if any(name not in ids for name in re.findall(r"#([\w-]+)", compound)):
+            return False
+    return True
+
+
+def _critical_rules(css: str, classes, ids, tags, keyframes: dict) -> str:
+    out = []
+    for prelude, block in _split_rules(css):
+        if block is None:
+            out.append(prelude + ";")
+        elif prelude.startswith(("@media", "@supports")):
+            inner = _critical_rules(block, classes, ids, tags, keyframes)
+            if inner:
+                out.append(f"{prelude}{{{inner}}}")
+        elif prelude.startswith("@font-face") or prelude.startswith(":root"):
+            out.append(f"{prelude}{{{block}}}")
+        elif prelude.startswith("@"):
+            name = _KEYFRAMES_RE.match(prelude)
+            if name:
+                keyframes[name.group(1)] = f"{prelude}{{{block}}}"
+        elif any(_selector_matches(sel, classes, ids, tags) for sel in prelude.split(",")):
+            out.append(f"{prelude}{{{block}}}")
+    return "".join(out)
+
+
+def critical_css(css: str, template_name: str) -> str:
+    """Rules of (minified) ``css`` needed to paint the part of the page above the fold."""
+    classes, ids, tags = _fold_tokens(template_name)
+    keyframes = {}
+    critical = _critical_rules(css, classes, ids, tags, keyframes)
+    used = [rule for name, rule in keyframes.items() if re.search(rf"\b{re.escape(name)}\b", critical)]
+    return critical + "".join(used)
+
+
+def _concat(paths, minify, separator):
+    parts = []
+    for path in paths:
+        parts.append(minify((source_dir() / path).read_text(encoding="utf-8")))
+    return separator.join(parts)
+
+
+def build(names=None):
+    """Write the bundles (all, or just ``names``) and return ``{static path: bytes}``."""
+    target = output_dir()
+    target.mkdir(parents=True, exist_ok=True)
+    written = {}
+
+    def write(path, text):
+        (source_dir() / path).write_text(text, encoding="utf-8")
+        written[path] = len(text.encode("utf-8"))
+
+    for name in names or BUNDLES:
+        spec = BUNDLES[name]
+        css = _concat(spec.get("css", []), minify_css, "\n")
+        write(bundle_path(name, "css"), css)
+        if spec.get("js"):
+            # Separate files stay separate statements when concatenated
+            write(bundle_path(name, "js"), _concat(spec["js"], minify_js, ";\n") + ";\n")
+        if spec.get("template"):
+            write(bundle_path(name, "critical.css"), critical_css(css, spec["template"]))
+    return written
@@ -0,0 +1,55 @@
+"""
+Response compression for JSON APIs.
+
+Brotli is used when the client accepts it and the optional ``brotli`` package
+is installed; otherwise gzip, as Django's ``gzip_page`` would.
+"""
+import re
+from functools import wraps
+
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # Optional: fall back to gzip only
+    brotli = None
+
+MIN_SIZE = 200
+_BR_RE = re.compile(r"\bbr\b")
+_GZIP_RE = re.compile(r"\bgzip\b")
+
+
+def compress(request, response):
+    if response.streaming or response.status_code != 200 or response.has_header("Content-Encoding"):
+        return response
+    if len(response.content) < MIN_SIZE:
+        return response
+
+    patch_vary_headers(response, ("Accept-Encoding",))
+    accept = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    if brotli is not None and _BR_RE.search(accept):
+        compressed, encoding = brotli.compress(response.content, quality=5), "br"
+    elif _GZIP_RE.search(accept):
+        compressed, encoding = compress_string(response.content), "gzip"
+    else:
+        return response
+    if len(compressed) >= len(response.content):
+        return response
+
+    response.content = compressed
+    response["Content-Length"] = str(len(compressed))
+    response["Content-Encoding"] = encoding
+    # The encoded body is not byte-identical to the original representation
+    etag = response.get("ETag")
+    if etag and etag.startswith('"'):
+        response["ETag"] = "W/" + etag
+    return response
+
+
+def compress_response(view_func):
+    """Decorator: compress the view's response with brotli or gzip."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        return compress(request, view_func(request, *args, **kwargs))
+    return wrapper
@@ -0,0 +1,58 @@
+"""
+Small derivatives of project images for thumbnail strips.
+
+Derivatives are WebP files under ``static/images/thumbs/`` named after the
+source image and the derivative width. They are made with Pillow when it is
+installed (optional); without it, or for images that have no derivative
+yet, callers fall back to the original image.
+"""
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    from PIL import Image
+except ImportError:  # Optional: thumbnail strips then use the original images
+    Image = None
+
+THUMB_WIDTH = 160
+THUMB_QUALITY = 70
+
+
+def images_dir() -> Path:
+    return Path(settings.BASE_DIR) / "static" / "images"
+
+
+def thumb_name(image_name: str, width=THUMB_WIDTH) -> str:
+    return f"thumbs/{Path(image_name).stem}-{width}.webp"
+
+
+def make_thumbnail(image_name: str, width=THUMB_WIDTH, force=False):
+    """
+    Write the derivative for ``static/images/<image_name>`` and return its name
+    relative to ``static/images``, or ``None`` when it cannot be made.
+    """
+    if Image is None:
+        return None
+    source = images_dir() / image_name
+    target = images_dir() / thumb_name(image_name, width)
+    if target.exists() and not force:
+        return thumb_name(image_name, width)
+    try:
+        with Image.open(source) as img:
+            img.draft("RGB", (width * 2, width * 2))  # Cheap JPEG downscale while decoding
+            img = img.convert("RGB")
+            img.thumbnail((width, width * 2))
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_name(f".{target.name}.tmp")
+            img.save(tmp, "WEBP", quality=THUMB_QUALITY, method=4)
+            tmp.replace(target)
+    except (OSError, ValueError):
+        return None
+    return thumb_name(image_name, width)
+
+
+def thumbnail_for(image_name: str, width=THUMB_WIDTH) -> str:
+    """Derivative name if one exists on disk, else the original image name."""
+    name = thumb_name(image_name, width)
+    return name if (images_dir() / name).exists() else image_name
@@ -0,0 +1,192 @@
+"""
+Near-duplicate images: the same photo stored again at another size or
+re-encoded, which byte hashes (``content_hash``) do not catch.
+
+Every image in the metadata index carries a 64-bit perceptual hash
+(``imagemeta.perceptual_hash``); two images are near-duplicates when their
+hashes differ in at most ``distance`` bits (Hamming distance).
+
+``HashIndex`` answers both questions that matter here:
+
+- ``nearest(value)``: is this upload already stored? One XOR and popcount
+  over every hash, vectorized with NumPy (optional; plain ints otherwise);
+- ``pairs()``: every near-duplicate pair in the library. Comparing all
+  pairs is quadratic, so hashes are split into ``distance + 1`` bands: by
+  pigeonhole, two hashes within ``distance`` bits agree exactly on at least
+  one band, so only hashes sharing a band value are compared.
+"""
+import threading
+
+from django.conf import settings
+
+from . import imagemeta, media
+
+try:
+    import numpy as np
+except ImportError:  # Optional: the same search in plain Python, just slower
+    np = None
+
+HASH_BITS = 64
+DISTANCE = 6  # Default threshold; see settings.IMAGE_DUPLICATES
+# Derivatives of other images (derivatives.make_thumbnail) are expected look-alikes
+DERIVED_PREFIXES = ("images/thumbs/",)
+BLOCK_CELLS = 4_000_000  # Distance matrix cells compared at once within a bucket
+
+_cache = {"version": None, "index": None}
+_cache_lock = threading.Lock()
+
+if np is not None:
+    if hasattr(np, "bitwise_count"):  # NumPy 2.0+
+        def _popcount(values):
+            return np.bitwise_count(values)
+    else:
+        _BYTE_BITS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+        def _popcount(values):
+            # Eight bytes per uint64; keep the input's shape (1-D in nearest, 2-D blocks in pairs)
+            values = np.ascontiguousarray(values, dtype=np.uint64)
+            return _BYTE_BITS[values.view(np.uint8)].reshape(values.shape + (8,)).sum(axis=-1)
+
+
+def default_distance() -> int:
+    return int((getattr(settings, "IMAGE_DUPLICATES", {}) or {}).get("DISTANCE", DISTANCE))
+
+
+def _bands(distance):
+    """``[(shift, mask)]`` splitting the hash into ``distance + 1`` bands."""
+    count = max(1, min(distance + 1, HASH_BITS))
+    bands, shift = [], 0
+    for band in range(count):
+        width = HASH_BITS // count + (band < HASH_BITS % count)
+        bands.append((shift, (1 << width) - 1))
+        shift += width
+    return bands
+
+
+class HashIndex:
+    def __init__(self, hashes):
+        """``hashes``: ``{key: int}``."""
+        self.keys = sorted(hashes)
+        self.values = [hashes[key] for key in self.keys]
+        self._array = np.array(self.values, dtype=np.uint64) if np is not None else None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def nearest(self, value, distance=None, limit=None):
+        """``[(key, bits)]`` within ``distance`` bits of ``value``, closest first."""
+        distance = default_distance() if distance is None else distance
+        if not self.keys:
+            return []
+        if self._array is not None:
+            bits = _popcount(self._array ^ np.uint64(value))
+            hits = np.flatnonzero(bits <= distance)
+            hits = hits[np.argsort(bits[hits], kind="stable")]
+            found = [(self.keys[i], int(bits[i])) for i in hits]
+        else:
+            found = sorted(
+                ((key, (other ^ value).bit_count()) for key, other in zip(self.keys, self.values)),
+                key=lambda hit: hit[1],
+            )
+            found = [hit for hit in found if hit[1] <= distance]
+        return found[:limit] if limit else found
+
+    def pairs(self, distance=None):
+        """``[(key_a, key_b, bits)]`` for every pair within ``distance`` bits, closest first."""
+        distance = default_distance() if distance is None else distance
+        found = {}
+        for shift, mask in _bands(distance):
+            for group in self._buckets(shift, mask):
+                for i, j, bits in self._close_pairs(group, distance):
+                    found[(min(i, j), max(i, j))] = bits
+        return sorted(
+            ((self.keys[i], self.keys[j], bits) for (i, j), bits in found.items()),
+            key=lambda pair: (pair[2], pair[0], pair[1]),
+        )
+
+    def _buckets(self, shift, mask):
+        """Index lists of hashes sharing one band value (only groups of two or more)."""
+        if self._array is not None:
+            band = (self._array >> np.uint64(shift)) & np.uint64(mask)
+            order = np.argsort(band, kind="stable")
+            ordered = band[order]
+            starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+            ends = np.r_[starts[1:], len(ordered)]
+            return [order[start:end] for start, end in zip(starts, ends) if end - start > 1]
+        buckets = {}
+        for i, value in enumerate(self.values):
+            buckets.setdefault((value >> shift) & mask, []).append(i)
+        return [group for group in buckets.values() if len(group) > 1]
+
+    def _close_pairs(self, group, distance):
+        """``(i, j, bits)`` for pairs of ``group`` within ``distance``."""
+        if self._array is None:
+            for position, i in enumerate(group):
+                for j in group[position + 1:]:
+                    bits = (self.values[i] ^ self.values[j]).bit_count()
+                    if bits <= distance:
+                        yield i, j, bits
+            return
+        values = self._array[group]
+        rows = max(1, BLOCK_CELLS // len(group))
+        for start in range(0, len(group) - 1, rows):
+            # Rows start..start+rows against every later member of the group
+            bits = _popcount(values[start:start + rows, None] ^ values[None, start + 1:])
+            row, col = np.nonzero(bits <= distance)
+            keep = col >= row
+            row, col = row[keep], col[keep]
+            for i, j, b in zip(group[start + row].tolist(), group[start + 1 + col].tolist(), bits[row, col].tolist()):
+                yield i, j, b
+
+
+def clusters(pairs):
+    """Group ``pairs`` into sets of keys that are transitively near-duplicates."""
+    parent = {}
+
+    def find(key):
+        parent.setdefault(key, key)
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for a, b, _ in pairs:
+        parent[find(a)] = find(b)
+    groups = {}
+    for key in parent:
+        groups.setdefault(find(key), set()).add(key)
+    return sorted((sorted(group) for group in groups.values()), key=lambda group: (-len(group), group))
+
+
+def index() -> HashIndex:
+    """Index over every hashed image, rebuilt when the metadata index changes."""
+    version = imagemeta.version()
+    with _cache_lock:
+        if _cache["index"] is None or _cache["version"] != version:
+            hashes = {
+                key: int(entry["phash"], 16)
+                for key, entry in imagemeta.entries().items()
+                if entry.get("phash") and not key.startswith(DERIVED_PREFIXES)
+            }
+            _cache["index"], _cache["version"] = HashIndex(hashes), version
+        return _cache["index"]
+
+
+def hash_upload(file_obj):
+    """Perceptual hash of an uploaded file, or ``None`` if it cannot be decoded here."""
+    if imagemeta.Image is None or file_obj is None or isinstance(file_obj, media.StoredMedia):
+        return None
+    try:
+        file_obj.seek(0)
+        with imagemeta.Image.open(file_obj) as img:
+            return imagemeta.perceptual_hash(imagemeta.downscale(img))
+    except (OSError, ValueError):
+        return None
+    finally:
+        file_obj.seek(0)
+
+
+def find_for_upload(file_obj, distance=None, limit=3):
+    """``[(key, bits)]`` of stored images that ``file_obj`` nearly duplicates."""
+    value = hash_upload(file_obj)
+    return [] if value is None else index().nearest(value, distance, limit)
@@ -0,0 +1,148 @@
+"""
+In-memory facet index for filtering works (projects, gallery items).
+
+Every document carries values for the ``FIELDS`` (``facets_from`` splits
+``Genre:``/``Quality:`` tags out of the free tags) and a sort key.
+Postings map each ``(field, value)`` to the set of documents with it, so
+the unfiltered counts are just posting sizes and a filter is a handful of
+set unions and intersections, however large the catalogue.
+
+Values of one field are ORed and fields are ANDed. Counts are disjunctive:
+a field's counts are taken over the documents matching every *other*
+field's selection, so the controls show what choosing another value gives.
+
+Like ``search.PrefixIndex``, documents are upserted and removed one at a
+time, and ``sync`` diffs a whole source against what is indexed.
+"""
+import threading
+from collections import namedtuple
+
+from .search import normalize
+
+FIELDS = ("category", "genre", "quality", "tag")
+
+_TAG_FIELDS = {"genre": "genre", "quality": "quality"}
+
+FacetResult = namedtuple("FacetResult", "items total counts next_key")
+
+
+def facets_from(tags=(), category=None) -> dict:
+    """``{field: [values]}`` for a category and tags such as ``["Genre:Mech", "Quality:Showcase", "Tau"]``."""
+    values = {field: set() for field in FIELDS}
+    if category:
+        values["category"].add(str(category))
+    for tag in tags or []:
+        tag = str(tag).strip()
+        prefix, sep, rest = tag.partition(":")
+        field = _TAG_FIELDS.get(prefix.strip().lower()) if sep else None
+        if field and rest.strip():
+            values[field].add(rest.strip())
+        elif tag:
+            values["tag"].add(tag)
+    return {field: sorted(found) for field, found in values.items() if found}
+
+
+class FacetIndex:
+    def __init__(self):
+        self._docs = {}  # doc_id -> (facets, normalized text, sort key, payload)
+        self._postings = {}  # (field, value) -> {doc_id}
+        self._lock = threading.Lock()
+        self.signature = None  # Version of the source last synced (set by the caller)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _remove_locked(self, doc_id):
+        entry = self._docs.pop(doc_id, None)
+        if entry is None:
+            return
+        for field, values in entry[0].items():
+            for value in values:
+                posting = self._postings.get((field, value))
+                if posting is not None:
+                    posting.discard(doc_id)
+                    if not posting:
+                        del self._postings[(field, value)]
+
+    def upsert(self, doc_id, facets, text="", sort_key=(), payload=None):
+        doc_id = str(doc_id)
+        entry = (facets, normalize(text), tuple(sort_key), payload)
+        with self._lock:
+            if self._docs.get(doc_id) == entry:
+                return
+            self._remove_locked(doc_id)
+            self._docs[doc_id] = entry
+            for field, values in facets.items():
+                for value in values:
+                    self._postings.setdefault((field, value), set()).add(doc_id)
+
+    def remove(self, doc_id):
+        with self._lock:
+            self._remove_locked(str(doc_id))
+
+    def sync(self, documents):
+        """Make the index match ``{doc_id: (facets, text, sort_key, payload)}``."""
+        documents = {str(doc_id): value for doc_id, value in documents.items()}
+        for doc_id in [doc_id for doc_id in list(self._docs) if doc_id not in documents]:
+            self.remove(doc_id)
+        for doc_id, (facets, text, sort_key, payload) in documents.items():
+            self.upsert(doc_id, facets, text, sort_key, payload)
+
+    def counts(self):
+        """Documents per value of every field, with nothing selected."""
+        with self._lock:
+            return self._counts_locked(self._postings.items())
+
+    @staticmethod
+    def _counts_locked(sized):
+        counts = {field: {} for field in FIELDS}
+        for (field, value), docs in sized:
+            size = docs if isinstance(docs, int) else len(docs)
+            if size:
+                counts[field][value] = size
+        return {field: dict(sorted(values.items())) for field, values in counts.items()}
+
+    def query(self, selected=None, text="", limit=None, after=None):
+        """
+        Documents matching ``selected`` (``{field: [values]}``) and ``text``,
+        ordered by sort key, newest (highest) first. ``after`` is the sort key
+        of the last document already returned; ``next_key`` is set when more
+        follow the ``limit`` returned.
+        """
+        selected = {field: set(values) for field, values in (selected or {}).items() if values}
+        needle = normalize(text)
+        with self._lock:
+            if not selected and not needle:
+                matched = set(self._docs)
+                counts = self._counts_locked(self._postings.items())
+            else:
+                universe = (
+                    {doc_id for doc_id, entry in self._docs.items() if needle in entry[1]}
+                    if needle else set(self._docs)
+                )
+                per_field = {}
+                for field, values in selected.items():
+                    docs = set()
+                    for value in values:
+                        docs |= self._postings.get((field, value), set())
+                    per_field[field] = docs
+                matched = universe.intersection(*per_field.values())
+                bases = {
+                    field: universe.intersection(*(docs for other, docs in per_field.items() if other != field))
+                    for field in FIELDS
+                }
+                counts = self._counts_locked(
+                    ((field, value), len(docs & bases[field])) for (field, value), docs in self._postings.items()
+                )
+                for field, values in selected.items():
+                    for value in values:
+                        counts[field].setdefault(value, 0)  # Keep the selection visible
+
+            ordered = sorted(matched, key=lambda doc_id: (self._docs[doc_id][2], doc_id), reverse=True)
+            if after is not None:
+                after = tuple(after)
+                ordered = [doc_id for doc_id in ordered if self._docs[doc_id][2] < after]
+            page = ordered[:limit] if limit else ordered
+            next_key = self._docs[page[-1]][2] if page and len(page) < len(ordered) else None
+            items = [self._docs[doc_id][3] for doc_id in page]
+        return FacetResult(items, len(matched), counts, next_key)
@@ -0,0 +1,104 @@
+"""
+Resource hints for HTML pages: ``Link`` headers that let the browser fetch
+fonts, the page's stylesheet and its largest image before it has parsed the
+HTML, and prefetch the pages a reader is likely to open next.
+
+Hints come from two places:
+
+- ``page_hints(url_name)``: known from the route alone (font origins, the
+  page's CSS bundle), so they can also go out as a ``103 Early Hints``
+  response before the view runs (see ``EarlyHints``);
+- ``add(request, ...)``: added by a view once it knows its data, e.g. the
+  home hero image or an article's related posts.
+
+``middleware.ResourceHintsMiddleware`` merges both into the response's
+``Link`` header; CDNs such as Cloudflare also turn that header into 103s.
+"""
+import logging
+
+from django.conf import settings
+from django.urls import Resolver404, resolve
+from django.utils.encoding import iri_to_uri
+
+from . import assets
+
+logger = logging.getLogger(__name__)
+
+FONT_ORIGINS = ("https://fonts.googleapis.com", "https://fonts.gstatic.com")
+
+# URL name -> page bundle (see assets.BUNDLES)
+PAGE_BUNDLES = {
+    "home": "home",
+    "works": "works",
+    "articles": "articles",
+    "article_detail": "article",
+    "about": "about",
+    "contact": "contact",
+}
+
+MAX_HINTS = 12  # Keep the header (and the 103) small
+
+
+def link(url: str, rel: str, **params) -> str:
+    """One ``Link`` header value; ``as_`` is written as ``as``, ``True`` as a bare flag."""
+    parts = [f"<{iri_to_uri(url)}>", f"rel={rel}"]
+    for name, value in params.items():
+        name = name.rstrip("_")
+        if value is True:
+            parts.append(name)
+        elif value:
+            parts.append(f'{name}="{value}"' if any(c in str(value) for c in " ,;") else f"{name}={value}")
+    return "; ".join(parts)
+
+
+def page_hints(url_name: str):
+    """Hints for ``url_name`` that do not depend on the view's data."""
+    bundle = PAGE_BUNDLES.get(url_name)
+    if bundle is None:
+        return []
+    hints = [link(origin, "preconnect", crossorigin=origin.endswith("gstatic.com")) for origin in FONT_ORIGINS]
+    hints += [link(href, "preload", as_="style") for href in assets.stylesheet_urls(bundle)]
+    return hints
+
+
+def add(request, url: str, rel: str = "preload", **params):
+    """Queue a hint for this response, e.g. ``add(request, src, as_="image", fetchpriority="high")``."""
+    if url:
+        request.__dict__.setdefault("_resource_hints", []).append(link(url, rel, **params))
+
+
+def for_request(request):
+    match = getattr(request, "resolver_match", None)
+    hints = page_hints(match.url_name) if match else []
+    hints += request.__dict__.get("_resource_hints", [])
+    return list(dict.fromkeys(hints))[:MAX_HINTS]
+
+
+class EarlyHints:
+    """
+    ASGI wrapper sending ``103 Early Hints`` with the route's ``page_hints``
+    while Django renders the page. Only servers implementing the
+    ``http.response.early_hint`` ASGI extension (e.g. Hypercorn) advertise
+    it; on others, and under WSGI, pages still get the ``Link`` header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and scope.get("method") == "GET"
+            and "http.response.early_hint" in scope.get("extensions", {})
+            and getattr(settings, "EARLY_HINTS", True)
+        ):
+            try:
+                hints = page_hints(resolve(scope["path"]).url_name)
+            except Resolver404:
+                hints = []
+            if hints:
+                try:
+                    await send({"type": "http.response.early_hint", "links": [h.encode("latin-1") for h in hints]})
+                except Exception:
+                    logger.debug("Early hints not sent for %s", scope["path"], exc_info=True)
+        await self.app(scope, receive, send)
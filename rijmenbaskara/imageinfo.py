@@ -0,0 +1,100 @@
+"""
+Image format and dimension sniffing from file headers.
+
+Only the first few kilobytes are needed, so this works on the first chunk of
+an upload before the rest of the body has arrived.
+"""
+import struct
+
+# JPEG start-of-frame markers that carry the image size
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+FORMAT_EXTS = {
+    "jpeg": {".jpg", ".jpeg"},
+    "png": {".png"},
+    "gif": {".gif"},
+    "webp": {".webp"},
+    "bmp": {".bmp"},
+    "tiff": {".tif", ".tiff"},
+}
+
+
+def sniff_format(header: bytes):
+    """Return a format name from magic bytes, or ``None`` if not an image we accept."""
+    if header.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    if header[:2] == b"BM":
+        return "bmp"
+    if header[:4] in (b"II*\x00", b"MM\x00*"):
+        return "tiff"
+    return None
+
+
+def _jpeg_size(data: bytes):
+    i = 2
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            i += 2
+            continue
+        (length,) = struct.unpack(">H", data[i + 2:i + 4])
+        if marker in _JPEG_SOF:
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            return width, height
+        i += 2 + length
+    return None
+
+
+def _webp_size(data: bytes):
+    chunk = data[12:16]
+    if chunk == b"VP8 " and len(data) >= 30:
+        width, height = struct.unpack("<HH", data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and len(data) >= 25:
+        bits = int.from_bytes(data[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X" and len(data) >= 30:
+        width = int.from_bytes(data[24:27], "little") + 1
+        height = int.from_bytes(data[27:30], "little") + 1
+        return width, height
+    return None
+
+
+def sniff_dimensions(header: bytes, fmt=None):
+    """Return ``(width, height)`` if it can be read from ``header``, else ``None``."""
+    fmt = fmt or sniff_format(header)
+    try:
+        if fmt == "png" and len(header) >= 24:
+            return struct.unpack(">II", header[16:24])
+        if fmt == "gif" and len(header) >= 10:
+            return struct.unpack("<HH", header[6:10])
+        if fmt == "bmp" and len(header) >= 26:
+            width, height = struct.unpack("<ii", header[18:26])
+            return width, abs(height)
+        if fmt == "jpeg":
+            return _jpeg_size(header)
+        if fmt == "webp":
+            return _webp_size(header)
+    except struct.error:
+        return None
+    return None  # TIFF keeps its size in an IFD that may be anywhere in the file
+
+
+def sniff(header: bytes):
+    """Return ``(format, (width, height) or None)``; format is ``None`` for non-images."""
+    fmt = sniff_format(header)
+    if fmt is None:
+        return None, None
+    return fmt, sniff_dimensions(header, fmt)
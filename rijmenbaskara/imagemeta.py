@@ -0,0 +1,256 @@
+"""
+Image metadata index: width, height, format, byte size, dominant colour, a
+tiny LQIP (low-quality image placeholder, a ~16px WebP data URI) and a
+64-bit perceptual hash (see ``duplicates``) for every image under
+``static/images`` and ``articles_store/covers``.
+
+Entries are keyed like media storage keys (``images/...``, ``covers/...``)
+and stored in ``settings.IMAGE_META_FILE``. ``refresh()`` walks both roots,
+recomputes only files whose mtime or size changed (in a process pool when
+there are many, from ``manage.py build_image_meta``) and drops entries for
+deleted files; ``schedule_refresh()`` does that on a background thread
+after uploads, in-process since only the new files are stale. Reads go
+through ``get()``, which reloads the index when the file changes on disk.
+
+Colour, LQIP and hash need Pillow (optional); without it entries still get the
+format and dimensions from ``imageinfo``.
+"""
+import base64
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+
+from . import imageinfo, media
+from .jsonstore import read_json, store_lock, write_json_atomic
+
+try:
+    from PIL import Image
+except ImportError:  # Optional: entries then carry size and format only
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+LQIP_SIZE = 16  # Longest side of the placeholder, in pixels
+LQIP_QUALITY = 40
+PALETTE_SIZE = 5  # Colours the dominant one is picked from
+POOL_MIN = 8  # Fewer stale files than this are computed in-process
+HEADER_BYTES = 64 * 1024  # Enough for imageinfo to find JPEG dimensions
+SCHEMA = 2  # Bump when entries gain fields: older ones are then recomputed
+IMAGE_EXTS = {ext for exts in imageinfo.FORMAT_EXTS.values() for ext in exts} | {".avif", ".svg"}
+
+_cache = {"signature": None, "entries": {}}
+_cache_lock = threading.Lock()
+_refresh_executor = None
+_refresh_pending = threading.Event()
+
+
+def index_path() -> Path:
+    return Path(settings.IMAGE_META_FILE)
+
+
+def roots():
+    """``{key prefix: directory}`` of the local media roots that are indexed."""
+    return {
+        "images/": Path(settings.BASE_DIR) / "static" / "images",
+        "covers/": Path(settings.MEDIA_ROOT) / "covers",
+    }
+
+
+def perceptual_hash(img) -> int:
+    """
+    64-bit difference hash (dHash) of a PIL image: each bit says whether a
+    pixel of a 9x8 greyscale thumbnail is brighter than its right-hand
+    neighbour. Resizes and re-encodes of one photo land a few bits apart.
+    """
+    pixels = img.convert("L").resize((9, 8), Image.LANCZOS).tobytes()
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = (value << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return value
+
+
+def downscale(img):
+    """Small RGB copy of an open PIL image that colour and hash are taken from."""
+    img.draft("RGB", (LQIP_SIZE * 8, LQIP_SIZE * 8))  # Cheap JPEG downscale while decoding
+    small = img.convert("RGB")
+    small.thumbnail((LQIP_SIZE * 4, LQIP_SIZE * 4))
+    return small
+
+
+def compute(path) -> dict:
+    """Metadata for one image file; keys missing from the result could not be read."""
+    path = Path(path)
+    st = path.stat()
+    entry = {"v": SCHEMA, "bytes": st.st_size, "mtime_ns": st.st_mtime_ns}
+    with path.open("rb") as fh:
+        header = fh.read(HEADER_BYTES)
+    fmt, dimensions = imageinfo.sniff(header)
+    if fmt:
+        entry["format"] = fmt
+    if dimensions:
+        entry["width"], entry["height"] = dimensions
+    if Image is None or fmt is None:
+        return entry
+    try:
+        with Image.open(path) as img:
+            entry["format"] = (img.format or fmt).lower()
+            entry["width"], entry["height"] = img.size
+            small = downscale(img)
+            entry["phash"] = f"{perceptual_hash(small):016x}"
+            # Most common colour of a small median-cut palette
+            palette = small.quantize(PALETTE_SIZE)
+            _, index = max(palette.getcolors())
+            red, green, blue = palette.getpalette()[index * 3:index * 3 + 3]
+            entry["color"] = f"#{red:02x}{green:02x}{blue:02x}"
+            small.thumbnail((LQIP_SIZE, LQIP_SIZE))
+            buffer = io.BytesIO()
+            small.save(buffer, "WEBP", quality=LQIP_QUALITY)
+            entry["lqip"] = "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+    except (OSError, ValueError) as exc:
+        logger.debug("Image metadata for %s incomplete: %s", path, exc)
+    return entry
+
+
+def _compute_path(path: str):
+    # Top-level so process pool workers can unpickle it
+    try:
+        return path, compute(path)
+    except OSError:
+        return path, None
+
+
+def scan():
+    """``{key: (path, mtime_ns, size)}`` for every image file under the roots."""
+    found = {}
+    for prefix, root in roots().items():
+        if not root.is_dir():
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for name in filenames:
+                if name.startswith(".") or Path(name).suffix.lower() not in IMAGE_EXTS:
+                    continue
+                path = Path(dirpath) / name
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                found[prefix + path.relative_to(root).as_posix()] = (path, st.st_mtime_ns, st.st_size)
+    return found
+
+
+def refresh(force=False, workers=None, pool=True):
+    """
+    Bring the index up to date with the files on disk and return
+    ``{"computed": n, "removed": n, "total": n}``. Only files whose mtime or
+    size changed are recomputed, unless ``force``. With ``pool``, many stale
+    files are spread over worker processes (spawned, so the calling
+    process's threads and locks are not inherited).
+    """
+    files = scan()
+    with store_lock(index_path()):
+        entries = read_json(index_path(), {})
+        entries = entries if isinstance(entries, dict) else {}
+    stale = [
+        key for key, (_, mtime_ns, size) in files.items()
+        if force or key not in entries or entries[key].get("v") != SCHEMA
+        or entries[key].get("mtime_ns") != mtime_ns or entries[key].get("bytes") != size
+    ]
+    paths = {str(files[key][0]): key for key in stale}
+    results = {}
+    if pool and len(paths) >= POOL_MIN:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            for path, entry in pool.map(_compute_path, paths, chunksize=4):
+                results[paths[path]] = entry
+    else:
+        for path in paths:
+            results[paths[path]] = _compute_path(path)[1]
+
+    with store_lock(index_path()):
+        # Merge into what is there now: another process may have refreshed meanwhile
+        current = read_json(index_path(), {})
+        current = current if isinstance(current, dict) else {}
+        removed = [key for key in current if key not in files]
+        for key in removed:
+            del current[key]
+        for key, entry in results.items():
+            if entry is not None:
+                current[key] = entry
+        if results or removed or not index_path().exists():
+            write_json_atomic(index_path(), current, indent=None)
+    return {"computed": len([e for e in results.values() if e]), "removed": len(removed), "total": len(current)}
+
+
+def schedule_refresh():
+    """Refresh in the background (after uploads); calls while one is queued are merged."""
+    global _refresh_executor
+    if os.environ.get('VERCEL') or not media.get_storage().is_local or _refresh_pending.is_set():
+        return
+    _refresh_pending.set()
+    with _cache_lock:
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="imagemeta")
+    _refresh_executor.submit(_background_refresh)
+
+
+def _background_refresh():
+    _refresh_pending.clear()  # Uploads from here on need another pass
+    try:
+        refresh(pool=False)
+    except Exception:
+        logger.exception("Image metadata refresh failed")
+
+
+def _entries():
+    try:
+        st = index_path().stat()
+        signature = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        signature = None
+    with _cache_lock:
+        if signature != _cache["signature"]:
+            data = read_json(index_path(), {}) if signature else {}
+            _cache["entries"] = data if isinstance(data, dict) else {}
+            _cache["signature"] = signature
+        return _cache["entries"]
+
+
+def entries() -> dict:
+    """Every entry by media key; treat as read-only."""
+    return _entries()
+
+
+def version() -> int:
+    """Changes whenever the index is rewritten; for ETags of responses that embed metadata."""
+    _entries()
+    return (_cache["signature"] or (0,))[0]
+
+
+def get(key):
+    """Metadata for media key ``key`` (``images/...`` or ``covers/...``), or ``None``."""
+    if not key:
+        return None
+    return _entries().get(key)
+
+
+def key_for(value):
+    """Media key for a key or a cover/image URL on the current backend."""
+    if not value:
+        return None
+    if value.startswith(tuple(roots())):
+        return value
+    return media.key_for_url(value, "covers/") or media.key_for_url(value, "images/")
+
+
+def public(entry):
+    """The fields pages and the API expose (no mtime)."""
+    if not entry:
+        return None
+    return {k: entry[k] for k in ("width", "height", "format", "bytes", "color", "lqip") if k in entry}
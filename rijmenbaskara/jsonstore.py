@@ -0,0 +1,102 @@
+"""
+Crash-safe, multi-process JSON file stores.
+
+Gunicorn runs several workers against the same files, so a plain
+read-modify-write can lose updates. Writers here take an advisory lock on a
+sidecar ``.lock`` file, re-read the current contents, apply their change and
+publish it with an atomic rename. Readers never lock: a rename is atomic, so
+they always see either the old or the new document, never a torn one.
+
+Reads, writes and lock waits are counted against the current request
+(``reqlog.record``) for the slow-request log.
+"""
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from . import reqlog
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: fall back to unlocked writes
+    fcntl = None
+
+
+def _lock_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.lock")
+
+
+@contextmanager
+def store_lock(path: Path):
+    """Hold an exclusive advisory lock for the store at ``path``."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with open(_lock_path(path), "a") as fh:
+        started = time.perf_counter()
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        reqlog.record("json_lock_wait", time.perf_counter() - started, files=1)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def read_json(path: Path, default):
+    """Read a store without locking; returns ``default`` if missing or corrupt."""
+    path = Path(path)
+    started = time.perf_counter()
+    raw = b""
+    try:
+        raw = path.read_bytes()
+        return json.loads(raw.decode("utf-8"))
+    except FileNotFoundError:
+        return default
+    except Exception:
+        return default
+    finally:
+        reqlog.record("json_read", time.perf_counter() - started, files=1, read=len(raw))
+
+
+def write_json_atomic(path: Path, data, indent=2):
+    """Write ``data`` to a temp file in the same directory and rename it over ``path``."""
+    path = Path(path)
+    started = time.perf_counter()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, ensure_ascii=False, indent=indent)
+            fh.flush()
+            os.fsync(fh.fileno())
+            written = os.fstat(fh.fileno()).st_size
+        os.replace(tmp_name, path)
+        reqlog.record("json_write", time.perf_counter() - started, files=1, written=written)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def update_json(path: Path, mutate, default):
+    """
+    Locked read-modify-write of the store at ``path``.
+
+    ``mutate`` receives the freshly read document and returns
+    ``(new_document, result)``; ``new_document`` of ``None`` means "no change".
+    ``result`` is passed back to the caller.
+    """
+    path = Path(path)
+    with store_lock(path):
+        current = read_json(path, default)
+        new_data, result = mutate(current)
+        if new_data is not None:
+            write_json_atomic(path, new_data)
+    return result
@@ -0,0 +1,74 @@
+"""
+Management command to compare media serving paths in-process: Django's
+``static.serve`` (what ``static()`` mounted under DEBUG) against
+``mediaserve.serve`` for full downloads, byte ranges and revalidations.
+Zero-copy ``sendfile`` only happens under gunicorn, so this measures the
+Python side of each path.
+"""
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.views.static import serve as static_serve
+
+from rijmenbaskara import mediaserve
+
+
+class Command(BaseCommand):
+    help = 'Benchmark uploaded-media serving against django.views.static.serve'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=300)
+        parser.add_argument('--image', help='Name under static/images (defaults to the largest image)')
+
+    def handle(self, *args, **options):
+        images = Path(settings.BASE_DIR) / 'static' / 'images'
+        if options['image']:
+            source = images / options['image']
+        else:
+            candidates = [p for p in images.rglob('*') if p.is_file() and not p.name.startswith('.')]
+            source = max(candidates, key=lambda p: p.stat().st_size, default=None)
+        if source is None or not source.is_file():
+            raise CommandError('No image to serve under static/images.')
+        name = source.relative_to(images).as_posix()
+        key = f'images/{name}'
+        factory = RequestFactory()
+
+        def legacy(**headers):
+            return static_serve(factory.get('/', headers=headers), name, document_root=str(images))
+
+        def current(**headers):
+            return mediaserve.serve(factory.get('/', headers=headers), key)
+
+        etag = current()['ETag']
+        last_modified = current()['Last-Modified']
+        cases = [
+            ('full', {}),
+            ('range 64KB', {'Range': 'bytes=0-65535'}),
+            ('revalidate', {'If-None-Match': etag, 'If-Modified-Since': last_modified}),
+        ]
+        self.stdout.write(f"{name} ({source.stat().st_size / 1024:.1f} KB), {options['requests']} requests per case")
+        for label, headers in cases:
+            for path_name, handler in (('static.serve', legacy), ('mediaserve', current)):
+                elapsed, sent, status = self._run(handler, headers, options['requests'])
+                self.stdout.write(
+                    f"  {label:<11} {path_name:<12} status={status} "
+                    f"mean={elapsed / options['requests'] * 1e6:.0f}us "
+                    f"bytes/req={sent // options['requests']}"
+                )
+
+    @staticmethod
+    def _run(handler, headers, total):
+        sent, status = 0, None
+        started = time.perf_counter()
+        for _ in range(total):
+            response = handler(**headers)
+            status = response.status_code
+            if response.streaming:
+                sent += sum(len(chunk) for chunk in response.streaming_content)
+            else:
+                sent += len(response.content)
+            response.close()
+        return time.perf_counter() - started, sent, status
@@ -0,0 +1,47 @@
+"""
+Management command to measure the rate limiter's own per-request overhead.
+Runs the bucket check against a throwaway store and reports latency
+percentiles in microseconds.
+"""
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from rijmenbaskara import ratelimit
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the token-bucket rate limiter check'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20000)
+        parser.add_argument('--clients', type=int, default=500, help='Distinct client keys')
+
+    def handle(self, *args, **options):
+        total, clients = options['requests'], options['clients']
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ratelimit.TokenBucketStore(Path(tmp) / 'bench.sqlite3')
+            rate = ratelimit.parse_rate('600/m')
+            store.take('warmup', rate, 10)
+
+            samples = []
+            denied = 0
+            for n in range(total):
+                key = f"api_gallery_items:10.0.{(n % clients) // 256}.{n % 256}"
+                started = time.perf_counter_ns()
+                allowed, _ = store.take(key, rate, 10)
+                samples.append(time.perf_counter_ns() - started)
+                denied += not allowed
+
+        samples.sort()
+
+        def pct(p):
+            return samples[min(len(samples) - 1, int(len(samples) * p))] / 1000
+
+        self.stdout.write(
+            f"{total} checks over {clients} clients ({denied} denied): "
+            f"p50={pct(0.50):.1f}us p95={pct(0.95):.1f}us p99={pct(0.99):.1f}us "
+            f"mean={sum(samples) / len(samples) / 1000:.1f}us"
+        )
@@ -0,0 +1,28 @@
+"""
+Management command to build or refresh the image metadata index
+(dimensions, dominant colour, blur placeholder) for every local image.
+Unchanged files are skipped by mtime and size; ``--force`` recomputes all.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from rijmenbaskara import imagemeta
+
+
+class Command(BaseCommand):
+    help = 'Index width/height, colour and LQIP of images under static/images and the covers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Recompute entries for unchanged files too')
+        parser.add_argument('--workers', type=int, help='Process pool size (default: CPU count)')
+
+    def handle(self, *args, **options):
+        if imagemeta.Image is None:
+            self.stderr.write('Pillow is not installed: indexing format and dimensions only.')
+        started = time.perf_counter()
+        stats = imagemeta.refresh(force=options['force'], workers=options['workers'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['computed']} computed, {stats['removed']} removed, {stats['total']} indexed "
+            f"in {time.perf_counter() - started:.1f}s ({imagemeta.index_path()})"
+        ))
@@ -0,0 +1,28 @@
+"""
+Management command to create the small WebP derivatives used by project
+thumbnail strips, for images uploaded before derivatives existed.
+Requires Pillow.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from rijmenbaskara import derivatives, views
+
+
+class Command(BaseCommand):
+    help = 'Build thumbnail-strip derivatives for all project images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Rebuild derivatives that already exist')
+
+    def handle(self, *args, **options):
+        if derivatives.Image is None:
+            raise CommandError('Pillow is not installed; derivatives cannot be built.')
+        built = failed = 0
+        names = {name for project in views._load_projects() for name in project.get('images') or []}
+        for name in sorted(names):
+            if derivatives.make_thumbnail(name, force=options['force']):
+                built += 1
+            else:
+                failed += 1
+                self.stderr.write(f'Could not build a derivative for {name}')
+        self.stdout.write(self.style.SUCCESS(f'{built} derivatives ready, {failed} failed'))
@@ -0,0 +1,256 @@
+"""
+Management command to check the public pages against performance budgets.
+
+Every page (``home``, ``works``, ``articles``, ``article_detail``, ``about``,
+``contact``) is rendered through the full middleware stack against a fixed
+synthetic catalogue of projects and articles (built from the images in
+``static/images``, in a temporary store), so results only change when
+templates, views or assets do. For each page it measures:
+
+- ``html_bytes``: the HTML document;
+- ``asset_count`` / ``asset_bytes``: stylesheets, scripts and images it
+  references (same-site files are sized; third-party ones are counted);
+- ``eager_images``: ``<img>`` tags without ``loading="lazy"``;
+- ``blocking_scripts``: ``<script src>`` without ``async``/``defer``/module;
+- ``render_ms``: median server time over ``--repeat`` requests.
+
+``BUDGETS`` holds the limits (``default`` plus per-page overrides; a JSON
+file passed with ``--budgets`` is merged on top). Any breach makes the
+command exit non-zero, so it can gate CI; ``--report`` writes every metric,
+budget and breach as JSON for tracking trends between runs.
+
+``synthetic_store``, ``measure_page`` and ``page_breaches`` are shared with
+``rijmenbaskara/tests/test_budgets.py``, which runs the same checks as part
+of the test suite.
+"""
+import json
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from rijmenbaskara import derivatives, media, views
+
+BUDGETS = {
+    "default": {
+        "html_bytes": 40_000,
+        "asset_count": 30,
+        "asset_bytes": 1_500_000,
+        "eager_images": 2,
+        "blocking_scripts": 0,
+        "render_ms": 250,
+    },
+    "home": {"html_bytes": 60_000, "asset_bytes": 2_500_000, "eager_images": 8},
+    "works": {"html_bytes": 60_000, "asset_count": 60, "asset_bytes": 2_500_000},
+}
+
+PAGES = ("home", "works", "articles", "article_detail", "about", "contact")
+
+PROJECTS = 24
+ARTICLES = 12
+
+
+class _AssetParser(HTMLParser):
+    """Collects the stylesheets, scripts and images a page references."""
+
+    def __init__(self):
+        super().__init__()
+        self.assets = []  # (kind, url)
+        self.eager_images = 0
+        self.blocking_scripts = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "link" and "stylesheet" in (attrs.get("rel") or "").split() and attrs.get("href"):
+            self.assets.append(("css", attrs["href"]))
+        elif tag == "script" and attrs.get("src"):
+            self.assets.append(("js", attrs["src"]))
+            if not ("async" in attrs or "defer" in attrs or attrs.get("type") == "module"):
+                self.blocking_scripts += 1
+        elif tag == "img" and attrs.get("src"):
+            self.assets.append(("img", attrs["src"]))
+            if attrs.get("loading") != "lazy":
+                self.eager_images += 1
+
+
+def _asset_size(url):
+    """Bytes behind a same-site static or media URL, ``None`` for anything else."""
+    path = url.split("?", 1)[0].split("#", 1)[0]
+    if path.startswith(settings.STATIC_URL):
+        name = path[len(settings.STATIC_URL):]
+        found = finders.find(name) or (Path(settings.STATIC_ROOT) / name)
+        if Path(found).is_file():
+            return Path(found).stat().st_size
+        return media.get_storage().size(name) if name.startswith("images/") else None
+    key = media.key_for_url(url, "covers/") or media.key_for_url(url, "images/")
+    return media.get_storage().size(key) if key else None
+
+
+def source_images():
+    """Names of the images in ``static/images`` the synthetic catalogue is built from."""
+    images = sorted(
+        p.name for p in derivatives.images_dir().iterdir()
+        if p.is_file() and p.suffix.lower() in views.IMAGE_EXTS
+    )
+    if not images:
+        raise CommandError('No images in static/images to build the synthetic catalogue from.')
+    return images
+
+
+@contextmanager
+def synthetic_store(images):
+    """Point the stores at a temporary seeded copy; yields the article to render."""
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(views, 'PROJECTS_DIR', Path(tmp) / 'projects'), \
+            mock.patch.object(views, 'ARTICLES_DIR', Path(tmp) / 'articles'), \
+            mock.patch.object(views, 'GALLERIES_DIR', Path(tmp) / 'galleries'), \
+            mock.patch.dict(views._ARTICLE_CACHE, clear=True), \
+            mock.patch.dict(views._FACET_INDEXES, clear=True), \
+            mock.patch.dict(views._GALLERY_SNAPSHOTS, clear=True):
+        yield _seed(images)
+
+
+def page_budgets(page, budgets=BUDGETS):
+    """``default`` limits with ``page``'s overrides on top."""
+    return {**budgets.get('default', {}), **budgets.get(page, {})}
+
+
+def page_breaches(metrics, limits):
+    """``[{metric, value, budget}]`` for every metric over its limit."""
+    return [
+        {'metric': metric, 'value': metrics[metric], 'budget': limit}
+        for metric, limit in limits.items()
+        if metric in metrics and metrics[metric] > limit
+    ]
+
+
+def _seed(images):
+    """Write the synthetic projects and articles; returns the article to render."""
+    views.PROJECTS_DIR.mkdir(parents=True)
+    views.ARTICLES_DIR.mkdir(parents=True)
+    categories = [value for value, _ in views.PROJECT_CATEGORIES]
+    views.write_json_atomic(views._projects_file(), [
+        {
+            "id": f"project-{n:03d}",
+            "title": f"PROJECT {n}",
+            "description": "Synthetic project used to check page budgets.",
+            "category": categories[n % len(categories)],
+            "tags": [f"Genre:{('Mech', 'Infantry', 'Vehicle')[n % 3]}"],
+            "images": [images[(n + k) % len(images)] for k in range(4)],
+            "created_at": f"2026-01-01T00:{n // 60:02d}:{n % 60:02d}",
+        }
+        for n in range(PROJECTS)
+    ])
+    paragraph = "<p>" + "Layering, edge highlights and a final glaze. " * 12 + "</p>"
+    for n in range(ARTICLES):
+        body = paragraph * 4 + "".join(
+            f'<p><img src="{settings.STATIC_URL}images/{images[(n + k) % len(images)]}" alt=""></p>'
+            for k in range(3)
+        )
+        views._save_article({
+            "id": f"article-{n:03d}",
+            "slug": f"article-{n:03d}",
+            "title": f"Article {n}",
+            "tags": [views.TAG_CHOICES[n % len(views.TAG_CHOICES)]],
+            "body_html": body,
+            "cover": None,
+            "created_at": f"2026-02-{n % 28 + 1:02d}T12:00:00",
+        })
+    return f"article-{ARTICLES - 1:03d}"
+
+
+def measure_page(page, article_id, repeat=5):
+    """Render ``page`` ``repeat`` times (after a warm-up) and return its metrics and assets."""
+    url = reverse(page, args=[article_id]) if page == 'article_detail' else reverse(page)
+    hosts = [host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*']
+    client = Client(HTTP_HOST=hosts[0] if hosts else 'testserver')
+    client.get(url)  # Warm-up: template loading, index builds
+    timings, response = [], None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - started) * 1000)
+    if response.status_code != 200:
+        raise CommandError(f'{url} returned {response.status_code}')
+
+    parser = _AssetParser()
+    parser.feed(response.content.decode('utf-8', 'replace'))
+    assets, external = [], 0
+    for kind, asset_url in dict.fromkeys(parser.assets):
+        size = _asset_size(asset_url)
+        external += size is None
+        assets.append({'kind': kind, 'url': asset_url, 'bytes': size})
+    return {
+        'page': page,
+        'url': url,
+        'metrics': {
+            'html_bytes': len(response.content),
+            'asset_count': len(assets),
+            'asset_bytes': sum(asset['bytes'] or 0 for asset in assets),
+            'eager_images': parser.eager_images,
+            'blocking_scripts': parser.blocking_scripts,
+            'render_ms': round(statistics.median(timings), 1),
+        },
+        'external_assets': external,
+        'assets': assets,
+    }
+
+
+class Command(BaseCommand):
+    help = 'Render the public pages against synthetic data and check size/time budgets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budgets', metavar='PATH', help='JSON file of budgets merged over the defaults')
+        parser.add_argument('--report', metavar='PATH', help='Write metrics, budgets and breaches as JSON')
+        parser.add_argument('--repeat', type=int, default=5, help='Requests per page for the render time median')
+        parser.add_argument('--no-fail', action='store_true', help='Report breaches without exiting non-zero')
+
+    def handle(self, *args, **options):
+        budgets = {page: dict(limits) for page, limits in BUDGETS.items()}
+        if options['budgets']:
+            for page, limits in json.loads(Path(options['budgets']).read_text(encoding='utf-8')).items():
+                budgets.setdefault(page, {}).update(limits)
+
+        images = source_images()
+        with synthetic_store(images) as article_id:
+            results = [measure_page(page, article_id, options['repeat']) for page in PAGES]
+
+        breaches = []
+        for result in results:
+            limits = page_budgets(result['page'], budgets)
+            result['budgets'] = limits
+            result['breaches'] = page_breaches(result['metrics'], limits)
+            breaches += [dict(breach, page=result['page']) for breach in result['breaches']]
+            self._print(result)
+
+        if options['report']:
+            report = {
+                'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'dataset': {'projects': PROJECTS, 'articles': ARTICLES, 'images': len(images)},
+                'pages': results,
+                'breaches': breaches,
+            }
+            Path(options['report']).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        if breaches and not options['no_fail']:
+            raise CommandError(f'{len(breaches)} budget(s) exceeded')
+        self.stdout.write(self.style.SUCCESS(f'{len(results)} pages within budget') if not breaches
+                          else self.style.WARNING(f'{len(breaches)} budget(s) exceeded'))
+
+    def _print(self, result):
+        metrics, budgets = result['metrics'], result['budgets']
+        breached = {breach['metric'] for breach in result['breaches']}
+        cells = []
+        for metric, value in metrics.items():
+            cell = f"{metric}={value:,}" + (f"/{budgets[metric]:,}" if metric in budgets else "")
+            cells.append(self.style.ERROR(cell) if metric in breached else cell)
+        self.stdout.write(f"{result['page']:<15} " + "  ".join(cells))
@@ -0,0 +1,25 @@
+"""
+collectstatic that builds the per-page bundles (see ``rijmenbaskara.assets``)
+before collecting, so they get hashed names and compressed copies with
+everything else. Needs ``rijmenbaskara`` listed before
+``django.contrib.staticfiles`` in ``INSTALLED_APPS``.
+"""
+from django.contrib.staticfiles.management.commands.collectstatic import Command as CollectStaticCommand
+
+from rijmenbaskara import assets
+
+
+class Command(CollectStaticCommand):
+    help = CollectStaticCommand.help + ' Builds the per-page CSS/JS bundles first.'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--no-bundles', action='store_true', help='Skip building the CSS/JS bundles')
+
+    def handle(self, **options):
+        if not options['no_bundles']:
+            written = assets.build()
+            if options['verbosity'] >= 1:
+                total = sum(written.values())
+                self.stdout.write(f'Built {len(written)} bundle files ({total / 1024:.1f} KB)')
+        return super().handle(**options)
@@ -0,0 +1,25 @@
+"""
+Management command to (re)compile stored articles into their render-ready form:
+lazy, sized inline images plus excerpt, word count and reading time.
+"""
+from django.core.management.base import BaseCommand
+
+from rijmenbaskara import article_compiler, views
+
+
+class Command(BaseCommand):
+    help = 'Recompile article bodies, excerpts and reading times'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stale-only', action='store_true',
+                            help='Only articles compiled by an older compiler version (or never)')
+
+    def handle(self, *args, **options):
+        compiled = skipped = 0
+        for article in views._load_articles():
+            if options['stale_only'] and article.get('compiled_version') == article_compiler.COMPILER_VERSION:
+                skipped += 1
+                continue
+            views._save_article(article)
+            compiled += 1
+        self.stdout.write(self.style.SUCCESS(f'Compiled {compiled} articles ({skipped} already current)'))
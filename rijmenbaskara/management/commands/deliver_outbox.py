@@ -0,0 +1,36 @@
+"""
+Management command that delivers queued contact-form email from the outbox.
+Run once (e.g. from cron) or with --loop as a long-lived worker process.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from rijmenbaskara import outbox
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued outbox email in batches over a single connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds between polls when idle')
+        parser.add_argument('--batch-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        while True:
+            counts = outbox.deliver_batch(batch_size=options['batch_size'])
+            if any(counts.values()):
+                self.stdout.write(
+                    f"sent={counts['sent']} retried={counts['retried']} dead={counts['dead']}"
+                )
+            if not options['loop']:
+                state = outbox.backlog()
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Outbox: {state['pending']} pending, {state['sending']} sending, {state['dead']} dead"
+                    )
+                )
+                return
+            if not counts['sent'] and not counts['retried']:
+                time.sleep(options['interval'])
@@ -0,0 +1,115 @@
+"""
+Management command to report near-duplicate images across projects,
+galleries, ``works_uploads`` and article covers.
+
+Hashes come from the image metadata index (``build_image_meta``; pass
+``--refresh`` to bring it up to date first). Each cluster lists its images
+with size, dimensions and the projects/gallery items/articles that use them,
+plus the bytes freed by keeping only the largest copy. A gallery item's own
+image and thumbnail are expected to look alike and are not reported.
+"""
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from rijmenbaskara import duplicates, imagemeta, media, views
+
+
+class Command(BaseCommand):
+    help = 'Find images stored more than once at other sizes or encodings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--distance', type=int, help='Most differing hash bits (of 64) for a match')
+        parser.add_argument('--refresh', action='store_true', help='Refresh the image metadata index first')
+        parser.add_argument('--json', metavar='PATH', help="Write the report as JSON ('-' for stdout)")
+
+    def handle(self, *args, **options):
+        if options['refresh']:
+            imagemeta.refresh()
+        distance = duplicates.default_distance() if options['distance'] is None else options['distance']
+        started = time.perf_counter()
+        index = duplicates.index()
+        owners, variants = self._owners()
+        pairs = [
+            (a, b, bits) for a, b, bits in index.pairs(distance)
+            if frozenset((a, b)) not in variants
+        ]
+        entries = imagemeta.entries()
+        clusters = []
+        for keys in duplicates.clusters(pairs):
+            images = [
+                {
+                    "key": key,
+                    "bytes": entries.get(key, {}).get("bytes", 0),
+                    "width": entries.get(key, {}).get("width"),
+                    "height": entries.get(key, {}).get("height"),
+                    "used_by": owners.get(key, []),
+                }
+                for key in keys
+            ]
+            images.sort(key=lambda image: -image["bytes"])
+            clusters.append({
+                "images": images,
+                "reclaimable_bytes": sum(image["bytes"] for image in images[1:]),
+            })
+        elapsed = time.perf_counter() - started
+        report = {
+            "distance": distance,
+            "images": len(index),
+            "pairs": [{"a": a, "b": b, "bits": bits} for a, b, bits in pairs],
+            "clusters": clusters,
+            "reclaimable_bytes": sum(cluster["reclaimable_bytes"] for cluster in clusters),
+        }
+
+        if options['json']:
+            text = json.dumps(report, indent=2)
+            if options['json'] == '-':
+                self.stdout.write(text)
+                return
+            with open(options['json'], 'w', encoding='utf-8') as fh:
+                fh.write(text)
+
+        if not len(index):
+            self.stderr.write('No hashed images: run build_image_meta (with Pillow installed) first.')
+        for number, cluster in enumerate(clusters, start=1):
+            self.stdout.write(f"Cluster {number} ({cluster['reclaimable_bytes']:,} B reclaimable):")
+            for image in cluster["images"]:
+                size = f"{image['width']}x{image['height']}" if image["width"] else "?"
+                used_by = ", ".join(image["used_by"]) or "unreferenced"
+                self.stdout.write(f"  {image['key']}  {size}  {image['bytes']:,} B  [{used_by}]")
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(index)} images, {len(pairs)} near-duplicate pairs in {len(clusters)} clusters "
+            f"(distance <= {distance}, {'NumPy' if duplicates.np is not None else 'pure Python'}, "
+            f"{elapsed:.2f}s); {report['reclaimable_bytes']:,} B reclaimable"
+        ))
+
+    @staticmethod
+    def _owners():
+        """``({key: [labels]}, {frozenset((image, thumbnail))})`` from the site's content."""
+        owners, variants = {}, set()
+
+        def own(key, label):
+            if key:
+                owners.setdefault(key, []).append(label)
+
+        for project in views._load_projects():
+            for name in project.get('images') or []:
+                own(f"images/{name}", f"project:{project.get('id')}")
+        if views.GALLERIES_DIR.is_dir():
+            for gallery_dir in sorted(p for p in views.GALLERIES_DIR.iterdir() if p.is_dir()):
+                for item in views._load_gallery_items(gallery_dir.name):
+                    keys = [media.key_for_url(item.get(field) or "", "images/") for field in ("src", "thumb")]
+                    for key in keys:
+                        own(key, f"gallery:{gallery_dir.name}/{item.get('id')}")
+                    if all(keys) and keys[0] != keys[1]:
+                        variants.add(frozenset(keys))
+        for item in views._load_works_items():
+            for key in item.get('images') or []:
+                own(key, f"works:{item.get('slug')}")
+            if len(item.get('images') or []) == 1 and item.get('thumb') not in (None, item['images'][0]):
+                own(item['thumb'], f"works:{item.get('slug')}")
+                variants.add(frozenset((item['images'][0], item['thumb'])))
+        for article in views._load_articles():
+            own(media.key_for_url(article.get('cover') or "", "covers/"), f"article:{article.get('id')}")
+        return owners, variants
@@ -0,0 +1,108 @@
+"""
+Management command to estimate what resource hints buy on the main pages.
+
+Each page is rendered in-process; its HTML, stylesheets and LCP image (the
+``fetchpriority=high`` preload the view queued) are sized, then fed to a
+simple network model at a given RTT and bandwidth:
+
+- no hints: CSS and the image are requested when the parser reaches them;
+- Link header: both are requested as soon as the response headers arrive;
+- 103 Early Hints: route-level hints (CSS, font origins) go out one RTT
+  after the request, while the view is still rendering.
+
+LCP is taken as the later of "render-blocking CSS loaded" and "LCP image
+loaded"; font connections are not modelled. This is a lab model, not a
+browser trace: use it to compare the variants, and Lighthouse or
+WebPageTest against a deployment for real numbers.
+"""
+import os
+import re
+import time
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from rijmenbaskara import hints, media, views
+
+_LINK_RE = re.compile(r"<([^>]+)>;\s*rel=(\w+)((?:;[^,]*)*)")
+
+
+class Command(BaseCommand):
+    help = 'Model LCP on the main pages with and without preload/103 hints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rtt', type=float, default=100.0, help='Round-trip time in ms')
+        parser.add_argument('--bandwidth', type=float, default=10.0, help='Downlink in Mbit/s')
+        parser.add_argument('--server-ms', type=float, help='Server think time (default: measured in-process)')
+
+    def handle(self, *args, **options):
+        rtt, bits_per_ms = options['rtt'], options['bandwidth'] * 1000
+
+        def transfer(size):
+            return size * 8 / bits_per_ms
+
+        pages = [reverse('home'), reverse('works'), reverse('articles')]
+        articles = views._load_articles()
+        if articles:
+            pages.append(reverse('article_detail', args=[articles[0].get('slug') or articles[0]['id']]))
+
+        client = Client()
+        self.stdout.write(f"RTT {rtt:.0f} ms, {options['bandwidth']:.1f} Mbit/s; modelled LCP in ms")
+        for url in pages:
+            started = time.perf_counter()
+            response = client.get(url)
+            server_ms = options['server_ms']
+            if server_ms is None:
+                server_ms = (time.perf_counter() - started) * 1000
+            html = response.content.decode('utf-8', 'replace')
+            links = _LINK_RE.findall(response.get('Link', ''))
+            styles = [href for href, rel, params in links if rel == 'preload' and 'as=style' in params]
+            images = [href for href, rel, params in links if rel == 'preload' and 'as=image' in params]
+            match = response.resolver_match
+            early = {href for href, _, _ in (_LINK_RE.match(h).groups() for h in hints.page_hints(match.url_name))}
+
+            css_bytes = sum(self._size(href) for href in styles)
+            css_offset = min((html.find(href) for href in styles if href in html), default=len(html))
+            image_bytes = self._size(images[0]) if images else 0
+            image_offset = html.find(images[0]) if images and images[0] in html else len(html)
+            # Inlined critical CSS means the stylesheet no longer blocks the first paint
+            blocking_css = 0 if '<style>' in html[:html.find('</head>')] else css_bytes
+
+            ttfb = rtt + server_ms
+            html_done = ttfb + transfer(len(html))
+
+            def lcp(css_start, image_start):
+                css_done = css_start + rtt + transfer(blocking_css) if blocking_css else 0
+                image_done = image_start + rtt + transfer(image_bytes) if image_bytes else 0
+                return max(html_done, css_done, image_done)
+
+            parsed = lcp(ttfb + transfer(css_offset), ttfb + transfer(image_offset))
+            header = lcp(ttfb, ttfb)
+            early_css = rtt if any(href in early for href in styles) else ttfb
+            early_image = rtt if images and images[0] in early else ttfb
+            hinted = lcp(early_css, early_image)
+            self.stdout.write(
+                f"{url:<28} html={len(html):>7,} B css={css_bytes:>7,} B image={image_bytes:>9,} B  "
+                f"none={parsed:>6.0f}  link={header:>6.0f}  103={hinted:>6.0f}  "
+                f"(-{parsed - min(header, hinted):.0f} ms)"
+            )
+
+    @staticmethod
+    def _size(url):
+        """Bytes behind a same-site static or media URL, 0 if unknown."""
+        for prefix, root in ((settings.STATIC_URL, 'static'), (settings.MEDIA_URL + 'covers/', 'covers')):
+            if not url.startswith(prefix):
+                continue
+            name = url[len(prefix):]
+            if root == 'static':
+                found = finders.find(name)
+                if found:
+                    return os.path.getsize(found)
+                size = media.get_storage().size(name) if name.startswith('images/') else None
+            else:
+                size = media.get_storage().size(f'covers/{name}')
+            return size or 0
+        return 0
@@ -0,0 +1,77 @@
+"""
+Management command to measure the works page weight for a synthetic
+catalogue: the HTML and image bytes of the first response, compared with
+rendering every project inline with original-size thumbnail strips (how the
+page was built before it was paginated).
+"""
+import gzip
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from rijmenbaskara import derivatives, views
+
+
+class Command(BaseCommand):
+    help = 'Measure works page HTML size and eagerly loaded image bytes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=200)
+        parser.add_argument('--images-per-project', type=int, default=6)
+
+    def handle(self, *args, **options):
+        images = sorted(
+            p.name for p in derivatives.images_dir().iterdir()
+            if p.is_file() and p.suffix.lower() in views.IMAGE_EXTS
+        )
+        if not images:
+            raise CommandError('No images in static/images to build a catalogue from.')
+        count, per_project = options['projects'], options['images_per_project']
+        catalogue = [
+            {
+                "id": f"project-{n:04d}",
+                "title": f"PROJECT {n}",
+                "description": "Synthetic project used to measure page weight.",
+                "category": ("30k", "40k", "terrain")[n % 3],
+                "images": [images[(n + k) % len(images)] for k in range(per_project)],
+                "created_at": f"2026-01-01T00:{n // 60:02d}:{n % 60:02d}",
+            }
+            for n in range(count)
+        ]
+        size_of = {name: (derivatives.images_dir() / name).stat().st_size for name in images}
+        thumb_size = {
+            name: (derivatives.images_dir() / derivatives.thumbnail_for(name)).stat().st_size for name in images
+        }
+
+        factory = RequestFactory()
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(views, 'PROJECTS_DIR', Path(tmp)):
+            views.write_json_atomic(views._projects_file(), catalogue)
+            paged_html = views.works(factory.get('/works/')).content
+            with mock.patch.object(views, 'WORKS_PAGE_SIZE', count):
+                full_html = views.works(factory.get('/works/')).content
+
+        first_page = catalogue[:views.WORKS_PAGE_SIZE]
+        # Before: every strip image was an eager <img src> of the original
+        before_images = sum(size_of[name] for p in catalogue for name in p["images"])
+        before_images += sum(size_of[p["images"][0]] for p in catalogue)  # Active slides
+        # After: first page only; strips counted as if all scrolled into view
+        after_images = sum(thumb_size[name] for p in first_page for name in p["images"])
+        after_images += sum(size_of[p["images"][0]] for p in first_page)
+
+        def row(label, html, image_bytes):
+            self.stdout.write(
+                f"{label:<8} html={len(html):>9,} B  gzip={len(gzip.compress(html)):>8,} B  "
+                f"images={image_bytes:>12,} B"
+            )
+
+        self.stdout.write(f"{count} projects x {per_project} images "
+                          f"(derivatives for {sum(thumb_size[n] != size_of[n] for n in images)}/{len(images)} images)")
+        row('before', full_html, before_images)
+        row('after', paged_html, after_images)
+        self.stdout.write(
+            f"HTML -{100 - 100 * len(paged_html) / len(full_html):.1f}%, "
+            f"images -{100 - 100 * after_images / before_images:.1f}%"
+        )
@@ -0,0 +1,30 @@
+"""
+Management command to purge the shared cache by surrogate key, e.g. after
+editing stores by hand: ``purge_cache article:my-post home`` or
+``purge_cache --all``. Runs synchronously and prints each proxy's answer.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from rijmenbaskara import surrogate
+
+
+class Command(BaseCommand):
+    help = 'Purge surrogate keys (or everything) from the proxies in EDGE_CACHE["PURGE_URLS"]'
+
+    def add_arguments(self, parser):
+        parser.add_argument('keys', nargs='*', help='Keys such as home, works, article:<id>, tag:<name>')
+        parser.add_argument('--all', action='store_true', help='Purge every tagged response')
+
+    def handle(self, *args, **options):
+        keys = [surrogate.SITE] if options['all'] else options['keys']
+        if not keys:
+            raise CommandError('Give one or more keys, or --all.')
+        results = surrogate.purge_now(keys)
+        if not results:
+            raise CommandError('No proxies configured (EDGE_CACHE_PURGE_URLS).')
+        failed = 0
+        for method, url, status in results:
+            failed += status is None or status >= 400
+            self.stdout.write(f"{method} {url} -> {status if status is not None else 'unreachable'}")
+        if failed:
+            raise CommandError(f'{failed} purge request(s) failed.')
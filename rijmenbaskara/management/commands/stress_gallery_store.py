@@ -0,0 +1,83 @@
+"""
+Management command to stress the gallery JSON store with concurrent writers.
+Fires parallel uploads and deletes from several processes (like gunicorn
+workers) and checks that no update is lost and the per-gallery cap holds.
+The test suite checks the same (``rijmenbaskara/tests/test_stores.py``);
+this command is for load and write throughput.
+"""
+import random
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+
+from rijmenbaskara import views
+
+
+def _run_ops(gallery_id, ops, seed):
+    """Worker body: returns (added_ids, deleted_ids, rejected_count)."""
+    rng = random.Random(seed)
+    added, deleted, rejected = [], [], 0
+    for n in range(ops):
+        if rng.random() < 0.65:
+            image = SimpleUploadedFile(f"img{n}.jpg", b"\xff\xd8\xff" + b"x" * 512)
+            thumb = SimpleUploadedFile(f"thumb{n}.jpg", b"\xff\xd8\xff" + b"t" * 64)
+            try:
+                item = views._save_gallery_item(gallery_id, f"stress {seed} {n}", image, thumb)
+                added.append(item["id"])
+            except views.GalleryLimitReached:
+                rejected += 1
+        else:
+            items = views._load_gallery_items(gallery_id)
+            if items:
+                item_id = rng.choice(items)["id"]
+                if views._delete_gallery_item(gallery_id, item_id):
+                    deleted.append(item_id)
+    return added, deleted, rejected
+
+
+class Command(BaseCommand):
+    help = 'Stress-test concurrent gallery uploads/deletes and report write throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=6)
+        parser.add_argument('--ops', type=int, default=50, help='Operations per worker')
+        parser.add_argument('--gallery', default='stress-test')
+        parser.add_argument('--keep', action='store_true', help='Keep the test gallery afterwards')
+
+    def handle(self, *args, **options):
+        gallery_id = views._slugify(options['gallery'])
+        gallery_dir = views._gallery_dir(gallery_id)
+        if gallery_dir.exists():
+            raise CommandError(f'Gallery "{gallery_id}" already exists; pass --gallery to pick another')
+
+        workers, ops = options['workers'], options['ops']
+        started = time.perf_counter()
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_run_ops, [gallery_id] * workers, [ops] * workers, range(workers)))
+            elapsed = time.perf_counter() - started
+
+            added = {i for r in results for i in r[0]}
+            deleted = {i for r in results for i in r[1]}
+            rejected = sum(r[2] for r in results)
+            final_ids = {item["id"] for item in views._load_gallery_items(gallery_id)}
+            expected = added - deleted
+
+            writes = len(added) + len(deleted)
+            self.stdout.write(
+                f'{workers} workers x {ops} ops: {len(added)} uploads, {len(deleted)} deletes, '
+                f'{rejected} rejected at cap in {elapsed:.2f}s ({writes / elapsed:.1f} writes/s)'
+            )
+            if final_ids != expected:
+                raise CommandError(
+                    f'Lost updates: {len(expected - final_ids)} missing, {len(final_ids - expected)} unexpected'
+                )
+            if len(final_ids) > views.WORKS_MAX_ITEMS:
+                raise CommandError(f'Cap exceeded: {len(final_ids)} > {views.WORKS_MAX_ITEMS}')
+            self.stdout.write(self.style.SUCCESS('No lost updates; cap respected'))
+        finally:
+            if not options['keep']:
+                shutil.rmtree(gallery_dir, ignore_errors=True)
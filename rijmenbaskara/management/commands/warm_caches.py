@@ -0,0 +1,230 @@
+"""
+Management command to precompute what the first visitors after a deploy
+would otherwise pay for. Stages, in order:
+
+- ``articles``: compile articles stored by an older compiler (or never);
+- ``thumbnails``: thumbnail-strip derivatives for project images;
+- ``image_meta``: the image metadata index (dimensions, LQIP, hashes);
+- ``static``: checks the static manifest and bundles from ``collectstatic``;
+- ``indexes``: the facet, suggestion and duplicate indexes;
+- ``pages``: ``home``, ``works``, ``articles`` and every article.
+
+The first three write to the content stores, so they belong at release
+time against the live (mounted) stores, not in an image build. The
+indexes and rendered pages live in each worker's memory, so only a running
+deployment can keep them: with ``--base-url`` those two stages request the
+pages and the index-backed APIs from it, ``--workers`` at a time so every
+worker (and any edge cache in front) gets them. ``start.sh`` does this
+once gunicorn is up. Without ``--base-url`` they run in-process as a check
+(a template error fails the build rather than a visitor) and only time the
+cold builds.
+
+Each stage reports its time and the size of what it produced. A failing
+stage is reported and the rest still run; the command then exits non-zero
+only with ``--strict``.
+"""
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from rijmenbaskara import article_compiler, assets, derivatives, duplicates, imagemeta, views
+
+STAGES = ("articles", "thumbnails", "image_meta", "static", "indexes", "pages")
+
+
+def _size(path) -> int:
+    """Bytes in a file, or in every file under a directory."""
+    path = Path(path)
+    if path.is_file():
+        return path.stat().st_size
+    if not path.is_dir():
+        return 0
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+class Command(BaseCommand):
+    help = 'Precompute content indexes and manifests and pre-render the main pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip', action='append', choices=STAGES, default=[], help='Stage to skip (repeatable)')
+        parser.add_argument('--only', action='append', choices=STAGES, default=[], help='Run only this stage (repeatable)')
+        parser.add_argument('--base-url', help='Warm this running deployment, e.g. http://localhost:8000')
+        parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY', '3')),
+                            help='Concurrent requests per URL with --base-url, to reach every worker')
+        parser.add_argument('--wait', type=float, default=0, metavar='SECONDS',
+                            help='Wait up to this long for --base-url to answer first')
+        parser.add_argument('--json', metavar='PATH', help='Write the report as JSON')
+        parser.add_argument('--strict', action='store_true', help='Exit non-zero when a stage fails')
+
+    def handle(self, *args, **options):
+        self.base_url = (options['base_url'] or '').rstrip('/')
+        self.workers = max(1, options['workers'])
+        if self.base_url and options['wait']:
+            self._wait_for(self.base_url, options['wait'])
+        report, failed = [], []
+        for stage in STAGES:
+            if stage in options['skip'] or (options['only'] and stage not in options['only']):
+                continue
+            started = time.perf_counter()
+            try:
+                artifacts = getattr(self, f'_{stage}')()
+                error = None
+            except Exception as exc:
+                artifacts, error = [], f'{type(exc).__name__}: {exc}'
+                failed.append(stage)
+            elapsed = time.perf_counter() - started
+            report.append({'stage': stage, 'seconds': round(elapsed, 3), 'error': error, 'artifacts': artifacts})
+            status = self.style.ERROR(f'failed ({error})') if error else self.style.SUCCESS('ok')
+            self.stdout.write(f'{stage:<11} {elapsed * 1000:>8.0f} ms  {status}')
+            for artifact in artifacts:
+                size = f"{artifact['bytes']:>11,} B" if 'bytes' in artifact else ' ' * 13
+                self.stdout.write(f"    {size}  {artifact['name']}  {artifact.get('detail', '')}".rstrip())
+
+        if options['json']:
+            Path(options['json']).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        total = sum(entry['seconds'] for entry in report)
+        self.stdout.write(f'{len(report)} stages in {total:.2f}s, {len(failed)} failed')
+        if failed and options['strict']:
+            raise CommandError(f"Stages failed: {', '.join(failed)}")
+
+    def _articles(self):
+        compiled = 0
+        for article in views._load_articles():
+            if article.get('compiled_version') != article_compiler.COMPILER_VERSION:
+                views._save_article(article)
+                compiled += 1
+        return [{'name': str(views.ARTICLES_DIR), 'bytes': _size(views.ARTICLES_DIR),
+                 'detail': f'{len(views._load_articles())} articles, {compiled} recompiled'}]
+
+    def _thumbnails(self):
+        if derivatives.Image is None:
+            return [{'name': 'thumbnails', 'detail': 'skipped: Pillow is not installed'}]
+        names = {name for project in views._load_projects() for name in project.get('images') or []}
+        built = sum(1 for name in sorted(names) if derivatives.make_thumbnail(name))
+        thumbs_dir = derivatives.images_dir() / 'thumbs'
+        return [{'name': str(thumbs_dir), 'bytes': _size(thumbs_dir), 'detail': f'{built}/{len(names)} derivatives'}]
+
+    def _image_meta(self):
+        if os.environ.get('VERCEL'):
+            return [{'name': 'image_meta', 'detail': 'skipped on Vercel'}]
+        stats = imagemeta.refresh()
+        return [{'name': str(imagemeta.index_path()), 'bytes': _size(imagemeta.index_path()),
+                 'detail': f"{stats['total']} images, {stats['computed']} computed"}]
+
+    def _static(self):
+        static_root = Path(settings.STATIC_ROOT)
+        manifest = static_root / 'staticfiles.json'
+        bundles = static_root / assets.OUTPUT_DIR
+        artifacts = [{'name': str(bundles), 'bytes': _size(bundles)}]
+        if manifest.exists():
+            entries = len(json.loads(manifest.read_text(encoding='utf-8')).get('paths', {}))
+            artifacts.insert(0, {'name': str(manifest), 'bytes': _size(manifest), 'detail': f'{entries} files'})
+        elif 'Manifest' in settings.STORAGES['staticfiles']['BACKEND']:
+            raise CommandError('No static manifest: run collectstatic first.')
+        return artifacts
+
+    def _indexes(self):
+        if self.base_url:
+            return self._warm(self._index_urls())
+        artifacts = []
+        started = time.perf_counter()
+        projects = views._projects_facet_index()
+        artifacts.append({'name': 'facets:projects', 'detail': f'{len(projects)} docs'})
+        if views.GALLERIES_DIR.is_dir():
+            for gallery_dir in sorted(p for p in views.GALLERIES_DIR.iterdir() if p.is_dir()):
+                index = views._gallery_facet_index(gallery_dir.name)
+                artifacts.append({'name': f'facets:gallery:{gallery_dir.name}', 'detail': f'{len(index)} docs'})
+        suggest = views._suggest_index()
+        artifacts.append({'name': 'suggestions', 'detail': f'{len(suggest)} entries'})
+        hashes = duplicates.index()
+        artifacts.append({'name': 'duplicates', 'detail': f'{len(hashes)} hashes'})
+        artifacts.append({'name': 'total', 'detail': f'{(time.perf_counter() - started) * 1000:.0f} ms cold'})
+        return artifacts
+
+    @staticmethod
+    def _page_urls():
+        urls = [reverse('home'), reverse('works'), reverse('articles')]
+        return urls + [reverse('article_detail', args=[a.get('slug') or a['id']]) for a in views._load_articles()]
+
+    @staticmethod
+    def _index_urls():
+        """API requests that make a worker build each index (duplicates are only built by uploads)."""
+        urls = [reverse('api_projects_filter'), f"{reverse('api_search_suggest')}?{urlencode({'q': 'a'})}"]
+        if views.GALLERIES_DIR.is_dir():
+            urls += [
+                reverse('api_gallery_items_filter', args=[gallery_dir.name])
+                for gallery_dir in sorted(p for p in views.GALLERIES_DIR.iterdir() if (p / 'gallery.json').is_file())
+            ]
+        return urls
+
+    def _pages(self):
+        if self.base_url:
+            return self._warm(self._page_urls())
+        urls = self._page_urls()
+        hosts = [host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*']
+        client = Client(HTTP_HOST=hosts[0] if hosts else 'testserver')
+        artifacts, broken = [], []
+        for url in urls:
+            started = time.perf_counter()
+            response = client.get(url)
+            elapsed = (time.perf_counter() - started) * 1000
+            if response.status_code != 200:
+                broken.append(f'{url} ({response.status_code})')
+            artifacts.append({'name': url, 'bytes': len(response.content),
+                              'detail': f'{response.status_code} in {elapsed:.0f} ms'})
+        if broken:
+            raise CommandError(f"Pages did not render: {', '.join(broken)}")
+        return artifacts
+
+    def _warm(self, urls):
+        """GET each of ``urls`` from the deployment ``--workers`` times at once; reports the first of each."""
+        artifacts, broken = [], []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for url in urls:
+                results = list(pool.map(self._fetch, [self.base_url + url] * self.workers))
+                artifacts.append(results[0])
+                if not all(result['ok'] for result in results):
+                    broken.append(url)
+        if broken:
+            raise CommandError(f"Not warmed: {', '.join(broken)}")
+        return artifacts
+
+    @staticmethod
+    def _wait_for(base_url, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                urllib.request.urlopen(base_url + '/', timeout=5).close()
+                return
+            except urllib.error.HTTPError:
+                return  # Answering, even if with an error
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise CommandError(f'{base_url} did not answer within {timeout:.0f}s')
+                time.sleep(1)
+
+    @staticmethod
+    def _fetch(url):
+        request = urllib.request.Request(url, headers={'Accept-Encoding': 'br, gzip'})
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                body = response.read()
+                status, cache = response.status, response.headers.get('X-Cache') or response.headers.get('Age')
+        except urllib.error.HTTPError as exc:
+            body, status, cache = b'', exc.code, None
+        except OSError as exc:
+            return {'name': url, 'detail': f'unreachable: {exc}', 'ok': False}
+        detail = f'{status} in {(time.perf_counter() - started) * 1000:.0f} ms'
+        return {'name': url, 'bytes': len(body), 'ok': status == 200,
+                'detail': f'{detail}, cache: {cache}' if cache else detail}
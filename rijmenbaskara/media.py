@@ -0,0 +1,284 @@
+"""
+Storage for uploaded media: project images, gallery items and article covers.
+
+Media is addressed by keys such as ``images/project_x.jpg``,
+``images/galleries/<id>/<file>`` or ``covers/<file>``. ``settings.MEDIA_STORAGE``
+selects a backend:
+
+- ``local``: files under ``static/images`` and ``articles_store/covers``,
+  served from the same URLs as before;
+- ``s3``: an S3-compatible bucket (AWS S3, MinIO, ...) through the optional
+  ``boto3`` package.
+
+The ``s3`` backend supports direct uploads: ``presign`` returns a presigned
+POST to the bucket along with a signed claim token. The form then posts
+``<field>_key=<token>`` instead of the file, and ``claim`` turns the token
+back into a ``StoredMedia`` once the object is there and sniffs as an image.
+Django workers then only commit metadata. ``local`` media has no bucket to
+send to; browsers use the chunked uploads in ``uploads`` instead.
+"""
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+
+from . import imageinfo, reqlog
+
+try:
+    import boto3
+    from botocore.config import Config as BotoConfig
+    from botocore.exceptions import BotoCoreError, ClientError
+except ImportError:  # Optional: only needed for the s3 backend
+    boto3 = None
+
+CLAIM_SALT = "rijmenbaskara.media.claim"
+CLAIM_MAX_AGE = 24 * 3600
+HEADER_BYTES = 64 * 1024
+CACHE_CONTROL = "public, max-age=31536000, immutable"  # Keys are never reused
+
+
+class StoredMedia:
+    """An object already in storage, accepted in place of an uploaded file."""
+
+    def __init__(self, key: str, size: int, storage):
+        self.key = key
+        self.size = size
+        self.name = Path(key).name
+        self.url = storage.url(key)
+        self.content_hash = None
+
+    def under(self, prefix: str) -> bool:
+        return self.key.startswith(prefix)
+
+
+class LocalMediaStorage:
+    is_local = True
+
+    def __init__(self):
+        self.roots = {
+            "images": Path(settings.BASE_DIR) / "static" / "images",
+            "covers": Path(settings.MEDIA_ROOT) / "covers",
+        }
+
+    def path(self, key: str) -> Path:
+        top, _, rest = key.partition("/")
+        root = self.roots.get(top)
+        if root is None or not rest:
+            raise ValueError(f"Unknown media key: {key}")
+        path = (root / rest).resolve()
+        if root.resolve() not in path.parents:
+            raise ValueError(f"Unsafe media key: {key}")
+        return path
+
+    def save(self, key: str, file_obj, content_type=None) -> str:
+        target = self.path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with target.open("wb") as fh:
+            if hasattr(file_obj, "chunks"):
+                for chunk in file_obj.chunks():
+                    fh.write(chunk)
+            else:
+                shutil.copyfileobj(file_obj, fh)
+        return self.url(key)
+
+    def _unlink(self, key):
+        try:
+            self.path(key).unlink()
+        except (OSError, ValueError):
+            pass
+
+    def delete(self, keys):
+        if len(keys) > 4:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(self._unlink, keys))
+        else:
+            for key in keys:
+                self._unlink(key)
+
+    def size(self, key: str):
+        try:
+            return self.path(key).stat().st_size
+        except (OSError, ValueError):
+            return None
+
+    def read_header(self, key: str, length=HEADER_BYTES) -> bytes:
+        with self.path(key).open("rb") as fh:
+            return fh.read(length)
+
+    def url(self, key: str) -> str:
+        top, _, rest = key.partition("/")
+        if top == "covers":
+            return f"{settings.MEDIA_URL}covers/{rest}"
+        try:
+            return staticfiles_storage.url(key)  # Hashed name for files collected at build time
+        except ValueError:
+            return f"{settings.STATIC_URL}{key}"
+
+
+class S3MediaStorage:
+    is_local = False
+
+    def __init__(self, options: dict):
+        if boto3 is None:
+            raise ImproperlyConfigured("MEDIA_STORAGE backend 's3' requires the boto3 package.")
+        self.bucket = options.get("BUCKET")
+        if not self.bucket:
+            raise ImproperlyConfigured("MEDIA_STORAGE['BUCKET'] is required for the s3 backend.")
+        self.prefix = (options.get("PREFIX") or "").strip("/")
+        endpoint = options.get("ENDPOINT_URL") or None
+        self.public_url = (options.get("PUBLIC_URL") or "").rstrip("/") or (
+            f"{endpoint.rstrip('/')}/{self.bucket}" if endpoint else f"https://{self.bucket}.s3.amazonaws.com"
+        )
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint,
+            region_name=options.get("REGION") or "us-east-1",
+            aws_access_key_id=options.get("ACCESS_KEY") or None,
+            aws_secret_access_key=options.get("SECRET_KEY") or None,
+            # MinIO and most S3 stand-ins only do path-style addressing
+            config=BotoConfig(signature_version="s3v4", s3={"addressing_style": "path" if endpoint else "auto"}),
+        )
+
+    def _object(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def save(self, key: str, file_obj, content_type=None) -> str:
+        extra = {"CacheControl": CACHE_CONTROL}
+        if content_type:
+            extra["ContentType"] = content_type
+        if hasattr(file_obj, "seek"):
+            file_obj.seek(0)
+        self.client.upload_fileobj(getattr(file_obj, "file", file_obj), self.bucket, self._object(key), ExtraArgs=extra)
+        return self.url(key)
+
+    def delete(self, keys):
+        objects = [{"Key": self._object(key)} for key in keys]
+        for start in range(0, len(objects), 1000):  # DeleteObjects takes up to 1000 keys
+            try:
+                self.client.delete_objects(
+                    Bucket=self.bucket, Delete={"Objects": objects[start:start + 1000], "Quiet": True}
+                )
+            except (BotoCoreError, ClientError):
+                continue
+
+    def size(self, key: str):
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=self._object(key))["ContentLength"]
+        except (BotoCoreError, ClientError):
+            return None
+
+    def read_header(self, key: str, length=HEADER_BYTES) -> bytes:
+        response = self.client.get_object(Bucket=self.bucket, Key=self._object(key), Range=f"bytes=0-{length - 1}")
+        return response["Body"].read()
+
+    def url(self, key: str) -> str:
+        return f"{self.public_url}/{self._object(key)}"
+
+    def presign(self, key: str, content_type: str, max_bytes: int, expires: int) -> dict:
+        post = self.client.generate_presigned_post(
+            Bucket=self.bucket,
+            Key=self._object(key),
+            Fields={"Content-Type": content_type, "Cache-Control": CACHE_CONTROL},
+            Conditions=[
+                {"Content-Type": content_type},
+                {"Cache-Control": CACHE_CONTROL},
+                ["content-length-range", 1, max_bytes],
+            ],
+            ExpiresIn=expires,
+        )
+        return {"method": "POST", "url": post["url"], "fields": post["fields"]}
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                options = getattr(settings, "MEDIA_STORAGE", {}) or {}
+                backend = options.get("BACKEND", "local")
+                if backend == "local":
+                    _storage = LocalMediaStorage()
+                elif backend == "s3":
+                    _storage = S3MediaStorage(options)
+                else:
+                    raise ImproperlyConfigured(f"Unknown MEDIA_STORAGE backend: {backend}")
+    return _storage
+
+
+def presign(key: str, content_type: str, max_bytes: int) -> dict:
+    """Upload instructions for ``key`` plus the claim token the form should post back."""
+    expires = int(getattr(settings, "MEDIA_PRESIGN_EXPIRES", 900))
+    storage = get_storage()
+    if storage.is_local:
+        raise ImproperlyConfigured("Direct uploads need object storage; local media uses chunked uploads.")
+    return {
+        "key": key,
+        "url": storage.url(key),
+        "upload": storage.presign(key, content_type, max_bytes, expires),
+        "claim": signing.dumps({"key": key, "max": max_bytes}, salt=CLAIM_SALT),
+    }
+
+
+def claim(token: str):
+    """``StoredMedia`` for a claim token whose object exists and is an image, else ``None``."""
+    try:
+        data = signing.loads(token, salt=CLAIM_SALT, max_age=CLAIM_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    started = time.perf_counter()
+    try:
+        return _claim(get_storage(), data)
+    finally:
+        reqlog.record("media_claim", time.perf_counter() - started, files=1)
+
+
+def _claim(storage, data):
+    key = data.get("key", "")
+    size = storage.size(key)
+    if not size or size > int(data.get("max", 0)):
+        return None
+    try:
+        header = storage.read_header(key)
+    except Exception:
+        return None
+    if imageinfo.sniff(header)[0] is None:
+        storage.delete([key])
+        return None
+    return StoredMedia(key, size, storage)
+
+
+def store(key: str, file_obj, content_type=None) -> str:
+    """Save an uploaded file under ``key`` (a claimed object is already there) and return its URL."""
+    storage = get_storage()
+    if isinstance(file_obj, StoredMedia):
+        return file_obj.url
+    started = time.perf_counter()
+    url = storage.save(key, file_obj, content_type or getattr(file_obj, "content_type", None))
+    reqlog.record("media_store", time.perf_counter() - started, files=1, written=getattr(file_obj, "size", 0) or 0)
+    return url
+
+
+def delete(keys):
+    keys = [key for key in keys if key]
+    if keys:
+        started = time.perf_counter()
+        get_storage().delete(keys)
+        reqlog.record("media_delete", time.perf_counter() - started, files=len(keys))
+
+
+def key_for_url(url: str, prefix: str):
+    """Reverse ``url`` to its key if it points into ``prefix`` on the current backend."""
+    base = get_storage().url(prefix)
+    if url and url.startswith(base):
+        return prefix + url[len(base):]
+    return None
@@ -0,0 +1,132 @@
+"""
+Serving uploaded media (covers, project images, gallery items) from local storage.
+
+Uploads land after ``collectstatic``, so WhiteNoise never sees them, and
+``MEDIA_URL`` used to be served only under ``DEBUG``. ``serve`` answers those
+URLs with a ``FileResponse`` (handed to the server's ``wsgi.file_wrapper``,
+i.e. ``sendfile`` under gunicorn), strong ETags, conditional requests and a
+single HTTP byte range. Names carrying a content hash or unique token are
+never rewritten, so they are cached as immutable.
+"""
+import mimetypes
+import os
+import re
+
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseRedirect
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from . import media
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "public, max-age=300, must-revalidate"
+BLOCK_SIZE = 64 * 1024
+
+# Only the names the site generates, where a hash or random token sits in a fixed
+# place; anything else (a timestamp alone, a hex-looking slug) may be replaced in place
+_HASHED_NAME_RE = re.compile(
+    r"^(?:project_\d{14}_[0-9a-f]{8}"  # Project images (views._save_project_image, _presign_key)
+    r"|(?:bulk|direct)-\d{14}-[0-9a-f]{8}"  # Bulk and direct-upload covers
+    r"|[\w-]+\.[0-9a-f]{8}"  # <article>.<hash> covers
+    r"|\d{14}-[\w-]*-[0-9a-f]{6}-(?:full|thumb)"  # Gallery items (views._store_gallery_files)
+    r"|.+\.[0-9a-f]{12}"  # collectstatic manifest names
+    r")(?:-\d+)?$"  # Thumbnail-strip derivatives (derivatives.thumb_name)
+)
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class _RangeFile:
+    """
+    A window of an open file. ``fileno`` lets gunicorn ``sendfile`` from the
+    current offset for ``Content-Length`` bytes; ``read`` stops at the window
+    for servers that iterate instead.
+    """
+
+    def __init__(self, fh, start, length):
+        fh.seek(start)
+        self._fh = fh
+        self._remaining = length
+
+    def fileno(self):
+        return self._fh.fileno()
+
+    def read(self, size=-1):
+        if self._remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._fh.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self._fh.close()
+
+
+def is_hashed_name(name: str) -> bool:
+    return bool(_HASHED_NAME_RE.search(os.path.splitext(name)[0]))
+
+
+def etag_for(stat) -> str:
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def parse_range(header: str, size: int):
+    """``(start, end)`` inclusive for a single ``bytes=`` range, ``None`` to ignore it, or ``False`` if unsatisfiable."""
+    match = _RANGE_RE.match(header.strip())
+    if not match or not any(match.groups()):
+        return None  # Malformed or multi-range: send the whole file
+    first, last = match.groups()
+    if not first:
+        length = int(last)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+
+def serve(request, key: str):
+    storage = media.get_storage()
+    if not storage.is_local:
+        return HttpResponseRedirect(storage.url(key))
+    try:
+        path = storage.path(key)
+    except ValueError:
+        raise Http404("Media not found")
+    if path.name.startswith(".") or not path.is_file():
+        raise Http404("Media not found")
+
+    stat = path.stat()
+    etag = etag_for(stat)
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        byte_range = None
+        if request.method == "GET" and "HTTP_RANGE" in request.META:
+            if_range = request.META.get("HTTP_IF_RANGE", "").strip()
+            if not if_range or if_range == etag:
+                byte_range = parse_range(request.META["HTTP_RANGE"], stat.st_size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{stat.st_size}"
+        elif byte_range:
+            start, end = byte_range
+            response = FileResponse(
+                _RangeFile(path.open("rb"), start, end - start + 1), status=206, content_type=content_type
+            )
+            response.block_size = BLOCK_SIZE
+            response["Content-Length"] = str(end - start + 1)
+            response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+        else:
+            response = FileResponse(path.open("rb"), content_type=content_type)
+            response.block_size = BLOCK_SIZE
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(stat.st_mtime)
+    response["Accept-Ranges"] = "bytes"
+    response["Cache-Control"] = IMMUTABLE_CACHE if is_hashed_name(path.name) else REVALIDATE_CACHE
+    response["X-Content-Type-Options"] = "nosniff"
+    return response
@@ -3,9 +3,72 @@ Middleware to ensure database is initialized on Vercel.
 POC: Now using /tmp/db.sqlite3 which persists within a function instance.
 Still checks and creates admin if needed (cold starts may wipe /tmp).
 """
+import logging
 import os
+import random
+import time
 from django.db import connection
 from django.core.management import call_command
+from django.http import HttpResponse, JsonResponse
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+
+from . import admission, hints, ratelimit, reqlog, surrogate
+
+logger = logging.getLogger(__name__)
+request_logger = logging.getLogger('rijmenbaskara.requests')
+
+
+class RequestLogMiddleware:
+    """
+    Gives every request an ID (sent back in ``settings.REQUEST_LOG['HEADER']``)
+    and a ``reqlog.Trace`` of its storage calls. Requests slower than
+    ``SLOW_MS`` and 5xx responses are logged with the view, status, timing
+    and the per-operation breakdown; ``SAMPLE_RATE`` of the others too, at
+    INFO. Must be first so the trace covers every other middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        options = getattr(settings, 'REQUEST_LOG', {}) or {}
+        self.header = options.get('HEADER', 'X-Request-ID')
+        self.meta_key = 'HTTP_' + self.header.upper().replace('-', '_')
+        self.trust_incoming = bool(options.get('TRUST_INCOMING_ID'))
+        self.slow_ms = float(options.get('SLOW_MS', 500))
+        self.sample_rate = float(options.get('SAMPLE_RATE', 0))
+
+    def __call__(self, request):
+        request_id = reqlog.new_request_id(request.META.get(self.meta_key) if self.trust_incoming else None)
+        request.request_id = request_id
+        token = reqlog.start(request_id)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+            duration_ms = (time.perf_counter() - started) * 1000
+            response[self.header] = request_id
+            slow = duration_ms >= self.slow_ms or response.status_code >= 500
+            if slow or (self.sample_rate and random.random() < self.sample_rate):
+                self._log(request, response, duration_ms, slow)
+            return response
+        finally:
+            reqlog.finish(token)
+
+    @staticmethod
+    def _log(request, response, duration_ms, slow):
+        match = getattr(request, 'resolver_match', None)
+        data = {
+            'event': 'slow_request' if slow else 'request',
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'duration_ms': round(duration_ms, 1),
+            **reqlog.current().summary(),
+        }
+        level = logging.WARNING if slow else logging.INFO
+        request_logger.log(level, '%s %s %s in %.0f ms', request.method, request.path,
+                           response.status_code, duration_ms, extra={'data': data})
 
 
 class VercelDatabaseMiddleware:
@@ -21,7 +84,9 @@ class VercelDatabaseMiddleware:
     def __call__(self, request):
         # Only check once per function instance
         if not self._initialized:
+            started = time.perf_counter()
             self.ensure_database()
+            reqlog.record('ensure_database', time.perf_counter() - started)
             self._initialized = True
         
         # POC: Auto-login all users as admin (only if session is available)
@@ -54,7 +119,7 @@ class VercelDatabaseMiddleware:
                 table_exists = cursor.fetchone() is not None
             
             if not table_exists:
-                print("POC: Creating database tables in /tmp/db.sqlite3...")
+                logger.info("POC: Creating database tables in /tmp/db.sqlite3")
                 # Create all tables
                 call_command('migrate', '--run-syncdb', verbosity=0, interactive=False)
             
@@ -67,27 +132,171 @@ class VercelDatabaseMiddleware:
             admin_exists = User.objects.filter(username=username).exists()
             
             if not admin_exists:
-                print(f"POC: Creating superuser: {username}")
+                logger.info("POC: Creating superuser %s", username)
                 User.objects.create_superuser(
                     username=username,
                     email=email,
                     password=password
                 )
-                print(f"POC: Superuser '{username}' created with password '{password}'")
                 
                 # Verify it was created
                 if User.objects.filter(username=username).exists():
                     admin_user = User.objects.get(username=username)
-                    print(f"POC: Verified user '{username}' (ID: {admin_user.id}, staff: {admin_user.is_staff}, superuser: {admin_user.is_superuser})")
+                    logger.info(
+                        "POC: Verified user %s (ID: %s, staff: %s, superuser: %s)",
+                        username, admin_user.id, admin_user.is_staff, admin_user.is_superuser,
+                    )
                 else:
-                    print(f"POC WARNING: Failed to create user '{username}'")
+                    logger.warning("POC: Failed to create user %s", username)
             else:
-                print(f"POC: Admin user '{username}' already exists in /tmp/db.sqlite3")
+                logger.info("POC: Admin user %s already exists in /tmp/db.sqlite3", username)
             
-        except Exception as e:
+        except Exception:
             # Log but don't crash
-            print(f"POC: Database initialization error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("POC: Database initialization error")
+
+
+class RateLimitMiddleware:
+    """
+    Per-client, per-route token buckets configured by URL name in
+    ``settings.RATE_LIMITS``. Over-limit requests get 429 + Retry-After.
+    The bucket store is shared by all workers; if it is unavailable the
+    request is let through rather than failing the site.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.rules = ratelimit.load_rules()
+        self.store = ratelimit.TokenBucketStore() if self.rules else None
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = getattr(request, 'resolver_match', None)
+        rule = self.rules.get(match.url_name) if match else None
+        if rule is None or not rule.applies(request):
+            return None
+
+        key = f"{rule.url_name}:{ratelimit.client_ip(request)}"
+        try:
+            allowed, retry_after = self.store.take(key, rule.rate, rule.burst)
+        except Exception:
+            logger.exception("Rate limit store unavailable; allowing request")
+            return None
+        if allowed:
+            return None
+
+        message = 'Too many requests. Please slow down and try again shortly.'
+        if request.path.startswith('/api/') or 'application/json' in request.headers.get('Accept', ''):
+            response = JsonResponse({'error': message, 'retry_after': retry_after}, status=429)
+        else:
+            response = HttpResponse(message, status=429, content_type='text/plain; charset=utf-8')
+        response['Retry-After'] = str(retry_after)
+        return response
+
 
+class AdmissionControlMiddleware:
+    """
+    Caps how many requests of each expensive class (``settings.ADMISSION_CLASSES``)
+    run at once across all workers. Must sit before CsrfViewMiddleware so a
+    request is admitted before its upload body is parsed.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.governor = admission.get_governor()
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            slot = getattr(request, '_admission_slot', None)
+            if slot is not None:
+                request._admission_class.release(slot)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = getattr(request, 'resolver_match', None)
+        admission_class = self.governor.match(match.url_name, request.method) if match else None
+        if admission_class is None:
+            return None
+
+        slot = admission_class.acquire()
+        if slot is not None:
+            request._admission_class = admission_class
+            request._admission_slot = slot
+            return None
+
+        message = 'The server is busy with other uploads or exports. Please retry shortly.'
+        if request.path.startswith('/api/') or 'application/json' in request.headers.get('Accept', ''):
+            response = JsonResponse({'error': message, 'retry_after': admission_class.retry_after}, status=503)
+        else:
+            response = HttpResponse(message, status=503, content_type='text/plain; charset=utf-8')
+        response['Retry-After'] = str(admission_class.retry_after)
+        return response
+
+
+class ResourceHintsMiddleware:
+    """
+    Adds ``Link: rel=preconnect/preload/prefetch`` for successful HTML pages:
+    the route's fonts and stylesheet plus whatever the view queued with
+    ``hints.add``.
+    """
 
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            request.method == 'GET'
+            and response.status_code == 200
+            and response.get('Content-Type', '').startswith('text/html')
+        ):
+            links = hints.for_request(request)
+            if links:
+                existing = response.get('Link')
+                response['Link'] = ', '.join([existing, *links] if existing else links)
+        return response
+
+
+class SurrogateKeyMiddleware:
+    """
+    Sends the surrogate keys a view tagged (``surrogate.tag``) and, with
+    ``settings.EDGE_CACHE['ENABLED']``, lets the shared cache keep anonymous
+    GET responses until a write purges their keys. Responses that set a
+    cookie, vary on it or are private are never made shareable.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        keys = surrogate.keys_for(request)
+        if not keys:
+            return response
+        options = getattr(settings, 'EDGE_CACHE', {}) or {}
+        response[options.get('KEY_HEADER', 'Surrogate-Key')] = ' '.join(keys)
+        if not surrogate.enabled():
+            return response
+        if self._shareable(request, response):
+            response['Cache-Control'] = surrogate.shared_cache_control()
+        elif 'Cache-Control' not in response:
+            # Keep the proxy from storing a response that sets or depends on cookies
+            patch_cache_control(response, private=True)
+        return response
+
+    @staticmethod
+    def _shareable(request, response):
+        cache_control = response.get('Cache-Control', '')
+        vary = response.get('Vary', '').lower()
+        return (
+            request.method in ('GET', 'HEAD')
+            and response.status_code in (200, 304)
+            and not response.cookies
+            and 'cookie' not in vary
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+            and 'private' not in cache_control
+            and 'no-store' not in cache_control
+        )
@@ -0,0 +1,163 @@
+"""
+Durable spool-directory outbox for outgoing email.
+
+The contact form only writes a JSON file into ``outbox/pending`` and returns;
+the ``deliver_outbox`` management command drains it in batches over a single
+SMTP connection. Workers claim a message by renaming it into ``sending/``
+(atomic, so two workers never send the same file). Failures are retried with
+exponential backoff and moved to ``dead/`` after ``OUTBOX_MAX_ATTEMPTS``.
+"""
+import os
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+from .jsonstore import read_json, write_json_atomic
+
+OUTBOX_DIR = Path(getattr(settings, "OUTBOX_DIR", Path(settings.BASE_DIR) / "outbox"))
+PENDING_DIR = OUTBOX_DIR / "pending"
+SENDING_DIR = OUTBOX_DIR / "sending"
+DEAD_DIR = OUTBOX_DIR / "dead"
+
+# A claim older than this belongs to a worker that died mid-batch. Claims are
+# touched before each send and EMAIL_TIMEOUT bounds one SMTP call, so a live
+# batch never looks stale.
+STALE_CLAIM_SECONDS = 10 * 60
+
+
+def _max_attempts():
+    return getattr(settings, "OUTBOX_MAX_ATTEMPTS", 6)
+
+
+def _backoff(attempts: int) -> float:
+    return min(30 * (2 ** (attempts - 1)), 3600)
+
+
+def enqueue(subject: str, body: str, from_email: str, recipients) -> str:
+    """Persist a message for later delivery; returns its id."""
+    message_id = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+    write_json_atomic(PENDING_DIR / f"{message_id}.json", {
+        "id": message_id,
+        "subject": subject,
+        "body": body,
+        "from_email": from_email,
+        "to": list(recipients),
+        "attempts": 0,
+        "next_attempt_at": 0,
+        "created_at": time.time(),
+    })
+    return message_id
+
+
+def _release_stale_claims(now: float):
+    if not SENDING_DIR.exists():
+        return
+    for path in SENDING_DIR.glob("*.json"):
+        try:
+            if now - path.stat().st_mtime > STALE_CLAIM_SECONDS:
+                os.replace(path, PENDING_DIR / path.name)
+        except OSError:
+            continue
+
+
+def _claim(batch_size: int, now: float):
+    claimed = []
+    if not PENDING_DIR.exists():
+        return claimed
+    SENDING_DIR.mkdir(parents=True, exist_ok=True)
+    # Ids start with a nanosecond timestamp, so name order is arrival order
+    for path in sorted(PENDING_DIR.glob("*.json")):
+        if len(claimed) >= batch_size:
+            break
+        data = read_json(path, None)
+        if not isinstance(data, dict) or data.get("next_attempt_at", 0) > now:
+            continue
+        target = SENDING_DIR / path.name
+        try:
+            os.rename(path, target)
+        except FileNotFoundError:
+            continue  # Another worker got it first
+        os.utime(target)
+        claimed.append((target, data))
+    return claimed
+
+
+def _record_failure(path: Path, data: dict, error: str, now: float) -> bool:
+    """Reschedule or dead-letter a failed message; returns True if dead-lettered."""
+    data["attempts"] = int(data.get("attempts", 0)) + 1
+    data["last_error"] = error[:500]
+    if data["attempts"] >= _max_attempts():
+        write_json_atomic(DEAD_DIR / path.name, data)
+        dead = True
+    else:
+        data["next_attempt_at"] = now + _backoff(data["attempts"])
+        write_json_atomic(PENDING_DIR / path.name, data)
+        dead = False
+    try:
+        path.unlink()
+    except OSError:
+        pass
+    return dead
+
+
+def deliver_batch(batch_size=None, connection=None) -> dict:
+    """
+    Send up to ``batch_size`` due messages over one connection.
+    Returns counts of ``sent``, ``retried`` and ``dead`` messages.
+    """
+    batch_size = batch_size or getattr(settings, "OUTBOX_BATCH_SIZE", 50)
+    now = time.time()
+    _release_stale_claims(now)
+    claimed = _claim(batch_size, now)
+    counts = {"sent": 0, "retried": 0, "dead": 0}
+    if not claimed:
+        return counts
+
+    connection = connection or get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as exc:
+        for path, data in claimed:
+            counts["dead" if _record_failure(path, data, f"connect: {exc}", now) else "retried"] += 1
+        return counts
+
+    try:
+        for path, data in claimed:
+            try:
+                os.utime(path)  # Still ours: keep the claim fresh through a long batch
+            except FileNotFoundError:
+                continue  # Released as stale and re-claimed elsewhere; do not send twice
+            message = EmailMessage(
+                data.get("subject", ""),
+                data.get("body", ""),
+                data.get("from_email"),
+                data.get("to") or [],
+                connection=connection,
+            )
+            try:
+                message.send(fail_silently=False)
+            except Exception as exc:
+                counts["dead" if _record_failure(path, data, str(exc), now) else "retried"] += 1
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            counts["sent"] += 1
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+    return counts
+
+
+def backlog() -> dict:
+    """Number of messages in each outbox state."""
+    return {
+        name: len(list(path.glob("*.json"))) if path.exists() else 0
+        for name, path in (("pending", PENDING_DIR), ("sending", SENDING_DIR), ("dead", DEAD_DIR))
+    }
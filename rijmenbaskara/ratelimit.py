@@ -0,0 +1,116 @@
+"""
+Token-bucket rate limiting shared across gunicorn workers.
+
+Buckets live in a small SQLite file (WAL mode, no fsync) separate from the
+Django database. Each check is a single UPSERT ... RETURNING statement that
+refills the bucket for the elapsed time, takes a token if one is available
+and reports the outcome, so concurrent workers never race on a bucket.
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+_CHECK_SQL = """
+INSERT INTO buckets (key, tokens, updated, allowed)
+VALUES (:key, :capacity - 1, :now, 1)
+ON CONFLICT(key) DO UPDATE SET
+    allowed = min(:capacity, tokens + (:now - updated) * :rate) >= 1,
+    tokens = min(:capacity, tokens + (:now - updated) * :rate)
+             - (min(:capacity, tokens + (:now - updated) * :rate) >= 1),
+    updated = :now
+RETURNING allowed, tokens
+"""
+
+# Rows untouched this long are full buckets again and can be dropped
+_PRUNE_AFTER = 3600
+_PRUNE_EVERY = 1000
+
+
+def parse_rate(rate: str) -> float:
+    """``"20/m"`` -> tokens per second. Units: s, m, h."""
+    count, _, unit = rate.partition("/")
+    seconds = {"s": 1, "m": 60, "h": 3600}[(unit or "s")[0]]
+    return float(count) / seconds
+
+
+def default_db_path() -> Path:
+    if os.environ.get('VERCEL'):
+        return Path("/tmp/ratelimit.sqlite3")
+    return Path(settings.BASE_DIR) / "ratelimit.sqlite3"
+
+
+class TokenBucketStore:
+    def __init__(self, path=None):
+        self.path = str(path or getattr(settings, "RATE_LIMIT_DB", None) or default_db_path())
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                " key TEXT PRIMARY KEY, tokens REAL NOT NULL,"
+                " updated REAL NOT NULL, allowed INTEGER NOT NULL)"
+            )
+            self._local.conn = conn
+            self._local.calls = 0
+        return conn
+
+    def take(self, key: str, rate: float, capacity: float, now=None):
+        """
+        Try to take one token. Returns ``(allowed, retry_after_seconds)``;
+        ``retry_after_seconds`` is 0 when allowed.
+        """
+        now = time.time() if now is None else now
+        conn = self._conn()
+        allowed, tokens = conn.execute(
+            _CHECK_SQL, {"key": key, "rate": rate, "capacity": capacity, "now": now}
+        ).fetchone()
+        self._local.calls += 1
+        if self._local.calls % _PRUNE_EVERY == 0:
+            conn.execute("DELETE FROM buckets WHERE updated < ?", (now - _PRUNE_AFTER,))
+        if allowed:
+            return True, 0
+        return False, max(1, math.ceil((1 - tokens) / rate))
+
+
+class RateLimitRule:
+    """One entry of ``settings.RATE_LIMITS``, keyed by URL name."""
+
+    def __init__(self, url_name: str, config: dict):
+        self.url_name = url_name
+        self.methods = {m.upper() for m in config.get("methods", ["POST"])}
+        self.rate = parse_rate(config.get("rate", "60/m"))
+        self.burst = float(config.get("burst", max(1, self.rate * 60)))
+        # Only limit requests carrying one of these query params (e.g. search)
+        self.params = tuple(config.get("params", ()))
+
+    def applies(self, request) -> bool:
+        if request.method not in self.methods:
+            return False
+        if self.params and not any(request.GET.get(p) for p in self.params):
+            return False
+        return True
+
+
+def load_rules():
+    return {
+        name: RateLimitRule(name, config)
+        for name, config in getattr(settings, "RATE_LIMITS", {}).items()
+    }
+
+
+def client_ip(request) -> str:
+    if getattr(settings, "RATE_LIMIT_USE_X_FORWARDED_FOR", False):
+        forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.META.get("REMOTE_ADDR", "") or "unknown"
@@ -0,0 +1,111 @@
+"""
+Structured request logging.
+
+Every request gets an ID (``settings.REQUEST_LOG['HEADER']``: the incoming
+one when ``TRUST_INCOMING_ID`` is set, e.g. behind a proxy that assigns
+them, otherwise a new one). It is sent back on the response and attached
+to every log line written while the request runs (``RequestIdFilter``).
+
+Storage helpers (``jsonstore``, ``media``, the article store) report each
+call with ``record(op, seconds, files, read, written)``. The counters
+accumulate on the request's ``Trace``: a dict update per call, and nothing
+at all outside a request (management commands, background threads).
+``middleware.RequestLogMiddleware`` logs the breakdown for slow and failed
+requests, plus a sampled share of the rest, as one JSON line
+(``JsonFormatter``; see ``settings.LOGGING``).
+"""
+import contextvars
+import json
+import logging
+import re
+import uuid
+from datetime import datetime, timezone
+
+_current = contextvars.ContextVar("request_trace", default=None)
+
+_ID_RE = re.compile(r"[A-Za-z0-9._:-]{1,64}")
+
+
+class Trace:
+    __slots__ = ("request_id", "ops", "files", "bytes_read", "bytes_written")
+
+    def __init__(self, request_id):
+        self.request_id = request_id
+        self.ops = {}  # op -> [calls, seconds]
+        self.files = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def summary(self) -> dict:
+        return {
+            "ops": {op: {"calls": calls, "ms": round(seconds * 1000, 2)} for op, (calls, seconds) in sorted(self.ops.items())},
+            "files": self.files,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+        }
+
+
+def new_request_id(incoming=None) -> str:
+    """``incoming`` if it is a sane ID, else a fresh one."""
+    if incoming and _ID_RE.fullmatch(incoming):
+        return incoming
+    return uuid.uuid4().hex
+
+
+def start(request_id):
+    """Begin tracing; returns the token ``finish`` needs."""
+    return _current.set(Trace(request_id))
+
+
+def finish(token):
+    _current.reset(token)
+
+
+def current():
+    """The active ``Trace``, or ``None`` outside a request."""
+    return _current.get()
+
+
+def record(op, seconds=0.0, files=0, read=0, written=0):
+    """Count one storage call against the current request."""
+    trace = _current.get()
+    if trace is None:
+        return
+    entry = trace.ops.get(op)
+    if entry is None:
+        entry = trace.ops[op] = [0, 0.0]
+    entry[0] += 1
+    entry[1] += seconds
+    trace.files += files
+    trace.bytes_read += read
+    trace.bytes_written += written
+
+
+class RequestIdFilter(logging.Filter):
+    """Sets ``record.request_id`` (``-`` outside a request) for formatters."""
+
+    def filter(self, record):
+        trace = _current.get()
+        record.request_id = trace.request_id if trace is not None else "-"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; fields passed as ``extra={"data": {...}}`` are merged in."""
+
+    def format(self, record):
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id and request_id != "-":
+            payload["request_id"] = request_id
+        data = getattr(record, "data", None)
+        if isinstance(data, dict):
+            payload.update(data)
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
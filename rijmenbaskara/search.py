@@ -0,0 +1,109 @@
+"""
+In-memory prefix index for search-as-you-type suggestions.
+
+Every document (an article, a project, a tag) is indexed under its whole
+label and under each word suffix of it, so "angels" finds "Dark Angels
+Librarian". Keys live in one sorted list and a query is a ``bisect`` to the
+first key at or after the prefix followed by a short forward scan, so
+lookups stay in the microseconds regardless of catalogue size.
+
+Documents are added, replaced and removed individually; ``sync`` diffs a
+whole source (all articles, all projects) against what is indexed and
+only touches the documents that changed.
+"""
+import bisect
+import re
+import threading
+import unicodedata
+
+SCAN_MAX = 200  # Keys examined per query before ranking
+
+_NON_WORD_RE = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and collapse punctuation to single spaces."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return _NON_WORD_RE.sub(" ", text).strip()
+
+
+class PrefixIndex:
+    def __init__(self, kind_order=()):
+        self._keys = []  # Sorted (key, rank, kind, doc_id)
+        self._docs = {}  # (kind, doc_id) -> (label, url, [index keys])
+        self._kind_rank = {kind: n for n, kind in enumerate(kind_order)}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _index_keys(self, kind, doc_id, label):
+        words = normalize(label).split()
+        keys = set()
+        for start in range(len(words)):
+            # Rank 0: the label itself starts with the query; 1: a later word does
+            keys.add((" ".join(words[start:]), 0 if start == 0 else 1, kind, doc_id))
+        return sorted(keys)
+
+    def _remove_locked(self, doc):
+        entry = self._docs.pop(doc, None)
+        if entry is None:
+            return
+        for key in entry[2]:
+            pos = bisect.bisect_left(self._keys, key)
+            if pos < len(self._keys) and self._keys[pos] == key:
+                del self._keys[pos]
+
+    def upsert(self, kind, doc_id, label, url):
+        doc = (kind, str(doc_id))
+        with self._lock:
+            current = self._docs.get(doc)
+            if current is not None and current[0] == label and current[1] == url:
+                return
+            self._remove_locked(doc)
+            keys = self._index_keys(kind, doc[1], label)
+            for key in keys:
+                bisect.insort(self._keys, key)
+            self._docs[doc] = (label, url, keys)
+
+    def remove(self, kind, doc_id):
+        with self._lock:
+            self._remove_locked((kind, str(doc_id)))
+
+    def sync(self, kind, documents):
+        """Make the indexed ``kind`` documents match ``{doc_id: (label, url)}``."""
+        documents = {str(doc_id): value for doc_id, value in documents.items()}
+        stale = [doc_id for k, doc_id in list(self._docs) if k == kind and doc_id not in documents]
+        for doc_id in stale:
+            self.remove(kind, doc_id)
+        for doc_id, (label, url) in documents.items():
+            self.upsert(kind, doc_id, label, url)
+
+    def suggest(self, query: str, limit=8):
+        """Top ``limit`` documents whose label, or a word in it, starts with ``query``."""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        keys = self._keys
+        pos = bisect.bisect_left(keys, (prefix,))
+        best = {}
+        for key in keys[pos:pos + SCAN_MAX]:
+            if not key[0].startswith(prefix):
+                break
+            doc = (key[2], key[3])
+            rank = key[1]
+            if doc not in best or rank < best[doc]:
+                best[doc] = rank
+
+        results = []
+        for doc, rank in best.items():
+            entry = self._docs.get(doc)
+            if entry is None:
+                continue  # Removed by a concurrent update
+            results.append((rank, self._kind_rank.get(doc[0], len(self._kind_rank)), entry[0].lower(), doc, entry))
+        results.sort(key=lambda r: r[:3])
+        return [
+            {"kind": doc[0], "id": doc[1], "label": entry[0], "url": entry[1]}
+            for _, _, _, doc, entry in results[:limit]
+        ]
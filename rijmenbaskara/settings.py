@@ -50,17 +50,22 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
+    'rijmenbaskara',  # Before staticfiles: its collectstatic also builds the asset bundles
     'django.contrib.staticfiles',
-    'rijmenbaskara',
 ]
 
 # Enable all middleware including sessions and auth for Vercel
 MIDDLEWARE = [
-    'rijmenbaskara.middleware.VercelDatabaseMiddleware',  # Must be first
+    'rijmenbaskara.middleware.RequestLogMiddleware',  # Must be first: times everything below
+    'rijmenbaskara.middleware.VercelDatabaseMiddleware',  # Before anything that uses the database
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'rijmenbaskara.middleware.SurrogateKeyMiddleware',  # Outside Session/CSRF so it sees their cookies
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'rijmenbaskara.middleware.ResourceHintsMiddleware',
+    'rijmenbaskara.middleware.RateLimitMiddleware',
+    'rijmenbaskara.middleware.AdmissionControlMiddleware',  # Before CSRF, which parses uploads
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -164,21 +169,99 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
-# WhiteNoise configuration for serving static files
-# Use simpler storage on Vercel to avoid manifest issues
-if os.environ.get('VERCEL'):
-    STATICFILES_STORAGE = 'whitenoise.storage.CompressedStaticFilesStorage'
-else:
-    STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# WhiteNoise configuration for serving static files: hashed names plus
+# gzip/brotli copies. Use simpler storage on Vercel to avoid manifest issues.
+# (STATICFILES_STORAGE is no longer read by Django; STORAGES replaces it.)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedStaticFilesStorage'
+        if os.environ.get('VERCEL')
+        else 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+    },
+}
+
+# Per-page CSS/JS bundles built by collectstatic (rijmenbaskara/assets.py).
+# Pages fall back to the separate source files until the bundles are collected;
+# set ASSET_BUNDLES=False to always use the sources while editing them.
+ASSET_BUNDLES = os.environ.get('ASSET_BUNDLES', 'True') == 'True'
+
+# Send route-level Link hints as 103 Early Hints when the ASGI server
+# supports it (rijmenbaskara/hints.py); every page also gets a Link header
+EARLY_HINTS = os.environ.get('EARLY_HINTS', 'True') == 'True'
+
+# Shared cache (Varnish, nginx, a CDN) in front of the site
+# (rijmenbaskara/surrogate.py). Responses carry their surrogate keys in
+# KEY_HEADER; when ENABLED, anonymous pages get s-maxage=MAX_AGE and every
+# write purges the affected keys on each proxy in PURGE_URLS. PURGE_MODE
+# 'keys' sends one PURGE_METHOD request with the keys (varnish/default.vcl),
+# 'urls' a PURGE per affected path for URL-keyed caches.
+EDGE_CACHE = {
+    'ENABLED': os.environ.get('EDGE_CACHE', 'False') == 'True',
+    'MAX_AGE': int(os.environ.get('EDGE_CACHE_MAX_AGE', '86400')),
+    'KEY_HEADER': os.environ.get('EDGE_CACHE_KEY_HEADER', 'Surrogate-Key'),
+    'PURGE_URLS': [url for url in os.environ.get('EDGE_CACHE_PURGE_URLS', '').split(',') if url],
+    'PURGE_MODE': os.environ.get('EDGE_CACHE_PURGE_MODE', 'keys'),
+    'PURGE_METHOD': os.environ.get('EDGE_CACHE_PURGE_METHOD', 'BAN'),
+    'PURGE_TIMEOUT': 2,
+}
+
+# Service worker at /sw.js (static/js/sw.js): offline and repeat-visit
+# caching of pages and images. Turning it off serves a worker that clears
+# its caches and unregisters itself.
+SERVICE_WORKER = os.environ.get('SERVICE_WORKER', 'True') == 'True'
 
 # Media (serves article covers in development)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'articles_store'
 
+# Uploads: stream every file to disk and validate images as they arrive
+FILE_UPLOAD_HANDLERS = ['rijmenbaskara.upload_handlers.ImageUploadHandler']
+UPLOAD_REQUEST_MAX_BYTES = 200 * 1024 * 1024  # Whole multipart body (multi-image projects)
+UPLOAD_FILE_MAX_BYTES = 40 * 1024 * 1024  # Any single image unless overridden below
+UPLOAD_FIELD_MAX_BYTES = {
+    'thumbnail': 5 * 1024 * 1024,
+    'cover': 15 * 1024 * 1024,
+}
+UPLOAD_MAX_PIXELS = 120_000_000  # Rejects decompression-bomb sized headers
+
+# Media storage for uploaded images and covers: 'local' keeps them under
+# static/images and articles_store/covers; 's3' uses an S3-compatible bucket
+# (AWS S3, MinIO, ...) and needs boto3. Browsers can upload straight to the
+# bucket through presigned uploads from /api/media/uploads/; with 'local' they
+# send files in resumable chunks to /api/uploads/ instead.
+MEDIA_STORAGE = {
+    'BACKEND': os.environ.get('MEDIA_BACKEND', 'local'),
+    'BUCKET': os.environ.get('MEDIA_S3_BUCKET', ''),
+    'PREFIX': os.environ.get('MEDIA_S3_PREFIX', ''),
+    'ENDPOINT_URL': os.environ.get('MEDIA_S3_ENDPOINT_URL', ''),  # e.g. http://minio:9000
+    'REGION': os.environ.get('MEDIA_S3_REGION', 'us-east-1'),
+    'ACCESS_KEY': os.environ.get('MEDIA_S3_ACCESS_KEY', ''),
+    'SECRET_KEY': os.environ.get('MEDIA_S3_SECRET_KEY', ''),
+    'PUBLIC_URL': os.environ.get('MEDIA_S3_PUBLIC_URL', ''),  # CDN or bucket URL browsers load from
+}
+MEDIA_PRESIGN_EXPIRES = 900  # Seconds a presigned upload stays valid
+
+# Width/height, dominant colour and blur placeholder of every local image
+# (rijmenbaskara/imagemeta.py); rebuilt by `manage.py build_image_meta` and
+# refreshed in the background after uploads
+IMAGE_META_FILE = Path(os.environ.get('IMAGE_META_FILE', BASE_DIR / 'imagemeta_store' / 'index.json'))
+
+# Perceptual near-duplicate detection over that index (rijmenbaskara/duplicates.py):
+# DISTANCE is the most bits (of 64) two hashes may differ by; WARN_ON_UPLOAD
+# flags uploads in add_work/add_project that look like an image already stored
+IMAGE_DUPLICATES = {
+    'DISTANCE': int(os.environ.get('IMAGE_DUPLICATES_DISTANCE', '6')),
+    'WARN_ON_UPLOAD': os.environ.get('IMAGE_DUPLICATES_WARN', 'True') == 'True',
+}
+
 # Email Configuration
 # For development, using console backend (prints emails to console)
 # For production, configure with actual SMTP settings
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+# Seconds before a hung SMTP connect/send fails; must stay well under
+# outbox.STALE_CLAIM_SECONDS so a slow batch is never re-sent by another worker
+EMAIL_TIMEOUT = int(os.environ.get('EMAIL_TIMEOUT', '30'))
 
 # For production with Gmail SMTP, uncomment and configure:
 # EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -188,6 +271,79 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 # EMAIL_HOST_USER = 'your-email@gmail.com'
 # EMAIL_HOST_PASSWORD = 'your-app-password'  # Use App Password, not regular password
 
+# Per-client token buckets, keyed by URL name from urls.py (rate: N/s, N/m or N/h)
+RATE_LIMITS = {
+    'login': {'methods': ['POST'], 'rate': '10/m', 'burst': 5},
+    'contact': {'methods': ['POST'], 'rate': '5/m', 'burst': 3},
+    'articles': {'methods': ['GET'], 'rate': '60/m', 'burst': 20, 'params': ['q']},
+    'api_gallery_items': {'methods': ['POST'], 'rate': '30/m', 'burst': 10},
+    'api_gallery_items_bulk': {'methods': ['POST', 'DELETE'], 'rate': '10/m', 'burst': 3},
+    'api_upload_part': {'methods': ['PUT'], 'rate': '600/m', 'burst': 120},
+    'api_media_presign': {'methods': ['POST'], 'rate': '120/m', 'burst': 30},
+}
+# Vercel and other proxies put the client address in X-Forwarded-For
+RATE_LIMIT_USE_X_FORWARDED_FOR = bool(os.environ.get('VERCEL'))
+
+# Expensive request classes: at most `limit` run at once across workers; others
+# queue for `queue_timeout` seconds and are then shed with 503 + Retry-After
+ADMISSION_CLASSES = {
+    'backup': {
+        'views': ['export_content_backup'],
+        'methods': ['GET'],
+        'limit': 1, 'queue_timeout': 2, 'retry_after': 30,
+    },
+    'project_upload': {
+        'views': ['add_project', 'edit_project'],
+        'methods': ['POST'],
+        'limit': 1, 'queue_timeout': 5, 'retry_after': 10,
+    },
+    'gallery_upload': {
+        'views': ['add_work', 'api_gallery_items', 'api_gallery_items_bulk'],
+        'methods': ['POST'],
+        'limit': 2, 'queue_timeout': 5, 'retry_after': 10,
+    },
+}
+
+# Contact form messages are spooled here and sent by `manage.py deliver_outbox`
+OUTBOX_DIR = BASE_DIR / 'outbox'
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 6
+
+# Request IDs and the slow-request log (rijmenbaskara/reqlog.py, RequestLogMiddleware).
+# Requests slower than SLOW_MS (and 5xx) are logged with a breakdown of their
+# storage calls; SAMPLE_RATE (0-1) of the rest too. TRUST_INCOMING_ID reuses
+# the ID a proxy in front already put in HEADER.
+REQUEST_LOG = {
+    'HEADER': 'X-Request-ID',
+    'TRUST_INCOMING_ID': os.environ.get('REQUEST_ID_TRUST_INCOMING', 'False') == 'True',
+    'SLOW_MS': float(os.environ.get('REQUEST_LOG_SLOW_MS', '500')),
+    'SAMPLE_RATE': float(os.environ.get('REQUEST_LOG_SAMPLE_RATE', '0')),
+}
+
+# Application logs as JSON lines on stderr (LOG_FORMAT=text for a readable dev console)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'request_id': {'()': 'rijmenbaskara.reqlog.RequestIdFilter'},
+    },
+    'formatters': {
+        'json': {'()': 'rijmenbaskara.reqlog.JsonFormatter'},
+        'text': {'format': '%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s'},
+    },
+    'handlers': {
+        'structured': {
+            'class': 'logging.StreamHandler',
+            'filters': ['request_id'],
+            'formatter': os.environ.get('LOG_FORMAT', 'json'),
+        },
+    },
+    'loggers': {
+        'rijmenbaskara': {'handlers': ['structured'], 'level': os.environ.get('LOG_LEVEL', 'INFO'), 'propagate': False},
+        'django.request': {'handlers': ['structured'], 'level': 'ERROR', 'propagate': False},
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
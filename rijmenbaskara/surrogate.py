@@ -0,0 +1,148 @@
+"""
+Surrogate keys and purges for a shared HTTP cache (Varnish, nginx, a CDN)
+in front of the site.
+
+Views tag what a response shows with ``tag(request, ...)``, e.g.
+``article_key(id)``, ``tag_key(name)``, ``project_key(id)``,
+``gallery_key(id)``, ``HOME``. ``middleware.SurrogateKeyMiddleware`` sends
+the keys in ``settings.EDGE_CACHE['KEY_HEADER']`` and, when the edge cache is
+enabled, a shared-cache policy for responses that set no cookies. Writes call
+``purge(keys)``, which sends targeted requests to every proxy in
+``PURGE_URLS`` from a background thread:
+
+- ``keys`` mode: one ``BAN`` (or ``PURGE``) per proxy carrying the keys in
+  the key header, for proxies that can invalidate by header (see
+  ``varnish/default.vcl``);
+- ``urls`` mode: a ``PURGE`` per affected path, for URL-keyed caches such as
+  nginx with ``proxy_cache_purge``.
+"""
+import logging
+import re
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.urls import reverse
+
+logger = logging.getLogger(__name__)
+
+SITE = "site"  # On every tagged response: purging it clears everything
+HOME = "home"
+ARTICLES = "articles"
+WORKS = "works"
+
+_KEY_SAFE_RE = re.compile(r"[^a-z0-9_-]+")
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _options():
+    return getattr(settings, "EDGE_CACHE", {}) or {}
+
+
+def _clean(value) -> str:
+    return _KEY_SAFE_RE.sub("-", str(value).lower()).strip("-")
+
+
+def article_key(article_id) -> str:
+    return f"article:{_clean(article_id)}"
+
+
+def tag_key(tag) -> str:
+    return f"tag:{_clean(tag)}"
+
+
+def project_key(project_id) -> str:
+    return f"project:{_clean(project_id)}"
+
+
+def gallery_key(gallery_id) -> str:
+    return f"gallery:{_clean(gallery_id)}"
+
+
+def tag(request, *keys):
+    """Record surrogate keys for this request's response."""
+    request.__dict__.setdefault("_surrogate_keys", []).extend(key for key in keys if key)
+
+
+def keys_for(request):
+    keys = request.__dict__.get("_surrogate_keys")
+    return list(dict.fromkeys([SITE, *keys])) if keys else []
+
+
+def enabled() -> bool:
+    return bool(_options().get("ENABLED"))
+
+
+def shared_cache_control() -> str:
+    # Browsers always revalidate (they cannot be purged); the proxy keeps it until purged
+    return f"public, max-age=0, s-maxage={int(_options().get('MAX_AGE', 86400))}, must-revalidate"
+
+
+def paths_for(keys):
+    """Cached paths affected by ``keys``, for URL-keyed caches."""
+    paths = []
+    for key in keys:
+        kind, _, value = key.partition(":")
+        if key == HOME:
+            paths.append(reverse("home"))
+        elif key == WORKS or kind == "project":
+            paths += [reverse("works"), reverse("api_projects")]
+        elif key == ARTICLES:
+            paths += [reverse("articles"), reverse("api_articles")]
+        elif kind == "article":
+            paths += [reverse("article_detail", args=[value]), reverse("api_article_detail", args=[value])]
+        elif kind == "tag":
+            paths += [f"{reverse('articles')}?{urlencode({'tag': value})}", f"{reverse('api_articles')}?{urlencode({'tag': value})}"]
+        elif kind == "gallery":
+            paths.append(reverse("api_gallery_items", args=[value]))
+    return list(dict.fromkeys(paths))
+
+
+def _send(method, url, headers, timeout):
+    request = urllib.request.Request(url, method=method, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+    except (OSError, ValueError) as exc:
+        logger.warning("Purge %s %s failed: %s", method, url, exc)
+        return None
+
+
+def purge_now(keys):
+    """Send the purge requests for ``keys`` and return ``[(method, url, status)]``."""
+    options = _options()
+    keys = list(dict.fromkeys(key for key in keys if key))
+    proxies = [url.rstrip("/") for url in options.get("PURGE_URLS") or []]
+    if not keys or not proxies:
+        return []
+    timeout = float(options.get("PURGE_TIMEOUT", 2))
+    results = []
+    for proxy in proxies:
+        if options.get("PURGE_MODE", "keys") == "urls":
+            for path in paths_for(keys):
+                url = proxy + path
+                results.append(("PURGE", url, _send("PURGE", url, {}, timeout)))
+        else:
+            method = options.get("PURGE_METHOD", "BAN")
+            headers = {options.get("KEY_HEADER", "Surrogate-Key"): " ".join(keys)}
+            results.append((method, proxy + "/", _send(method, proxy + "/", headers, timeout)))
+    return results
+
+
+def purge(keys):
+    """Queue a purge of ``keys``; the caller never waits on the proxies."""
+    global _executor
+    if not _options().get("PURGE_URLS"):
+        return
+    keys = list(keys)
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="purge")
+    _executor.submit(purge_now, keys)
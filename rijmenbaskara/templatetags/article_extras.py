@@ -42,3 +42,55 @@ def admin_url(context, url_name, *args, **kwargs):
     """
     from django.urls import reverse
     return reverse(url_name, args=args, kwargs=kwargs)
+
+
+@register.filter(name='project_image_url')
+def project_image_url(name):
+    """
+    URL of a project image stored under ``images/`` in media storage
+    (``static/images`` locally, or the configured bucket).
+    """
+    from rijmenbaskara import media
+    return media.get_storage().url(f"images/{name}")
+
+
+@register.simple_tag(takes_context=True)
+def cacheable_csrf_token(context):
+    """
+    ``{% csrf_token %}`` for pages a shared cache may store. With the edge
+    cache enabled the field is left empty (rendering a token would set the
+    CSRF cookie and make the page uncacheable) and static/js/csrf-fill.js
+    fills it from the cookie, or from /api/csrf/, on submit.
+    """
+    from django.middleware.csrf import get_token
+    from django.utils.html import format_html
+    from rijmenbaskara import surrogate
+    if surrogate.enabled():
+        return format_html('<input type="hidden" name="csrfmiddlewaretoken" value="" data-csrf-fill>')
+    request = context.get("request")
+    if request is None:
+        return ""
+    return format_html('<input type="hidden" name="csrfmiddlewaretoken" value="{}">', get_token(request))
+
+
+@register.simple_tag
+def image_attrs(value):
+    """
+    ``width``/``height`` and a blur placeholder for an ``<img>``, from the
+    image metadata index; ``value`` is a media key (``images/...``) or URL.
+    Renders nothing for images the index does not know yet.
+    """
+    from django.utils.html import format_html
+    from rijmenbaskara import imagemeta
+    entry = imagemeta.get(imagemeta.key_for(value))
+    if not entry or not entry.get("width"):
+        return ""
+    attrs = format_html(' width="{}" height="{}"', entry["width"], entry["height"])
+    placeholder = " ".join(part for part in (entry.get("color"), f"url({entry['lqip']})" if entry.get("lqip") else "") if part)
+    if placeholder:
+        # base.css paints --placeholder until the image has loaded
+        attrs += format_html(
+            ' data-placeholder style="--placeholder:{}" onload="this.removeAttribute(\'data-placeholder\')"',
+            placeholder,
+        )
+    return attrs
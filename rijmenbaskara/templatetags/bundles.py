@@ -0,0 +1,33 @@
+from django import template
+from django.utils.html import format_html, format_html_join, mark_safe
+
+from rijmenbaskara import assets
+
+register = template.Library()
+
+
+@register.simple_tag
+def bundle_css(name):
+    """
+    Stylesheets for page bundle ``name``. With critical CSS, that is inlined
+    and the full bundle loads without blocking render.
+    """
+    hrefs = assets.stylesheet_urls(name)
+    critical = None
+    if assets.use_bundles(name) and assets.BUNDLES[name].get("template"):
+        critical = assets.collected_text(assets.bundle_path(name, "critical.css"))
+    if not critical:
+        return format_html_join("\n", '<link rel="stylesheet" href="{}">', ((href,) for href in hrefs))
+    href = hrefs[0]
+    return format_html(
+        '<style>{}</style>\n'
+        '<link rel="preload" href="{}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+        '<noscript><link rel="stylesheet" href="{}"></noscript>',
+        mark_safe(critical.replace("</", "<\\/")), href, href,
+    )
+
+
+@register.simple_tag
+def bundle_js(name):
+    """Deferred script(s) for page bundle ``name``."""
+    return format_html_join("\n", '<script defer src="{}"></script>', ((src,) for src in assets.script_urls(name)))
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from rijmenbaskara.management.commands.check_budgets import (
+    PAGES, measure_page, page_breaches, page_budgets, source_images, synthetic_store,
+)
+
+
+# Tests run with DEBUG off and without collectstatic, so there is no manifest to look names up in
+@override_settings(STORAGES={
+    **settings.STORAGES,
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+class PageBudgetTests(SimpleTestCase):
+    """The public pages stay within ``check_budgets.BUDGETS`` on the synthetic catalogue."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with synthetic_store(source_images()) as article_id:
+            cls.results = {page: measure_page(page, article_id, repeat=3) for page in PAGES}
+
+    def test_pages_within_budget(self):
+        for page, result in self.results.items():
+            with self.subTest(page=page):
+                self.assertEqual(page_breaches(result['metrics'], page_budgets(page)), [])
+
+    def test_every_budgeted_metric_is_measured(self):
+        for page, result in self.results.items():
+            with self.subTest(page=page):
+                self.assertLessEqual(set(page_budgets(page)), set(result['metrics']))
@@ -0,0 +1,34 @@
+from django.test import SimpleTestCase
+
+from rijmenbaskara import mediaserve
+
+
+class HashedNameTests(SimpleTestCase):
+    """Only names with a generated hash or token in a known place are cached as immutable."""
+
+    def test_generated_names_are_hashed(self):
+        for name in (
+            "project_20260101120000_0123abcd.jpg",
+            "project_20260101120000_0123abcd-160.webp",
+            "bulk-20260101120000-0123abcd.png",
+            "direct-20260101120000-0123abcd.jpg",
+            "my-article.0123abcd.jpg",
+            "20260101120000-red-knight-0a1b2c-full.jpg",
+            "20260101120000-red-knight-0a1b2c-thumb.webp",
+            "base.0123456789ab.css",
+        ):
+            with self.subTest(name=name):
+                self.assertTrue(mediaserve.is_hashed_name(name))
+
+    def test_timestamps_and_hex_looking_names_are_not(self):
+        for name in (
+            "project_20260101120000_cover.jpg",
+            "bulk-20260101120000-cover.png",
+            "20260101120000.jpg",
+            "123456.jpg",
+            "deadbeef.jpg",
+            "cafe-babe12-photo.jpg",
+            "Earhart-3-scaled-160.webp",
+        ):
+            with self.subTest(name=name):
+                self.assertFalse(mediaserve.is_hashed_name(name))
@@ -0,0 +1,74 @@
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+
+from rijmenbaskara import jsonstore, views
+
+
+def _append_many(path, worker, count):
+    """Process body: append ``count`` entries to the list store at ``path``, one locked write each."""
+    for n in range(count):
+        jsonstore.update_json(path, lambda current: (current + [f"{worker}-{n}"], None), [])
+
+
+class UpdateJsonTests(SimpleTestCase):
+    """Concurrent writers (separate processes, like gunicorn workers) lose no updates."""
+
+    def test_no_lost_updates_across_processes(self):
+        workers, count = 4, 25
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "store.json"
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(_append_many, [path] * workers, range(workers), [count] * workers))
+            entries = jsonstore.read_json(path, [])
+        self.assertEqual(len(entries), workers * count)
+        self.assertEqual(len(set(entries)), workers * count)
+
+    def test_unchanged_document_is_not_rewritten(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "store.json"
+            jsonstore.write_json_atomic(path, {"items": []})
+            before = path.stat().st_mtime_ns
+            self.assertEqual(jsonstore.update_json(path, lambda current: (None, "kept"), {}), "kept")
+            self.assertEqual(path.stat().st_mtime_ns, before)
+
+
+@mock.patch.object(views.imagemeta, "schedule_refresh", lambda: None)
+@mock.patch.object(views.surrogate, "purge", lambda keys: None)
+class GalleryStoreTests(SimpleTestCase):
+    """Concurrent uploads and deletes keep every surviving item and respect the cap."""
+
+    gallery_id = "test-concurrent-writers"
+
+    def tearDown(self):
+        shutil.rmtree(views._gallery_dir(self.gallery_id), ignore_errors=True)
+        views._GALLERY_SNAPSHOTS.pop(self.gallery_id, None)
+
+    def _upload(self, n):
+        image = SimpleUploadedFile(f"img{n}.jpg", b"\xff\xd8\xff" + b"x" * 512)
+        thumb = SimpleUploadedFile(f"thumb{n}.jpg", b"\xff\xd8\xff" + b"t" * 64)
+        try:
+            return views._save_gallery_item(self.gallery_id, f"item {n}", image, thumb)["id"]
+        except views.GalleryLimitReached:
+            return None
+
+    def test_no_lost_updates(self):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            added = [item_id for item_id in pool.map(self._upload, range(24)) if item_id]
+            deleted = added[::3]
+            removed = list(pool.map(lambda item_id: views._delete_gallery_item(self.gallery_id, item_id), deleted))
+        self.assertTrue(all(removed))
+        final_ids = {item["id"] for item in views._load_gallery_items(self.gallery_id)}
+        self.assertEqual(final_ids, set(added) - set(deleted))
+
+    def test_cap_holds_under_concurrent_uploads(self):
+        with mock.patch.object(views, "WORKS_MAX_ITEMS", 5):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                added = [item_id for item_id in pool.map(self._upload, range(12)) if item_id]
+            self.assertEqual(len(added), 5)
+            self.assertEqual(len(views._load_gallery_items(self.gallery_id)), 5)
@@ -0,0 +1,98 @@
+"""
+Streaming upload handler for image fields.
+
+Every file is streamed to a temporary file on disk while we:
+- enforce a per-field size limit and abort the request body as soon as it is
+  exceeded, instead of after Django has received everything;
+- check magic bytes (and pixel dimensions where the header allows) on the
+  first chunk and skip files that are not images;
+- compute the MD5 used for stored filenames in the same pass, so the save
+  helpers do not have to read the file again.
+
+Rejections are recorded on ``request.upload_rejections`` as
+``{field_name: message}`` so views can show a precise error.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.files.uploadhandler import SkipFile, StopUpload, TemporaryFileUploadHandler
+
+from . import imageinfo
+
+# Enough to reach the JPEG frame header past a typical EXIF block
+_HEADER_BYTES = 256 * 1024
+
+
+def _limit_label(limit):
+    return f"{limit // (1024 * 1024)} MB" if limit >= 1024 * 1024 else f"{limit // 1024} KB"
+
+
+class ImageUploadHandler(TemporaryFileUploadHandler):
+    chunk_size = 64 * 1024
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.request_length = 0
+        if request is not None and not hasattr(request, "upload_rejections"):
+            request.upload_rejections = {}
+
+    def _reject(self, message):
+        if self.request is not None:
+            self.request.upload_rejections[self.field_name] = message
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        self.request_length = content_length or 0
+        return None
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        self.field_name = field_name
+        request_limit = getattr(settings, "UPLOAD_REQUEST_MAX_BYTES", None)
+        if request_limit and self.request_length > request_limit:
+            self._reject(f"Upload too large (max {_limit_label(request_limit)} per request).")
+            raise StopUpload(connection_reset=True)
+
+        field_limits = getattr(settings, "UPLOAD_FIELD_MAX_BYTES", {})
+        self.max_bytes = field_limits.get(field_name, getattr(settings, "UPLOAD_FILE_MAX_BYTES", None))
+        self.hasher = hashlib.md5()
+        self.header = b""
+        self.image_format = None
+        self.image_size = None
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+
+    def _inspect_header(self, raw_data):
+        self.header += raw_data[:_HEADER_BYTES - len(self.header)]
+        if self.image_format is None:
+            self.image_format = imageinfo.sniff_format(self.header)
+            if self.image_format is None:
+                self._reject(f"{self.file_name} is not a supported image.")
+                raise SkipFile()
+        if self.image_size is None:
+            self.image_size = imageinfo.sniff_dimensions(self.header, self.image_format)
+            if self.image_size:
+                width, height = self.image_size
+                max_pixels = getattr(settings, "UPLOAD_MAX_PIXELS", None)
+                if width <= 0 or height <= 0 or (max_pixels and width * height > max_pixels):
+                    self._reject(f"{self.file_name} has unsupported dimensions ({width}x{height}).")
+                    raise SkipFile()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.max_bytes and start + len(raw_data) > self.max_bytes:
+            self._reject(f"{self.file_name} is too large (max {_limit_label(self.max_bytes)}).")
+            self.file.close()
+            raise StopUpload(connection_reset=True)
+        if len(self.header) < _HEADER_BYTES and (self.image_format is None or self.image_size is None):
+            self._inspect_header(raw_data)
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        if self.image_format is None:  # Empty file: no chunk was ever inspected
+            self._reject(f"{self.file_name} is not a supported image.")
+            self.file.close()
+            return None
+        uploaded = super().file_complete(file_size)
+        if uploaded is not None:
+            uploaded.content_hash = self.hasher.hexdigest()
+            uploaded.image_format = self.image_format
+            uploaded.image_size = self.image_size
+        return uploaded
@@ -0,0 +1,241 @@
+"""
+Resumable chunked uploads.
+
+Large photos are sent in parts instead of one multipart request:
+
+1. initiate   -> create a staging entry with the declared name, size and checksum
+2. upload part -> append bytes at the current offset (clients ask for the
+                  offset after a dropped connection and continue from there)
+3. complete   -> verify size and SHA-256, then the upload id can be posted to
+                  the normal forms in place of a file field
+
+Staged files are handed to the existing save helpers as regular Django
+``File`` objects, so nothing downstream needs to know how they arrived.
+"""
+import hashlib
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+
+from . import imageinfo, media
+from .jsonstore import read_json, store_lock, write_json_atomic
+
+STAGING_DIR = Path(settings.BASE_DIR) / "uploads_staging"
+MAX_UPLOAD_SIZE = 200 * 1024 * 1024
+CHUNK_SIZE = 4 * 1024 * 1024
+STALE_AFTER = 24 * 60 * 60
+_READ_BLOCK = 64 * 1024
+_UPLOAD_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+class UploadError(Exception):
+    """A chunked-upload request that cannot be honoured; carries an HTTP status."""
+
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def _manifest_path(upload_id: str) -> Path:
+    return STAGING_DIR / f"{upload_id}.json"
+
+
+def _part_path(upload_id: str) -> Path:
+    return STAGING_DIR / f"{upload_id}.part"
+
+
+def _load_manifest(upload_id: str) -> dict:
+    if not upload_id or not _UPLOAD_ID_RE.match(upload_id):
+        raise UploadError("Unknown upload.", status=404)
+    manifest = read_json(_manifest_path(upload_id), None)
+    if not isinstance(manifest, dict):
+        raise UploadError("Unknown upload.", status=404)
+    return manifest
+
+
+def _current_offset(upload_id: str) -> int:
+    try:
+        return _part_path(upload_id).stat().st_size
+    except OSError:
+        return 0
+
+
+def purge_stale(max_age=STALE_AFTER):
+    """Drop staging entries that were never completed or never consumed."""
+    if not STAGING_DIR.exists():
+        return
+    cutoff = time.time() - max_age
+    for path in STAGING_DIR.iterdir():
+        try:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            continue
+
+
+def initiate(filename: str, size, sha256: str = "") -> dict:
+    filename = Path(filename or "").name
+    if not filename:
+        raise UploadError("filename is required.")
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError("size must be an integer.")
+    if size <= 0 or size > MAX_UPLOAD_SIZE:
+        raise UploadError(f"size must be between 1 and {MAX_UPLOAD_SIZE} bytes.", status=413 if size > 0 else 400)
+    sha256 = (sha256 or "").lower()
+    if sha256 and not re.match(r"^[0-9a-f]{64}$", sha256):
+        raise UploadError("sha256 must be a hex digest.")
+
+    STAGING_DIR.mkdir(parents=True, exist_ok=True)
+    purge_stale()
+    upload_id = uuid.uuid4().hex
+    manifest = {
+        "id": upload_id,
+        "filename": filename,
+        "size": size,
+        "sha256": sha256,
+        "complete": False,
+        "created_at": time.time(),
+    }
+    _part_path(upload_id).touch()
+    write_json_atomic(_manifest_path(upload_id), manifest)
+    return status(upload_id)
+
+
+def status(upload_id: str) -> dict:
+    manifest = _load_manifest(upload_id)
+    return {
+        "upload_id": upload_id,
+        "filename": manifest["filename"],
+        "size": manifest["size"],
+        "offset": _current_offset(upload_id),
+        "complete": bool(manifest.get("complete")),
+        "chunk_size": CHUNK_SIZE,
+    }
+
+
+def write_part(upload_id: str, offset, stream, length) -> int:
+    """
+    Append ``length`` bytes from ``stream`` at ``offset``. The offset must
+    match what is already staged; returns the new offset.
+    """
+    manifest = _load_manifest(upload_id)
+    if manifest.get("complete"):
+        raise UploadError("Upload already completed.", status=409)
+    try:
+        offset = int(offset)
+        length = int(length)
+    except (TypeError, ValueError):
+        raise UploadError("Upload-Offset and Content-Length headers are required.")
+
+    part = _part_path(upload_id)
+    with store_lock(part):
+        current = _current_offset(upload_id)
+        if offset != current:
+            raise UploadError("Offset mismatch.", status=409, offset=current)
+        if current + length > manifest["size"]:
+            raise UploadError("Part exceeds declared size.", status=413, offset=current)
+        remaining = length
+        with part.open("ab") as fh:
+            while remaining > 0:
+                block = stream.read(min(_READ_BLOCK, remaining))
+                if not block:
+                    break
+                fh.write(block)
+                remaining -= len(block)
+        return _current_offset(upload_id)
+
+
+def complete(upload_id: str) -> dict:
+    manifest = _load_manifest(upload_id)
+    part = _part_path(upload_id)
+    with store_lock(part):
+        size = _current_offset(upload_id)
+        if size != manifest["size"]:
+            raise UploadError("Upload is incomplete.", status=409, offset=size)
+        digest = hashlib.sha256()
+        md5 = hashlib.md5()
+        with part.open("rb") as fh:
+            header = fh.read(_READ_BLOCK)
+            if imageinfo.sniff_format(header) is None:
+                discard(upload_id)
+                raise UploadError(f"{manifest['filename']} is not a supported image.", status=422)
+            for block in iter(lambda: header or fh.read(_READ_BLOCK), b""):
+                header = b""
+                digest.update(block)
+                md5.update(block)
+        if manifest.get("sha256") and digest.hexdigest() != manifest["sha256"]:
+            discard(upload_id)
+            raise UploadError("Checksum mismatch; start the upload again.", status=422)
+        manifest["sha256"] = digest.hexdigest()
+        manifest["md5"] = md5.hexdigest()
+        manifest["complete"] = True
+        write_json_atomic(_manifest_path(upload_id), manifest)
+    return status(upload_id)
+
+
+def open_staged(upload_id: str):
+    """Return a Django ``File`` for a completed upload, or ``None``."""
+    try:
+        manifest = _load_manifest(upload_id)
+    except UploadError:
+        return None
+    if not manifest.get("complete"):
+        return None
+    staged = File(_part_path(upload_id).open("rb"), name=manifest["filename"])
+    staged.upload_id = upload_id
+    staged.content_hash = manifest.get("md5")
+    return staged
+
+
+def discard(upload_id: str):
+    if not upload_id or not _UPLOAD_ID_RE.match(upload_id):
+        return
+    part = _part_path(upload_id)
+    for path in (part, _manifest_path(upload_id), part.with_name(f".{part.name}.lock")):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def release(files):
+    """Close and remove staged files once the save helpers have copied them."""
+    for file_obj in files:
+        upload_id = getattr(file_obj, "upload_id", None)
+        if upload_id:
+            file_obj.close()
+            discard(upload_id)
+
+
+def files_from_request(request, field: str, many=False):
+    """
+    Uploaded files for ``field``, falling back to completed chunked uploads
+    posted as ``<field>_upload`` (one or more upload ids) and to objects
+    uploaded straight to media storage, posted as ``<field>_key`` claim
+    tokens (returned as ``media.StoredMedia``).
+    """
+    if many:
+        found = list(request.FILES.getlist(field))
+        for upload_id in request.POST.getlist(f"{field}_upload"):
+            staged = open_staged(upload_id.strip())
+            if staged is not None:
+                found.append(staged)
+        for token in request.POST.getlist(f"{field}_key"):
+            stored = media.claim(token.strip())
+            if stored is not None:
+                found.append(stored)
+        return found
+    file_obj = request.FILES.get(field)
+    if file_obj is None:
+        file_obj = open_staged(request.POST.get(f"{field}_upload", "").strip())
+    if file_obj is None and request.POST.get(f"{field}_key"):
+        file_obj = media.claim(request.POST[f"{field}_key"].strip())
+    return file_obj
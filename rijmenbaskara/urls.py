@@ -16,7 +16,6 @@ Including another URLconf
 """
 from django.urls import path
 from django.conf import settings
-from django.conf.urls.static import static
 from . import views
 
 urlpatterns = [
@@ -29,8 +28,24 @@ urlpatterns = [
     path('projects/<slug:project_id>/edit/', views.edit_project, name='edit_project'),
     path('projects/<slug:project_id>/delete/', views.delete_project, name='delete_project'),
     path('works/<slug:gallery_id>/add/', views.add_work, name='add_work'),
+    path('api/galleries/batch/', views.api_gallery_items_batch, name='api_gallery_items_batch'),
     path('api/galleries/<slug:gallery_id>/items/', views.api_gallery_items, name='api_gallery_items'),
+    path('api/galleries/<slug:gallery_id>/items/filter/', views.api_gallery_items_filter, name='api_gallery_items_filter'),
+    path('api/galleries/<slug:gallery_id>/items/bulk/', views.api_gallery_items_bulk, name='api_gallery_items_bulk'),
+    path('api/galleries/<slug:gallery_id>/items/reorder/', views.api_gallery_items_reorder, name='api_gallery_items_reorder'),
     path('api/galleries/<slug:gallery_id>/items/<slug:item_id>/', views.api_gallery_item_detail, name='api_gallery_item_detail'),
+    path('api/uploads/', views.api_upload_initiate, name='api_upload_initiate'),
+    path('api/uploads/<slug:upload_id>/', views.api_upload_part, name='api_upload_part'),
+    path('api/uploads/<slug:upload_id>/complete/', views.api_upload_complete, name='api_upload_complete'),
+    path('api/media/uploads/', views.api_media_presign, name='api_media_presign'),
+    path('api/articles/', views.api_articles, name='api_articles'),
+    path('api/articles/bulk/', views.api_articles_bulk, name='api_articles_bulk'),
+    path('api/articles/<slug:article_id>/', views.api_article_detail, name='api_article_detail'),
+    path('api/projects/', views.api_projects, name='api_projects'),
+    path('api/projects/filter/', views.api_projects_filter, name='api_projects_filter'),
+    path('api/search/suggest/', views.api_search_suggest, name='api_search_suggest'),
+    path('api/csrf/', views.api_csrf, name='api_csrf'),
+    path('api/admission/', views.api_admission_status, name='api_admission_status'),
     path('articles/', views.articles, name='articles'),
     path('articles/new/', views.add_article, name='add_article'),
     path('articles/manage/', views.manage_articles, name='manage_articles'),
@@ -38,11 +53,12 @@ urlpatterns = [
     path('articles/<slug:article_id>/edit/', views.edit_article, name='edit_article'),
     path('articles/<slug:article_id>/', views.article_detail, name='article_detail'),
     path('about/', views.about, name='about'),
+    path('sw.js', views.service_worker, name='service_worker'),
+    # Uploaded media; files collected at build time are answered by WhiteNoise first
+    path(f"{settings.MEDIA_URL.lstrip('/')}covers/<path:path>", views.serve_media, {'prefix': 'covers/'}, name='serve_cover'),
+    path(f"{settings.STATIC_URL.lstrip('/')}images/<path:path>", views.serve_media, {'prefix': 'images/'}, name='serve_image'),
 ]
 
 # Include admin URL (now works on Vercel with cookie-based sessions)
 from django.contrib import admin
 urlpatterns.insert(0, path('admin/', admin.site.urls))
-
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
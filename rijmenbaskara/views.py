@@ -1,20 +1,38 @@
 from django.shortcuts import render, redirect
+from django.template.loader import render_to_string
 from django.http import HttpResponse, Http404, JsonResponse
 from django.contrib import messages
 from django.core.mail import send_mail
 from django.conf import settings
 from django.urls import reverse
 from django.views.decorators.http import require_http_methods
-from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response
 from pathlib import Path
+import base64
+import bisect
+import contextvars
+import hashlib
 import json
 import re
 import os
 from datetime import datetime
 import zipfile
 import io
+import time
+import uuid
+from urllib.parse import quote, urlencode
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 
+from . import (
+    admission, article_compiler, assets, derivatives, duplicates, facets, hints, imageinfo, imagemeta, media, mediaserve,
+    outbox, reqlog, search, surrogate, uploads,
+)
+from .compression import compress_response
+from .jsonstore import read_json, update_json, write_json_atomic, store_lock
+
 # Authentication storage
 AUTH_STORE_DIR = Path(settings.BASE_DIR) / "auth_store"
 CREDENTIALS_FILE = AUTH_STORE_DIR / "credentials.json"
@@ -97,16 +115,70 @@ def _article_path(article_id: str) -> Path:
     return ARTICLES_DIR / f"{article_id}.json"
 
 
+# Parsed articles keyed by file name, reused while each file's stat signature is unchanged
+_ARTICLE_CACHE = {}
+
+
+def _articles_signature():
+    entries = {}
+    started = time.perf_counter()
+    try:
+        with os.scandir(ARTICLES_DIR) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and not entry.name.startswith(".") and entry.is_file():
+                    st = entry.stat()
+                    entries[entry.name] = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        pass
+    reqlog.record("article_scan", time.perf_counter() - started, files=len(entries))
+    return entries
+
+
+def _article_records():
+    """
+    ``(etag, records_newest_first)`` for the whole store. Only files whose
+    stat signature changed are re-read. Records are shared: do not mutate.
+    """
+    signature = _articles_signature()
+    records = []
+    for name, sig in signature.items():
+        cached = _ARTICLE_CACHE.get(name)
+        if cached is None or cached[0] != sig:
+            started = time.perf_counter()
+            try:
+                data = json.loads((ARTICLES_DIR / name).read_text(encoding="utf-8"))
+                data.setdefault("id", name[:-len(".json")])
+            except Exception:
+                data = None
+            reqlog.record("article_read", time.perf_counter() - started, files=1, read=sig[1])
+            cached = (sig, data)
+            _ARTICLE_CACHE[name] = cached
+        if cached[1] is not None:
+            records.append(cached[1])
+    for name in set(_ARTICLE_CACHE) - set(signature):
+        del _ARTICLE_CACHE[name]
+    records.sort(key=lambda x: (x.get("created_at", ""), str(x.get("id", ""))), reverse=True)
+    digest = hashlib.md5(repr(sorted(signature.items())).encode("utf-8")).hexdigest()[:16]
+    return f'"articles-{digest}"', records
+
+
 def _load_articles():
-    items = []
-    for path in ARTICLES_DIR.glob("*.json"):
-        try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-            data.setdefault("id", path.stem)
-            items.append(data)
-        except Exception:
-            continue
-    return sorted(items, key=lambda x: x.get("created_at", ""), reverse=True)
+    return [dict(item) for item in _article_records()[1]]
+
+
+def _filter_articles(items, tag="", query=""):
+    """Tag filter plus case-insensitive search over title, subtitle and tags."""
+    if tag:
+        items = [a for a in items if tag in (a.get("tags") or [])]
+    if query:
+        query = query.lower()
+        items = [
+            a for a in items
+            if query in (a.get("title") or "").lower()
+            or query in (a.get("subtitle") or "").lower()
+            or query in " ".join(a.get("tags") or []).lower()
+        ]
+    return items
 
 
 def _load_article(article_id: str):
@@ -118,16 +190,50 @@ def _load_article(article_id: str):
     return data
 
 
+def _write_article(record: dict):
+    """Compile the body into its render-ready form and write the article atomically."""
+    article_compiler.compile_article(record)
+    path = _article_path(record["id"])
+    with store_lock(path):
+        write_json_atomic(path, record)
+
+
+def _save_article(record: dict):
+    _write_article(record)
+    _index_article(record)
+
+
+def _article_surrogate_keys(record, previous_tags=()):
+    """Keys of every cached response that shows ``record`` (before and after a change)."""
+    tags = set(previous_tags) | set(record.get("tags") or [])
+    return [
+        surrogate.article_key(record.get("id")), surrogate.ARTICLES, surrogate.HOME,
+        *(surrogate.tag_key(t) for t in sorted(tags)),
+    ]
+
+
+def _store_article_cover(cover_file, name: str) -> str:
+    """Store an uploaded cover under ``covers/`` and return its URL."""
+    if isinstance(cover_file, media.StoredMedia):
+        if not cover_file.under("covers/"):
+            raise ValueError(f"{cover_file.name} was not uploaded as a cover.")
+        url = cover_file.url
+    else:
+        url = media.store(f"covers/{name}{Path(cover_file.name).suffix.lower()}", cover_file)
+    imagemeta.schedule_refresh()
+    return url
+
+
+def _projects_file() -> Path:
+    return PROJECTS_DIR / "seed_projects.json"
+
+
 def _load_projects():
     """Load all projects from projects_store directory"""
-    projects_file = PROJECTS_DIR / "seed_projects.json"
-    if projects_file.exists():
-        try:
-            data = json.loads(projects_file.read_text(encoding="utf-8"))
-            return sorted(data, key=lambda x: x.get("created_at", ""), reverse=True)
-        except Exception:
-            pass
-    return []
+    data = read_json(_projects_file(), [])
+    if not isinstance(data, list):
+        return []
+    return sorted(data, key=lambda x: x.get("created_at", ""), reverse=True)
 
 
 def _load_project(project_id: str):
@@ -139,41 +245,80 @@ def _load_project(project_id: str):
     raise Http404("Project not found")
 
 
-def _save_projects(projects):
-    """Save projects list to JSON file"""
+def _update_projects(mutate):
+    """
+    Apply ``mutate(projects) -> (projects_or_None, result)`` under the store lock
+    so concurrent workers cannot overwrite each other's changes.
+    """
     if os.environ.get('VERCEL'):
-        return  # Cannot write on read-only filesystem
-    projects_file = PROJECTS_DIR / "seed_projects.json"
-    projects_file.write_text(json.dumps(projects, indent=2), encoding="utf-8")
+        return mutate(_load_projects())[1]  # Read-only: evaluate without saving
+
+    def _apply(current):
+        projects = current if isinstance(current, list) else []
+        return mutate(projects)
+
+    result = update_json(_projects_file(), _apply, [])
+    _index_projects(_load_projects())
+    surrogate.purge([surrogate.WORKS, surrogate.HOME])
+    return result
+
+
+PROJECT_IMAGE_PREFIX = "images/project_"
+
+
+def _project_image_url(name: str) -> str:
+    return media.get_storage().url(f"images/{name}")
 
 
 def _save_project_image(uploaded_file):
-    """Save an uploaded image to static/images and return the filename"""
-    import hashlib
-    from django.core.files.storage import default_storage
-    
-    # Generate unique filename
-    ext = Path(uploaded_file.name).suffix.lower()
-    timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-    hash_part = hashlib.md5(uploaded_file.read()).hexdigest()[:8]
-    uploaded_file.seek(0)  # Reset file pointer
-    filename = f"project_{timestamp}_{hash_part}{ext}"
-    
-    # Save to static/images (disabled on Vercel)
-    if os.environ.get('VERCEL'):
-        return None  # Cannot save on read-only filesystem
-    
-    images_dir = Path(settings.BASE_DIR) / "static" / "images"
-    images_dir.mkdir(parents=True, exist_ok=True)
-    filepath = images_dir / filename
-    
-    with open(filepath, 'wb+') as destination:
-        for chunk in uploaded_file.chunks():
-            destination.write(chunk)
-    
+    """Save an uploaded image to media storage (static/images locally) and return the filename"""
+    if isinstance(uploaded_file, media.StoredMedia):
+        # Already uploaded straight to storage through a presigned upload
+        if not uploaded_file.under(PROJECT_IMAGE_PREFIX) or "/" in uploaded_file.key[len("images/"):]:
+            raise ValueError(f"{uploaded_file.name} was not uploaded as a project image.")
+        filename = uploaded_file.name
+    else:
+        # Generate unique filename
+        ext = Path(uploaded_file.name).suffix.lower()
+        timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+        # The upload handler hashes while streaming; only staged/other files are re-read
+        content_hash = getattr(uploaded_file, "content_hash", None)
+        if not content_hash:
+            content_hash = hashlib.md5(uploaded_file.read()).hexdigest()
+            uploaded_file.seek(0)  # Reset file pointer
+        hash_part = content_hash[:8]
+        filename = f"project_{timestamp}_{hash_part}{ext}"
+
+        # Save to media storage (disabled on Vercel)
+        if os.environ.get('VERCEL'):
+            return None  # Cannot save on read-only filesystem
+        media.store(f"images/{filename}", uploaded_file)
+
+    if media.get_storage().is_local:
+        derivatives.make_thumbnail(filename)
+    imagemeta.schedule_refresh()
     return filename
 
 
+def _upload_rejections(request) -> dict:
+    """Files the streaming upload handler refused, as ``{field_name: message}``."""
+    request.FILES  # Make sure the body has been parsed
+    return getattr(request, "upload_rejections", {})
+
+
+def _duplicate_warnings(files) -> list:
+    """Messages for uploads that look like images already in storage (see settings.IMAGE_DUPLICATES)."""
+    if not settings.IMAGE_DUPLICATES.get('WARN_ON_UPLOAD'):
+        return []
+    found = []
+    for file_obj in files:
+        matches = duplicates.find_for_upload(file_obj)
+        if matches:
+            stored = ", ".join(key for key, _ in matches)
+            found.append(f"{file_obj.name} looks like an image already stored ({stored}).")
+    return found
+
+
 def _ensure_staff(request):
     """POC: Always return True - all users are staff"""
     return True
@@ -183,6 +328,8 @@ TAG_CHOICES = [
     "40k", "30k", "Age of Sigmar"
 ]
 
+CONTACT_RECIPIENT = 'rijmenbaskara@gmail.com'
+
 IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp", ".tif", ".tiff"}
 WORKS_MAX_ITEMS = 10
 GALLERIES_DIR = Path(settings.BASE_DIR) / "static" / "images" / "galleries"
@@ -202,14 +349,18 @@ def contact(request):
             full_message = f'From: {email}\n\nMessage:\n{message}'
             
             try:
-                # Send email
-                send_mail(
-                    subject,
-                    full_message,
-                    email,  # From email
-                    ['rijmenbaskara@gmail.com'],  # To email
-                    fail_silently=False,
-                )
+                if os.environ.get('VERCEL'):
+                    # No outbox worker on Vercel: send inline
+                    send_mail(
+                        subject,
+                        full_message,
+                        email,  # From email
+                        [CONTACT_RECIPIENT],  # To email
+                        fail_silently=False,
+                    )
+                else:
+                    # Queue for the deliver_outbox worker so SMTP stalls never hold a request
+                    outbox.enqueue(subject, full_message, email, [CONTACT_RECIPIENT])
                 messages.success(request, 'Your message has been sent successfully!')
             except Exception as e:
                 messages.error(request, f'Failed to send message. Please try again later.')
@@ -218,6 +369,7 @@ def contact(request):
         else:
             messages.error(request, 'Please fill in all fields.')
     
+    surrogate.tag(request, surrogate.SITE)
     return render(request, 'contact.html')
 
 def home(request):
@@ -228,7 +380,8 @@ def home(request):
     for project in projects:
         for image in project.get('images', [])[:2]:  # Take up to 2 images per project
             hero_images.append({
-                'src': f'images/{image}'
+                'src': _project_image_url(image),
+                'key': f"images/{image}",
             })
     
     # Prepare works items from projects
@@ -238,37 +391,101 @@ def home(request):
             works_items.append({
                 'title': project.get('title', ''),
                 'slug': project.get('id', ''),
-                'thumb': f"images/{project['images'][0]}",
+                'thumb': _project_image_url(project['images'][0]),
+                'key': f"images/{project['images'][0]}",
                 'category': project.get('category', '')
             })
     
+    hero_images = hero_images if hero_images else works_items
+    surrogate.tag(request, surrogate.HOME, surrogate.WORKS)
+    if hero_images:
+        hints.add(request, hero_images[0].get('src') or hero_images[0].get('thumb'), as_="image", fetchpriority="high")
     return render(request, 'home.html', {
         "works_items": works_items,
-        "hero_images": hero_images if hero_images else works_items
+        "hero_images": hero_images
     })
 
-def works(request):
+WORKS_PAGE_SIZE = 6
+PROJECT_PAGE_MAX = 50
+# Works page filter buttons: (category value, label)
+PROJECT_CATEGORIES = (
+    ("30k", "30k"),
+    ("40k", "40k"),
+    ("terrain", "Terrain"),
+    ("age-of-sigmar", "Age of Sigmar"),
+)
+PROJECT_FIELDS = ("id", "title", "description", "category", "created_at", "images")
+
+
+def _project_sort_key(project):
+    return (str(project.get("created_at", "")), str(project.get("id", "")))
+
+
+def _project_card(project):
+    """Project plus ``image_set``: each image with the small derivative used in thumbnail strips."""
+    card = dict(project)
+    card["image_set"] = [
+        {"name": name, "thumb": derivatives.thumbnail_for(name)}
+        for name in project.get("images") or []
+    ]
+    return card
+
+
+def _projects_page(page_size, cursor=None, category="", query=""):
+    """``(projects, next_cursor)``: newest first, keyset-paginated on (created_at, id)."""
     projects = _load_projects()
+    if category and category != "all":
+        projects = [p for p in projects if p.get("category") == category]
+    if query:
+        query = query.lower()
+        projects = [p for p in projects if query in (p.get("title") or "").lower()]
+    projects.sort(key=_project_sort_key, reverse=True)
+    if cursor is not None:
+        projects = [p for p in projects if _project_sort_key(p) < cursor]
+    page = projects[:page_size]
+    next_cursor = _encode_cursor(_project_sort_key(page[-1])) if len(projects) > page_size else None
+    return page, next_cursor
+
+
+def works(request):
+    # Only the first page is rendered; projects-loader.js fetches the rest on
+    # scroll and filter.js asks the facet index for other selections
+    cursor = _decode_created_cursor(request.GET.get("cursor", "")) if request.GET.get("cursor") else None
+    selected = _parse_facet_selection(request.GET)
+    query = request.GET.get("q", "").strip()
+    result = _projects_facet_index().query(selected, query, limit=WORKS_PAGE_SIZE, after=cursor)
+    projects = result.items
+    next_cursor = _encode_cursor(result.next_key) if result.next_key else None
+    category_counts = result.counts["category"]
+    active_categories = selected.get("category") or ["all"]
+    category_filters = [
+        {"value": "all", "label": "All", "count": sum(category_counts.values()), "active": "all" in active_categories},
+    ] + [
+        {"value": value, "label": label, "count": category_counts.get(value, 0), "active": value in active_categories}
+        for value, label in PROJECT_CATEGORIES
+    ]
+    # The first project's active slide is the largest thing above the fold
+    lcp_image = (projects[0].get("images") or [None])[0] if projects else None
+    surrogate.tag(request, surrogate.WORKS, *(surrogate.project_key(p.get("id")) for p in projects))
+    if lcp_image:
+        hints.add(request, _project_image_url(lcp_image), as_="image", fetchpriority="high")
     # POC: Always admin mode
     is_admin = True
     return render(request, 'works.html', {
-        "projects": projects,
+        "projects": [_project_card(p) for p in projects],
+        "next_cursor": next_cursor,
+        "filter_query": urlencode({k: v for k, v in (("category", ",".join(selected.get("category", []))), ("q", query)) if v}),
+        "category_filters": category_filters,
+        "works_query": query,
         "is_admin": is_admin,
+        "lcp_image": lcp_image,
     })
 
 def articles(request):
-    items = _load_articles()
     active_tag = request.GET.get('tag', '').strip()
     query = request.GET.get('q', '').strip().lower()
-    if active_tag:
-        items = [a for a in items if active_tag in (a.get("tags") or [])]
-    if query:
-        items = [
-            a for a in items
-            if query in (a.get("title") or "").lower()
-            or query in (a.get("subtitle") or "").lower()
-            or query in " ".join(a.get("tags") or []).lower()
-        ]
+    items = _filter_articles(_load_articles(), active_tag, query)
+    surrogate.tag(request, surrogate.ARTICLES, surrogate.tag_key(active_tag) if active_tag else None)
 
     year_groups = {}
     for art in items:
@@ -286,6 +503,7 @@ def articles(request):
     })
 
 def about(request):
+    surrogate.tag(request, surrogate.SITE)
     return render(request, 'about.html')
 
 
@@ -321,6 +539,16 @@ def article_detail(request, article_id):
     if len(related_posts) < 3:
         related_posts.extend(other_articles[:3 - len(related_posts)])
     
+    # Related posts and their titles are part of this page too
+    surrogate.tag(
+        request,
+        surrogate.article_key(article.get("id") or article_id),
+        *(surrogate.tag_key(t) for t in current_tags),
+        *(surrogate.article_key(post.get("id")) for post in related_posts),
+    )
+    hints.add(request, article.get("cover"), as_="image", fetchpriority="high")
+    for post in related_posts:
+        hints.add(request, reverse('article_detail', args=[post.get("slug") or post.get("id")]), rel="prefetch")
     return render(request, 'article_detail.html', {
         "article": article,
         "related_posts": related_posts,
@@ -339,11 +567,172 @@ def edit_article(request, article_id):
     return _article_form(request, article_id=article_id, is_edit=True)
 
 
+BULK_ARTICLE_ACTIONS = ("retag", "delete", "cover", "republish")
+BULK_TAG_MODES = ("add", "remove", "replace")
+_ARTICLE_ID_RE = re.compile(r"[-a-zA-Z0-9_]+")
+
+
+def _parse_publish_date(value: str):
+    """``YYYY-MM-DD`` or an ISO datetime, in the stored ``%Y%m%d%H%M%S`` form."""
+    try:
+        return datetime.fromisoformat(value.strip()).strftime("%Y%m%d%H%M%S")
+    except (AttributeError, ValueError):
+        return None
+
+
+def _owned_cover_key(record):
+    """Storage key of the cover written for this article alone (not a shared bulk cover), if any."""
+    key = media.key_for_url(record.get("cover") or "", "covers/")
+    if key and Path(key).name.startswith(f"{record.get('id')}."):
+        return key
+    return None
+
+
+def _validate_bulk_articles(action, ids, options):
+    errors = {}
+    if action not in BULK_ARTICLE_ACTIONS:
+        errors["action"] = f"Action must be one of: {', '.join(BULK_ARTICLE_ACTIONS)}."
+    if not isinstance(ids, list) or not ids:
+        errors["ids"] = "Select at least one article."
+    elif not all(isinstance(i, str) and _ARTICLE_ID_RE.fullmatch(i) for i in ids):
+        errors["ids"] = "Article ids must be slugs."
+    if action == "retag":
+        if options.get("mode", "add") not in BULK_TAG_MODES:
+            errors["mode"] = f"Mode must be one of: {', '.join(BULK_TAG_MODES)}."
+        tags = options.get("tags")
+        if not isinstance(tags, list) or not all(isinstance(t, str) for t in tags):
+            errors["tags"] = "Tags must be a list."
+        elif not tags and options.get("mode", "add") != "replace":
+            errors["tags"] = "Choose at least one tag."
+    elif action == "cover":
+        if options.get("cover_file") is None and not isinstance(options.get("cover"), (str, type(None))):
+            errors["cover"] = "Cover must be a URL, null, or an uploaded image."
+    elif action == "republish":
+        if _parse_publish_date(options.get("date")) is None:
+            errors["date"] = "Date must be YYYY-MM-DD or an ISO datetime."
+    return errors
+
+
+def _bulk_article_action(action, ids, options):
+    """
+    Apply one action to many articles in a single pass over their files.
+    Only the selected articles are read. The suggestion index is updated
+    once at the end. Returns per-article ``{"id", "status", "message"}``.
+    """
+    now = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    cover_url = options.get("cover")
+    if action == "cover" and options.get("cover_file") is not None:
+        token = getattr(options["cover_file"], "content_hash", None) or uuid.uuid4().hex
+        cover_url = _store_article_cover(options["cover_file"], f"bulk-{now}-{token[:8]}")
+    publish_at = _parse_publish_date(options.get("date")) if action == "republish" else None
+    tags = list(dict.fromkeys(t.strip() for t in options.get("tags") or [] if t.strip()))
+    mode = options.get("mode", "add")
+
+    def _apply(record, article_id, path):
+        # Runs under the article's store lock, so an edit saved meanwhile is not overwritten
+        if not isinstance(record, dict):
+            if path.exists():
+                return None, ("error", "Article file is unreadable.", None, None)
+            return None, ("missing", "Article not found.", None, None)
+        record.setdefault("id", article_id)
+        previous = dict(record)
+        if action == "delete":
+            path.unlink()
+            return None, ("ok", "Deleted.", previous, None)
+        if action == "retag":
+            current = record.get("tags") or []
+            if mode == "add":
+                record["tags"] = current + [t for t in tags if t not in current]
+            elif mode == "remove":
+                record["tags"] = [t for t in current if t not in tags]
+            else:
+                record["tags"] = tags
+        elif action == "cover":
+            record["cover"] = cover_url or None
+        elif action == "republish":
+            record["created_at"] = publish_at
+        record["updated_at"] = now
+        article_compiler.compile_article(record)
+        return record, ("ok", "Updated.", previous, record)
+
+    results, saved, removed, purge_keys = [], [], [], []
+    for article_id in dict.fromkeys(ids):
+        path = _article_path(article_id)
+        try:
+            status, message, previous, record = update_json(
+                path, lambda record: _apply(record, article_id, path), None,
+            )
+        except OSError as exc:
+            results.append({"id": article_id, "status": "error", "message": str(exc)})
+            continue
+        results.append({"id": article_id, "status": status, "message": message})
+        lock = path.parent / f".{path.name}.lock"
+        if status != "ok":
+            if status == "missing":
+                _unlink_quietly([lock])  # Taken for an article that does not exist
+            continue
+        purge_keys += _article_surrogate_keys(previous)
+        if action == "delete":
+            _unlink_quietly([lock])
+            media.delete([_owned_cover_key(previous)])
+            removed.append(article_id)
+            continue
+        if action == "cover" and _owned_cover_key(previous) != _owned_cover_key(record):
+            media.delete([_owned_cover_key(previous)])
+        saved.append(record)
+
+    _index_article_changes(saved, removed)
+    purge_keys += [key for record in saved for key in _article_surrogate_keys(record)]
+    surrogate.purge(dict.fromkeys(purge_keys))
+    return results
+
+
+def _bulk_article_summary(results):
+    return {status: sum(1 for r in results if r["status"] == status) for status in ("ok", "missing", "error")}
+
+
 def manage_articles(request):
     if not _ensure_staff(request):
         return redirect('articles')
+    bulk_results = None
+    status = 200
+    if request.method == 'POST':
+        action = request.POST.get('action', '')
+        options = {
+            "tags": request.POST.getlist('tags'),
+            "mode": request.POST.get('mode', 'add'),
+            "cover": None,
+            "cover_file": uploads.files_from_request(request, 'cover'),
+            "date": request.POST.get('date', ''),
+        }
+        ids = request.POST.getlist('ids')
+        errors = _validate_bulk_articles(action, ids, options)
+        # Clearing covers deletes their files: the form needs a file or an explicit opt-in
+        # (``cover: null`` stays available on the JSON API)
+        if action == "cover" and options["cover_file"] is None and request.POST.get('remove_cover') != 'on':
+            errors['cover'] = 'Choose a cover image, or tick "Remove cover instead" to clear the covers.'
+        if _upload_rejections(request).get('cover'):
+            errors['cover'] = _upload_rejections(request)['cover']
+        if os.environ.get('VERCEL'):
+            messages.error(request, 'Content editing is disabled on Vercel (read-only deployment).')
+        elif errors:
+            status = 400
+            for msg in errors.values():
+                messages.error(request, msg)
+        else:
+            bulk_results = _bulk_article_action(action, ids, options)
+            summary = _bulk_article_summary(bulk_results)
+            if summary["ok"]:
+                messages.success(request, f'{summary["ok"]} article(s) updated.' if action != 'delete'
+                                 else f'{summary["ok"]} article(s) deleted.')
+            if summary["missing"] or summary["error"]:
+                messages.error(request, f'{summary["missing"] + summary["error"]} article(s) could not be changed.')
     items = _load_articles()
-    return render(request, 'manage_articles.html', {"articles": items})
+    return render(request, 'manage_articles.html', {
+        "articles": items,
+        "tag_choices": TAG_CHOICES,
+        "bulk_results": [r for r in bulk_results or [] if r["status"] != "ok"],
+    }, status=status)
 
 
 def export_content_backup(request):
@@ -443,8 +832,8 @@ def add_work(request, gallery_id="default"):
     if request.method == 'POST':
         title = request.POST.get('title', '').strip()
         draft_title = title
-        image_file = request.FILES.get('image')
-        thumb_file = request.FILES.get('thumbnail')
+        image_file = uploads.files_from_request(request, 'image')
+        thumb_file = uploads.files_from_request(request, 'thumbnail')
 
         if limit_reached:
             errors.setdefault("limit", []).append(f"Limit reached ({WORKS_MAX_ITEMS} photos). Remove one to add another.")
@@ -462,15 +851,29 @@ def add_work(request, gallery_id="default"):
             errors.setdefault("image", []).append("Full image must be an image file.")
         if thumb_file and not _valid_image(thumb_file):
             errors.setdefault("thumbnail", []).append("Thumbnail must be an image file.")
+        for field, message in _upload_rejections(request).items():
+            errors[field] = [message]
 
         # Block saves on Vercel
         if os.environ.get('VERCEL'):
             errors.setdefault("vercel", []).append("Content editing is disabled on Vercel (read-only deployment).")
 
         if not errors and used_count < WORKS_MAX_ITEMS:
-            new_item = _save_gallery_item(gallery_id, title, image_file, thumb_file)
+            # Checked before saving so the upload does not match itself
+            warnings = _duplicate_warnings([image_file])
+            try:
+                new_item = _save_gallery_item(gallery_id, title, image_file, thumb_file)
+            except GalleryLimitReached as exc:
+                new_item = None
+                errors.setdefault("limit", []).append(str(exc))
+            except ValueError as exc:  # A claimed upload from another gallery
+                new_item = None
+                errors.setdefault("image", []).append(str(exc))
             if new_item:
+                uploads.release([image_file, thumb_file])
                 messages.success(request, "Work added.")
+                for warning in warnings:
+                    messages.warning(request, warning)
                 target = f"{reverse('works')}?gallery={gallery_id}&select={new_item.get('id')}"
                 return redirect(target)
 
@@ -524,6 +927,7 @@ def _article_form(request, article_id=None, is_edit=False):
         if not (title and body_html):
             messages.error(request, 'Please add a title and some body text.')
         else:
+            previous_tags = list((existing or {}).get("tags") or [])
             if is_edit and article_id:
                 record = existing or _load_article(article_id)
                 record.update({
@@ -551,18 +955,24 @@ def _article_form(request, article_id=None, is_edit=False):
                 }
 
             cover_path = existing.get("cover") if existing else None
-            if request.FILES.get('cover'):
+            if _upload_rejections(request).get('cover'):
+                messages.error(request, _upload_rejections(request)['cover'])
+            cover_file = uploads.files_from_request(request, 'cover')
+            if cover_file:
                 # Prevent writes on Vercel (read-only filesystem)
                 if os.environ.get('VERCEL'):
                     messages.error(request, 'File uploads are disabled on Vercel (read-only deployment).')
                 else:
-                    cover_file = request.FILES['cover']
-                    cover_name = f"{article_id}{Path(cover_file.name).suffix}"
-                    target = ARTICLES_COVERS_DIR / cover_name
-                    with target.open('wb') as fh:
-                        for chunk in cover_file.chunks():
-                            fh.write(chunk)
-                    cover_path = f"{settings.MEDIA_URL}covers/{cover_name}"
+                    try:
+                        # Hashed name so a replaced cover gets a new URL and can be cached for good
+                        token = getattr(cover_file, "content_hash", None) or uuid.uuid4().hex
+                        cover_path = _store_article_cover(cover_file, f"{article_id}.{token[:8]}")
+                        previous_key = _owned_cover_key(existing or {})
+                        if previous_key and previous_key != media.key_for_url(cover_path, "covers/"):
+                            media.delete([previous_key])
+                    except ValueError as exc:
+                        messages.error(request, str(exc))
+                    uploads.release([cover_file])
 
             record["cover"] = cover_path
             record["id"] = article_id
@@ -570,10 +980,8 @@ def _article_form(request, article_id=None, is_edit=False):
 
             # Prevent writes on Vercel (read-only filesystem)
             if not os.environ.get('VERCEL'):
-                _article_path(article_id).write_text(
-                    json.dumps(record, ensure_ascii=False, indent=2),
-                    encoding="utf-8"
-                )
+                _save_article(record)
+                surrogate.purge(_article_surrogate_keys(record, previous_tags))
                 messages.success(
                     request,
                     'Draft saved locally.' if is_edit else 'Draft created locally.'
@@ -671,92 +1079,256 @@ def _gallery_meta_path(gallery_id: str) -> Path:
 
 
 def _load_gallery_meta(gallery_id: str) -> dict:
-    meta_path = _gallery_meta_path(gallery_id)
-    if not meta_path.exists():
-        return {"items": []}
-    try:
-        return json.loads(meta_path.read_text(encoding="utf-8"))
-    except Exception:
+    data = read_json(_gallery_meta_path(gallery_id), {"items": []})
+    if not isinstance(data, dict):
         return {"items": []}
+    return data
 
 
-def _save_gallery_meta(gallery_id: str, data: dict):
-    if os.environ.get('VERCEL'):
-        return  # Cannot write on read-only filesystem
-    dir_path = _gallery_dir(gallery_id)
-    dir_path.mkdir(parents=True, exist_ok=True)
+def _update_gallery_meta(gallery_id: str, mutate):
+    """
+    Locked read-modify-write of ``gallery.json``. ``mutate(meta)`` returns
+    ``(meta_or_None, result)``; the stored ``version`` is bumped on each write.
+    """
+    written = []
+
+    def _apply(current):
+        meta = current if isinstance(current, dict) else {"items": []}
+        meta, result = mutate(meta)
+        written.append(meta is not None)
+        return meta, result
+
+    result = update_json(_gallery_meta_path(gallery_id), _apply, {"items": []})
+    if any(written):
+        surrogate.purge([surrogate.gallery_key(gallery_id)])
+    return result
+
+
+# Sorted gallery snapshots keyed by gallery id, reused until gallery.json changes on disk
+_GALLERY_SNAPSHOTS = {}
+
+
+def _gallery_sort_key(item):
+    # position is only set once a gallery has been reordered; otherwise newest first
+    return (int(item.get("position") or 0), str(item.get("createdAt", "")), str(item.get("id", "")))
+
+
+def _gallery_snapshot(gallery_id: str):
+    """
+    Return ``(etag, items_newest_first, keys_oldest_first)`` for a gallery.
+    Re-reads and re-sorts only when the file's stat signature changes.
+    """
     meta_path = _gallery_meta_path(gallery_id)
-    meta_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    try:
+        st = meta_path.stat()
+        signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+    except OSError:
+        signature = None
+    cached = _GALLERY_SNAPSHOTS.get(gallery_id)
+    if cached and cached[0] == signature and signature is not None:
+        return cached[1]
+
+    meta = _load_gallery_meta(gallery_id)
+    items = sorted(meta.get("items") or [], key=_gallery_sort_key, reverse=True)
+    keys = [_gallery_sort_key(item) for item in reversed(items)]
+    etag = f'"{gallery_id}-{signature[1]}-{signature[2]}"' if signature else f'"{gallery_id}-0"'
+    snapshot = (etag, items, keys)
+    if signature is None:
+        # Missing gallery: not cached, or any requested slug would add an entry for good
+        _GALLERY_SNAPSHOTS.pop(gallery_id, None)
+    else:
+        _GALLERY_SNAPSHOTS[gallery_id] = (signature, snapshot)
+    return snapshot
 
 
 def _load_gallery_items(gallery_id: str):
-    meta = _load_gallery_meta(gallery_id)
-    items = meta.get("items") or []
-    return sorted(items, key=lambda x: x.get("createdAt", ""), reverse=True)
+    return list(_gallery_snapshot(gallery_id)[1])
 
 
 def _gallery_item_count(gallery_id: str) -> int:
     return len(_load_gallery_items(gallery_id))
 
 
-def _save_gallery_item(gallery_id: str, title: str, image_file, thumb_file):
-    if os.environ.get('VERCEL'):
-        return None  # Cannot write on read-only filesystem
-    dir_path = _gallery_dir(gallery_id)
-    dir_path.mkdir(parents=True, exist_ok=True)
+class GalleryLimitReached(Exception):
+    """Raised when a gallery already holds ``WORKS_MAX_ITEMS`` items."""
+
+
+def _unlink_quietly(paths):
+    for path in paths:
+        try:
+            if path.exists():
+                path.unlink()
+        except Exception:
+            continue
+
+
+def _gallery_media_prefix(gallery_id: str) -> str:
+    return f"images/galleries/{_slugify(gallery_id)}/"
+
+
+def _store_gallery_files(gallery_id: str, title: str, image_file, thumb_file):
+    """
+    Store an item's image and thumbnail under the gallery's media prefix.
+    Returns ``(item, keys)``; the item is not yet in ``gallery.json``.
+    """
+    prefix = _gallery_media_prefix(gallery_id)
     timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
     base_slug = _slugify(title) or "work"
+    # Same title uploaded twice in one second must not collide on disk
+    token = uuid.uuid4().hex[:6]
+    stored = []
 
     def _store(file_obj, label):
-        fname = f"{timestamp}-{base_slug}-{label}{Path(file_obj.name).suffix.lower()}"
-        target = dir_path / fname
-        with target.open('wb') as fh:
-            for chunk in file_obj.chunks():
-                fh.write(chunk)
-        return fname
-
-    image_name = _store(image_file, "full")
-    thumb_name = _store(thumb_file, "thumb")
-    item_id = f"{timestamp}-{base_slug}"
+        if isinstance(file_obj, media.StoredMedia):
+            if not file_obj.under(prefix):
+                raise ValueError(f"{file_obj.name} was not uploaded to this gallery.")
+            return file_obj.key
+        key = f"{prefix}{timestamp}-{base_slug}-{token}-{label}{Path(file_obj.name).suffix.lower()}"
+        media.store(key, file_obj)
+        stored.append(key)
+        return key
+
+    try:
+        image_key = _store(image_file, "full")
+        thumb_key = _store(thumb_file, "thumb")
+    except Exception:
+        media.delete(stored)
+        raise
+    imagemeta.schedule_refresh()
+    storage = media.get_storage()
     item = {
-        "id": item_id,
+        "id": f"{timestamp}-{base_slug}-{token}",
         "title": title,
-        "src": f"/static/images/galleries/{_slugify(gallery_id)}/{image_name}",
-        "thumb": f"/static/images/galleries/{_slugify(gallery_id)}/{thumb_name}",
+        "src": storage.url(image_key),
+        "thumb": storage.url(thumb_key),
         "createdAt": timestamp,
         "tags": ["Quality:Upload", "Genre:Misc"],
     }
+    return item, [image_key, thumb_key]
 
-    meta = _load_gallery_meta(gallery_id)
-    items = meta.get("items") or []
-    items.append(item)
-    meta["items"] = items
-    _save_gallery_meta(gallery_id, meta)
+
+def _commit_gallery_items(gallery_id: str, new_items, keys):
+    """
+    Append already-stored items to ``gallery.json`` in one locked write.
+    All-or-nothing: if they would exceed ``WORKS_MAX_ITEMS`` their files are
+    removed and ``GalleryLimitReached`` is raised.
+    """
+    def _append(meta):
+        items = meta.get("items") or []
+        if len(items) + len(new_items) > WORKS_MAX_ITEMS:
+            return None, False
+        # Once a gallery has been reordered, new uploads go on top
+        top = max((item.get("position", 0) for item in items), default=0)
+        for offset, item in enumerate(reversed(new_items), start=1):
+            if top:
+                item["position"] = top + offset
+            items.append(item)
+        meta["items"] = items
+        return meta, True
+
+    if not _update_gallery_meta(gallery_id, _append):
+        media.delete(keys)
+        raise GalleryLimitReached(f"Limit reached ({WORKS_MAX_ITEMS} photos). Remove one to add another.")
+
+
+def _save_gallery_item(gallery_id: str, title: str, image_file, thumb_file):
+    if os.environ.get('VERCEL'):
+        return None  # Cannot write on read-only filesystem
+    # Files are written outside the lock; only the metadata commit is serialized
+    item, keys = _store_gallery_files(gallery_id, title, image_file, thumb_file)
+    _commit_gallery_items(gallery_id, [item], keys)
     return item
 
 
-def _delete_gallery_item(gallery_id: str, item_id: str):
-    dir_path = _gallery_dir(gallery_id)
-    meta = _load_gallery_meta(gallery_id)
-    items = meta.get("items") or []
-    remaining = []
-    deleted_paths = []
-    for item in items:
-        if str(item.get("id")) == str(item_id):
-            if item.get("src"):
-                deleted_paths.append(dir_path / Path(item["src"]).name)
-            if item.get("thumb"):
-                deleted_paths.append(dir_path / Path(item["thumb"]).name)
-            continue
-        remaining.append(item)
-    meta["items"] = remaining
-    _save_gallery_meta(gallery_id, meta)
-    for path in deleted_paths:
-        try:
-            if path.exists():
-                path.unlink()
-        except Exception:
-            continue
+def _save_gallery_items(gallery_id: str, entries):
+    """
+    Store many ``(title, image_file, thumb_file)`` entries: file writes run in
+    parallel, then a single metadata commit adds them all.
+    """
+    if os.environ.get('VERCEL'):
+        return []  # Cannot write on read-only filesystem
+    with ThreadPoolExecutor(max_workers=min(8, len(entries) or 1)) as pool:
+        # Each task runs in a copy of this request's context so its storage calls are traced
+        futures = [
+            pool.submit(contextvars.copy_context().run, _store_gallery_files, gallery_id, *entry)
+            for entry in entries
+        ]
+        stored, failure = [], None
+        for future in futures:
+            try:
+                stored.append(future.result())
+            except Exception as exc:
+                failure = failure or exc
+    if failure is not None:
+        # All-or-nothing: drop what the other entries already stored
+        media.delete([key for _, item_keys in stored for key in item_keys])
+        raise failure
+    new_items = [item for item, _ in stored]
+    keys = [key for _, item_keys in stored for key in item_keys]
+    _commit_gallery_items(gallery_id, new_items, keys)
+    return new_items
+
+
+def _delete_gallery_items(gallery_id: str, item_ids) -> list:
+    """Remove several items in one metadata write; returns the ids actually removed."""
+    if os.environ.get('VERCEL'):
+        return []  # Cannot write on read-only filesystem
+    prefix = _gallery_media_prefix(gallery_id)
+    wanted = {str(item_id) for item_id in item_ids}
+
+    def _remove(meta):
+        items = meta.get("items") or []
+        remaining = []
+        removed = []
+        deleted_keys = []
+        for item in items:
+            if str(item.get("id")) in wanted:
+                removed.append(str(item.get("id")))
+                if item.get("src"):
+                    deleted_keys.append(prefix + Path(item["src"]).name)
+                if item.get("thumb"):
+                    deleted_keys.append(prefix + Path(item["thumb"]).name)
+                continue
+            remaining.append(item)
+        if not removed:
+            return None, ([], [])
+        meta["items"] = remaining
+        return meta, (removed, deleted_keys)
+
+    removed, deleted_keys = _update_gallery_meta(gallery_id, _remove)
+    media.delete(deleted_keys)
+    return removed
+
+
+def _delete_gallery_item(gallery_id: str, item_id: str) -> bool:
+    """Remove an item and its files; returns whether anything was removed."""
+    return bool(_delete_gallery_items(gallery_id, [item_id]))
+
+
+def _reorder_gallery_items(gallery_id: str, ordered_ids):
+    """
+    Put ``ordered_ids`` first, in that order, followed by the remaining items
+    in their current order. Stored as a descending ``position`` on each item.
+    """
+    if os.environ.get('VERCEL'):
+        return None  # Cannot write on read-only filesystem
+
+    def _apply(meta):
+        items = meta.get("items") or []
+        by_id = {str(item.get("id")): item for item in items}
+        unknown = [item_id for item_id in ordered_ids if item_id not in by_id]
+        if unknown:
+            return None, unknown
+        listed = [by_id[item_id] for item_id in dict.fromkeys(ordered_ids)]
+        listed_ids = {id(item) for item in listed}
+        rest = [item for item in sorted(items, key=_gallery_sort_key, reverse=True) if id(item) not in listed_ids]
+        ordered = listed + rest
+        for rank, item in enumerate(ordered):
+            item["position"] = len(ordered) - rank
+        meta["items"] = items
+        return meta, []
+
+    return _update_gallery_meta(gallery_id, _apply)
 
 
 def _load_works_items():
@@ -826,12 +1398,155 @@ def _load_infinite_images():
     return items
 
 
+GALLERY_ITEM_FIELDS = ("id", "title", "src", "thumb", "createdAt", "tags", "meta")
+GALLERY_PAGE_MAX = 200
+GALLERY_BATCH_MAX = 20
+
+
+def _encode_cursor(key) -> str:
+    raw = json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        return None
+    return key if isinstance(key, list) else None
+
+
+def _decode_gallery_cursor(cursor: str):
+    key = _decode_cursor(cursor)
+    try:
+        position, created_at, item_id = key
+        return (int(position), str(created_at), str(item_id))
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_list_query(params, allowed_fields, decode_cursor, page_max):
+    """Validate page_size / cursor / fields query params; returns (options, errors)."""
+    errors = {}
+    page_size = None
+    raw_size = params.get("page_size", "").strip()
+    if raw_size:
+        if raw_size.isdigit() and int(raw_size) > 0:
+            page_size = min(int(raw_size), page_max)
+        else:
+            errors["page_size"] = "page_size must be a positive integer."
+
+    cursor = None
+    raw_cursor = params.get("cursor", "").strip()
+    if raw_cursor:
+        cursor = decode_cursor(raw_cursor)
+        if cursor is None:
+            errors["cursor"] = "Invalid cursor."
+
+    fields = None
+    raw_fields = params.get("fields", "").strip()
+    if raw_fields:
+        fields = [f.strip() for f in raw_fields.split(",") if f.strip()]
+        unknown = [f for f in fields if f not in allowed_fields]
+        if unknown:
+            errors["fields"] = f"Unknown fields: {', '.join(unknown)}."
+        elif "id" not in fields:
+            fields.insert(0, "id")
+
+    return {"page_size": page_size, "cursor": cursor, "fields": fields}, errors
+
+
+def _parse_gallery_query(params):
+    return _parse_list_query(params, GALLERY_ITEM_FIELDS, _decode_gallery_cursor, GALLERY_PAGE_MAX)
+
+
+def _with_image_meta(items):
+    """Gallery items plus ``meta`` (size, colour, placeholder) of their full image."""
+    return [dict(item, meta=imagemeta.public(imagemeta.get(imagemeta.key_for(item.get("src"))))) for item in items]
+
+
+def _gallery_page(gallery_id: str, page_size=None, cursor=None, fields=None):
+    """One page of a gallery in display order, using a keyset cursor on the sort key."""
+    etag, items, keys = _gallery_snapshot(gallery_id)
+    if cursor is not None:
+        # keys are oldest-first; everything before the cursor is older than it
+        end = bisect.bisect_left(keys, cursor)
+        start = len(items) - end
+    else:
+        start = 0
+    page = items[start:start + page_size] if page_size else items[start:]
+    next_cursor = None
+    if page and start + len(page) < len(items):
+        next_cursor = _encode_cursor(_gallery_sort_key(page[-1]))
+    if not fields or "meta" in fields:
+        page = _with_image_meta(page)
+        etag = f'{etag[:-1]}-m{imagemeta.version()}"'
+    if fields:
+        page = [{f: item.get(f) for f in fields} for item in page]
+    return etag, {
+        "items": page,
+        "limit": WORKS_MAX_ITEMS,
+        "total": len(items),
+        "next_cursor": next_cursor,
+    }
+
+
+@compress_response
+@require_http_methods(["GET"])
+def api_gallery_items_batch(request):
+    """
+    Fetch the first page of several galleries in one round trip:
+    ``/api/galleries/batch/?ids=a,b,c&page_size=12&fields=id,thumb``.
+    """
+    ids = []
+    for raw in request.GET.get("ids", "").split(","):
+        slug = _slugify(raw) if raw.strip() else ""
+        if slug and slug not in ids:
+            ids.append(slug)
+    if not ids:
+        return JsonResponse({"errors": {"ids": "At least one gallery id is required."}}, status=400)
+    if len(ids) > GALLERY_BATCH_MAX:
+        return JsonResponse({"errors": {"ids": f"At most {GALLERY_BATCH_MAX} galleries per request."}}, status=400)
+
+    options, errors = _parse_gallery_query(request.GET)
+    if errors:
+        return JsonResponse({"errors": errors}, status=400)
+
+    galleries = {}
+    etags = []
+    surrogate.tag(request, *(surrogate.gallery_key(gallery_id) for gallery_id in ids))
+    for gallery_id in ids:
+        etag, payload = _gallery_page(gallery_id, **options)
+        galleries[gallery_id] = payload
+        etags.append(etag.strip('"'))
+    etag = '"batch-' + hashlib.md5("|".join(etags).encode("utf-8")).hexdigest()[:16] + '"'
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    response = JsonResponse({"galleries": galleries}, status=200)
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+@compress_response
 @require_http_methods(["GET", "POST"])
 def api_gallery_items(request, gallery_id):
     gallery_id = _slugify(gallery_id)
     if request.method == "GET":
-        items = _load_gallery_items(gallery_id)
-        return JsonResponse({"items": items, "limit": WORKS_MAX_ITEMS}, status=200)
+        options, errors = _parse_gallery_query(request.GET)
+        if errors:
+            return JsonResponse({"errors": errors}, status=400)
+        etag, payload = _gallery_page(gallery_id, **options)
+        surrogate.tag(request, surrogate.gallery_key(gallery_id))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        response = JsonResponse(payload, status=200)
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return response
 
     # POST
     # POC: All users have admin access
@@ -839,8 +1554,8 @@ def api_gallery_items(request, gallery_id):
         return JsonResponse({"error": f"Limit reached ({WORKS_MAX_ITEMS} photos). Remove one to add another."}, status=409)
 
     title = request.POST.get("title", "").strip()
-    image_file = request.FILES.get("image")
-    thumb_file = request.FILES.get("thumbnail")
+    image_file = uploads.files_from_request(request, "image")
+    thumb_file = uploads.files_from_request(request, "thumbnail")
 
     errors = {}
     if not title:
@@ -857,11 +1572,18 @@ def api_gallery_items(request, gallery_id):
         errors["image"] = "Full image must be an image file."
     if thumb_file and not _valid(thumb_file):
         errors["thumbnail"] = "Thumbnail must be an image file."
+    errors.update(_upload_rejections(request))
 
     if errors:
         return JsonResponse({"errors": errors}, status=400)
 
-    item = _save_gallery_item(gallery_id, title, image_file, thumb_file)
+    try:
+        item = _save_gallery_item(gallery_id, title, image_file, thumb_file)
+    except GalleryLimitReached as exc:
+        return JsonResponse({"error": str(exc)}, status=409)
+    except ValueError as exc:  # A claimed upload from another gallery
+        return JsonResponse({"errors": {"image": str(exc)}}, status=400)
+    uploads.release([image_file, thumb_file])
     return JsonResponse({"item": item, "limit": WORKS_MAX_ITEMS}, status=201)
 
 
@@ -872,6 +1594,638 @@ def api_gallery_item_detail(request, gallery_id, item_id):
     return JsonResponse({"success": True})
 
 
+def _json_body(request):
+    try:
+        data = json.loads(request.body.decode("utf-8") or "{}")
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+@require_http_methods(["POST", "DELETE"])
+def api_gallery_items_bulk(request, gallery_id):
+    """
+    POST: multipart with repeated ``title``/``image``/``thumbnail`` fields,
+    paired by position, added in a single metadata write.
+    DELETE: JSON ``{"ids": [...]}`` removed in a single metadata write.
+    """
+    # POC: All users have admin access
+    gallery_id = _slugify(gallery_id)
+    if request.method == "DELETE":
+        body = _json_body(request)
+        ids = body.get("ids") if body else None
+        if not isinstance(ids, list) or not ids:
+            return JsonResponse({"errors": {"ids": "A non-empty list of item ids is required."}}, status=400)
+        ids = [str(item_id) for item_id in ids]
+        removed = set(_delete_gallery_items(gallery_id, ids))
+        results = [{"id": item_id, "deleted": item_id in removed} for item_id in ids]
+        return JsonResponse({"results": results, "limit": WORKS_MAX_ITEMS}, status=200)
+
+    titles = [t.strip() for t in request.POST.getlist("title")]
+    images = uploads.files_from_request(request, "image", many=True)
+    thumbs = uploads.files_from_request(request, "thumbnail", many=True)
+    if _upload_rejections(request):
+        return JsonResponse({"errors": _upload_rejections(request)}, status=400)
+    if not titles:
+        return JsonResponse({"errors": {"title": "At least one item is required."}}, status=400)
+    if not (len(titles) == len(images) == len(thumbs)):
+        return JsonResponse({"errors": {"items": "Each item needs a title, image and thumbnail."}}, status=400)
+
+    def _valid(file_obj):
+        return file_obj and Path(file_obj.name).suffix.lower() in IMAGE_EXTS
+
+    item_errors = {}
+    for index, (title, image_file, thumb_file) in enumerate(zip(titles, images, thumbs)):
+        errors = {}
+        if not title:
+            errors["title"] = "Title is required."
+        if not _valid(image_file):
+            errors["image"] = "Full image must be an image file."
+        if not _valid(thumb_file):
+            errors["thumbnail"] = "Thumbnail must be an image file."
+        if errors:
+            item_errors[str(index)] = errors
+    if item_errors:
+        return JsonResponse({"errors": item_errors}, status=400)
+
+    if _gallery_item_count(gallery_id) + len(titles) > WORKS_MAX_ITEMS:
+        return JsonResponse({"error": f"Limit reached ({WORKS_MAX_ITEMS} photos). Remove some to add more."}, status=409)
+    try:
+        items = _save_gallery_items(gallery_id, list(zip(titles, images, thumbs)))
+    except GalleryLimitReached as exc:
+        return JsonResponse({"error": str(exc)}, status=409)
+    except ValueError as exc:  # A claimed upload from another gallery
+        return JsonResponse({"errors": {"items": str(exc)}}, status=400)
+    uploads.release(images + thumbs)
+    return JsonResponse({"items": items, "limit": WORKS_MAX_ITEMS}, status=201)
+
+
+@require_http_methods(["POST"])
+def api_gallery_items_reorder(request, gallery_id):
+    """JSON ``{"ids": [...]}``: listed items first in that order, the rest after."""
+    # POC: All users have admin access
+    gallery_id = _slugify(gallery_id)
+    body = _json_body(request)
+    ids = body.get("ids") if body else None
+    if not isinstance(ids, list) or not ids:
+        return JsonResponse({"errors": {"ids": "A non-empty list of item ids is required."}}, status=400)
+    unknown = _reorder_gallery_items(gallery_id, [str(item_id) for item_id in ids])
+    if unknown:
+        return JsonResponse({"errors": {"ids": f"Unknown items: {', '.join(unknown)}."}}, status=400)
+    return JsonResponse({"items": _load_gallery_items(gallery_id), "limit": WORKS_MAX_ITEMS}, status=200)
+
+
+def _upload_error_response(exc):
+    payload = {"error": str(exc)}
+    if exc.offset is not None:
+        payload["offset"] = exc.offset
+    response = JsonResponse(payload, status=exc.status)
+    if exc.offset is not None:
+        response["Upload-Offset"] = str(exc.offset)
+    return response
+
+
+@require_http_methods(["POST"])
+def api_upload_initiate(request):
+    """Start a resumable upload: JSON ``{"filename", "size", "sha256"}``."""
+    if os.environ.get('VERCEL'):
+        return JsonResponse({"error": "Uploads are disabled on Vercel (read-only deployment)."}, status=403)
+    body = _json_body(request) or {}
+    try:
+        state = uploads.initiate(body.get("filename"), body.get("size"), body.get("sha256", ""))
+    except uploads.UploadError as exc:
+        return _upload_error_response(exc)
+    return JsonResponse(state, status=201)
+
+
+@require_http_methods(["GET", "PUT", "DELETE"])
+def api_upload_part(request, upload_id):
+    """
+    GET: current offset, used to resume after a dropped connection.
+    PUT: raw bytes for the part starting at the ``Upload-Offset`` header.
+    DELETE: abandon the upload.
+    """
+    try:
+        if request.method == "DELETE":
+            uploads.discard(upload_id)
+            return JsonResponse({"success": True})
+        if request.method == "PUT":
+            offset = uploads.write_part(
+                upload_id,
+                request.headers.get("Upload-Offset"),
+                request,
+                request.headers.get("Content-Length"),
+            )
+            response = JsonResponse({"upload_id": upload_id, "offset": offset})
+            response["Upload-Offset"] = str(offset)
+            return response
+        state = uploads.status(upload_id)
+    except uploads.UploadError as exc:
+        return _upload_error_response(exc)
+    response = JsonResponse(state)
+    response["Upload-Offset"] = str(state["offset"])
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+@require_http_methods(["POST"])
+def api_upload_complete(request, upload_id):
+    """Verify size and checksum; the upload id can then replace a file field."""
+    try:
+        state = uploads.complete(upload_id)
+    except uploads.UploadError as exc:
+        return _upload_error_response(exc)
+    return JsonResponse(state)
+
+
+MEDIA_PURPOSES = ("project", "gallery", "cover")
+
+
+def _presign_key(purpose: str, body: dict, ext: str):
+    """Storage key for a direct upload; keys are never reused so objects can be cached forever."""
+    timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    token = uuid.uuid4().hex
+    if purpose == "project":
+        return f"{PROJECT_IMAGE_PREFIX}{timestamp}_{token[:8]}{ext}"
+    if purpose == "cover":
+        return f"covers/direct-{timestamp}-{token[:8]}{ext}"
+    variant = "thumb" if body.get("variant") == "thumb" else "full"
+    slug = _slugify(Path(str(body.get("filename", ""))).stem) or "work"
+    return f"{_gallery_media_prefix(body.get('gallery_id') or 'default')}{timestamp}-{slug}-{token[:6]}-{variant}{ext}"
+
+
+@require_http_methods(["POST"])
+def api_media_presign(request):
+    """
+    Direct upload instructions: JSON ``{"purpose": "project|gallery|cover",
+    "filename", "content_type", "size"}`` (plus ``gallery_id`` and ``variant``
+    for gallery items). Post the returned ``claim`` back as ``<field>_key``.
+    Only object storage takes direct uploads: with local media this answers
+    409 and files go through the chunked upload API (``api_upload_initiate``).
+    """
+    if media.get_storage().is_local:
+        return JsonResponse({
+            "error": "Media is stored on this site; use the chunked upload API.",
+            "uploads": reverse("api_upload_initiate"),
+        }, status=409)
+    body = _json_body(request)
+    if body is None:
+        return JsonResponse({"errors": {"body": "Expected a JSON object."}}, status=400)
+    purpose = body.get("purpose")
+    ext = Path(str(body.get("filename", ""))).suffix.lower()
+    content_type = str(body.get("content_type", ""))
+    size = body.get("size")
+    field = "cover" if purpose == "cover" else ("thumbnail" if body.get("variant") == "thumb" else "image")
+    max_bytes = settings.UPLOAD_FIELD_MAX_BYTES.get(field, settings.UPLOAD_FILE_MAX_BYTES)
+
+    errors = {}
+    if purpose not in MEDIA_PURPOSES:
+        errors["purpose"] = f"Purpose must be one of: {', '.join(MEDIA_PURPOSES)}."
+    if ext not in IMAGE_EXTS:
+        errors["filename"] = "Only image files are allowed."
+    if not content_type.startswith("image/"):
+        errors["content_type"] = "Content type must be an image type."
+    if not isinstance(size, int) or size <= 0:
+        errors["size"] = "Size must be a positive integer."
+    elif size > max_bytes:
+        errors["size"] = f"File is larger than {max_bytes // (1024 * 1024)} MB."
+    if errors:
+        return JsonResponse({"errors": errors}, status=400)
+    return JsonResponse(media.presign(_presign_key(purpose, body, ext), content_type, max_bytes), status=201)
+
+
+# Entries kept per service worker cache (least recently used go first)
+SERVICE_WORKER_LIMITS = {"pages": 50, "assets": 60, "images": 200}
+
+# Replaces an installed worker once SERVICE_WORKER is turned off
+_SERVICE_WORKER_OFF = """self.addEventListener('install', () => self.skipWaiting());
+self.addEventListener('activate', (event) => event.waitUntil((async () => {
+  for (const name of await caches.keys()) if (name.startsWith('rb-')) await caches.delete(name);
+  await self.registration.unregister();
+})()));
+"""
+
+
+def _service_worker_config():
+    """What static/js/sw.js needs from the server; ``version`` follows the asset build."""
+    precache = []
+    for name in assets.BUNDLES:
+        if assets.use_bundles(name):
+            precache += assets.stylesheet_urls(name) + assets.script_urls(name)
+    return {
+        "precache": list(dict.fromkeys(precache)),
+        "pages": [reverse(name) for name in ("home", "works", "articles", "about", "contact")],
+        "articlePrefix": reverse("articles"),
+        "exclude": [reverse(name) for name in ("add_article", "manage_articles", "export_content_backup")],
+        "staticUrl": settings.STATIC_URL,
+        "imagePrefixes": [f"{settings.STATIC_URL}images/", f"{settings.MEDIA_URL}covers/"],
+        "limits": SERVICE_WORKER_LIMITS,
+    }
+
+
+@require_http_methods(["GET", "HEAD"])
+def service_worker(request):
+    """static/js/sw.js with its config, at the site root so it can control every page."""
+    if settings.SERVICE_WORKER:
+        source = (Path(settings.BASE_DIR) / "static" / "js" / "sw.js").read_text(encoding="utf-8")
+        config = _service_worker_config()
+        # Hashed bundle names change with each build, and so does the worker
+        config["version"] = hashlib.sha256(
+            (json.dumps(config, sort_keys=True) + source).encode("utf-8")
+        ).hexdigest()[:12]
+        script = f"const CONFIG = {json.dumps(config)};\n{source}"
+    else:
+        script = _SERVICE_WORKER_OFF
+    etag = f'"{hashlib.sha256(script.encode("utf-8")).hexdigest()[:16]}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(script, content_type="text/javascript; charset=utf-8")
+        response["ETag"] = etag
+    # Browsers check for a new worker on navigation; never let a cache answer for it
+    response["Cache-Control"] = "no-cache"
+    response["Service-Worker-Allowed"] = "/"
+    return response
+
+
+@require_http_methods(["GET", "HEAD"])
+def serve_media(request, path, prefix):
+    """Uploaded covers and images that WhiteNoise's startup file list does not know about."""
+    return mediaserve.serve(request, prefix + path)
+
+
+@require_http_methods(["GET"])
+def api_admission_status(request):
+    """Running, queued, admitted and shed counts per expensive request class."""
+    # POC: All users have admin access
+    response = JsonResponse({"classes": admission.get_governor().report()})
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+@require_http_methods(["GET"])
+@ensure_csrf_cookie
+def api_csrf(request):
+    """CSRF token for forms on edge-cached pages, which are rendered without one (static/js/csrf-fill.js)."""
+    response = JsonResponse({"token": get_token(request)})
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+ARTICLE_FIELDS = (
+    "id", "title", "subtitle", "slug", "tags", "created_at", "updated_at", "cover",
+    "cover_width", "cover_height", "excerpt", "word_count", "reading_minutes",
+    "body_html", "body_compiled",
+)
+ARTICLE_BODY_FIELDS = ("body_html", "body_compiled")
+# Lists never ship bodies unless asked for explicitly
+ARTICLE_LIST_FIELDS = tuple(f for f in ARTICLE_FIELDS if f not in ARTICLE_BODY_FIELDS)
+ARTICLE_PAGE_DEFAULT = 20
+ARTICLE_PAGE_MAX = 100
+
+
+def _article_sort_key(article):
+    return (str(article.get("created_at", "")), str(article.get("id", "")))
+
+
+def _decode_created_cursor(cursor: str):
+    key = _decode_cursor(cursor)
+    if not key or len(key) != 2:
+        return None
+    return (str(key[0]), str(key[1]))
+
+
+def _project_article(article, fields):
+    return {f: article.get(f) for f in fields}
+
+
+def _conditional_json(request, payload, etag):
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    response = JsonResponse(payload, status=200)
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+@compress_response
+@require_http_methods(["GET"])
+def api_articles(request):
+    """
+    ``/api/articles/?page_size=&cursor=&fields=&tag=&q=`` — newest first,
+    keyset-paginated on (created_at, id).
+    """
+    options, errors = _parse_list_query(request.GET, ARTICLE_FIELDS, _decode_created_cursor, ARTICLE_PAGE_MAX)
+    if errors:
+        return JsonResponse({"errors": errors}, status=400)
+
+    store_etag, records = _article_records()
+    tag = request.GET.get("tag", "").strip()
+    query = request.GET.get("q", "").strip()
+    items = _filter_articles(records, tag, query)
+    surrogate.tag(request, surrogate.ARTICLES, surrogate.tag_key(tag) if tag else None)
+
+    cursor = options["cursor"]
+    if cursor is not None:
+        items = [a for a in items if _article_sort_key(a) < cursor]
+    page_size = options["page_size"] or ARTICLE_PAGE_DEFAULT
+    page = items[:page_size]
+    next_cursor = _encode_cursor(_article_sort_key(page[-1])) if len(items) > page_size else None
+
+    fields = options["fields"] or ARTICLE_LIST_FIELDS
+    payload = {
+        "items": [_project_article(a, fields) for a in page],
+        "next_cursor": next_cursor,
+    }
+    etag = '"' + hashlib.md5(f"{store_etag}|{request.GET.urlencode()}".encode("utf-8")).hexdigest()[:20] + '"'
+    return _conditional_json(request, payload, etag)
+
+
+@compress_response
+@require_http_methods(["GET"])
+def api_article_detail(request, article_id):
+    options, errors = _parse_list_query(request.GET, ARTICLE_FIELDS, _decode_created_cursor, ARTICLE_PAGE_MAX)
+    if errors:
+        return JsonResponse({"errors": errors}, status=400)
+    path = _article_path(article_id)
+    try:
+        st = path.stat()
+    except OSError:
+        return JsonResponse({"error": "Article not found."}, status=404)
+    article = _load_article(article_id)
+    surrogate.tag(request, surrogate.article_key(article.get("id") or article_id))
+    fields = options["fields"] or ARTICLE_FIELDS
+    variant = hashlib.md5(",".join(fields).encode("utf-8")).hexdigest()[:8]
+    etag = f'"article-{st.st_mtime_ns}-{st.st_size}-{variant}"'
+    return _conditional_json(request, {"item": _project_article(article, fields)}, etag)
+
+
+@compress_response
+@require_http_methods(["GET"])
+def api_projects(request):
+    """
+    ``/api/projects/?page_size=&cursor=&category=&q=&fields=`` — newest first.
+    ``format=html`` returns the rendered project sections instead of items.
+    """
+    options, errors = _parse_list_query(request.GET, PROJECT_FIELDS, _decode_created_cursor, PROJECT_PAGE_MAX)
+    if errors:
+        return JsonResponse({"errors": errors}, status=400)
+    page, next_cursor = _projects_page(
+        options["page_size"] or WORKS_PAGE_SIZE,
+        options["cursor"],
+        request.GET.get("category", "").strip(),
+        request.GET.get("q", "").strip(),
+    )
+    surrogate.tag(request, surrogate.WORKS, *(surrogate.project_key(p.get("id")) for p in page))
+    if request.GET.get("format") == "html":
+        html = render_to_string("partials/project_sections.html", {
+            "projects": [_project_card(p) for p in page],
+            "is_admin": True,  # POC: Always admin mode
+        }, request=request)
+        return JsonResponse({"html": html, "next_cursor": next_cursor})
+
+    fields = options["fields"] or PROJECT_FIELDS
+    items = [_project_item(project, fields) for project in page]
+    return JsonResponse({"items": items, "next_cursor": next_cursor})
+
+
+def _project_item(project, fields):
+    item = {f: project.get(f) for f in fields}
+    if "images" in item:
+        item["images"] = [
+            {"src": _project_image_url(image["name"]), "thumb": _project_image_url(image["thumb"])}
+            for image in _project_card(project)["image_set"]
+        ]
+    return item
+
+
+# Facet indexes over works: "projects" and "gallery:<id>", resynced when their store changes
+_FACET_INDEXES = {}
+
+
+def _facet_index(name, signature, load_documents):
+    index = _FACET_INDEXES.get(name)
+    if index is None:
+        index = _FACET_INDEXES.setdefault(name, facets.FacetIndex())
+    if index.signature != signature or signature is None:
+        index.sync(load_documents())
+        index.signature = signature
+    return index
+
+
+def _projects_facet_index():
+    return _facet_index("projects", _projects_signature(), lambda: {
+        p["id"]: (facets.facets_from(p.get("tags"), p.get("category")), p.get("title") or "", _project_sort_key(p), p)
+        for p in _load_projects() if p.get("id")
+    })
+
+
+def _gallery_facet_index(gallery_id):
+    if not _gallery_meta_path(gallery_id).exists():
+        # No gallery.json: an empty index, not kept, so unknown slugs cannot pile up entries
+        _FACET_INDEXES.pop(f"gallery:{gallery_id}", None)
+        return facets.FacetIndex()
+    etag, items, _ = _gallery_snapshot(gallery_id)
+    return _facet_index(f"gallery:{gallery_id}", etag, lambda: {
+        item["id"]: (facets.facets_from(item.get("tags")), item.get("title") or "", _gallery_sort_key(item), item)
+        for item in items if item.get("id")
+    })
+
+
+def _parse_facet_selection(params):
+    """``{field: [values]}`` from ``?genre=Mech&genre=Misc`` or ``?genre=Mech,Misc``; ``all`` selects nothing."""
+    selected = {}
+    for field in facets.FIELDS:
+        values = [v.strip() for raw in params.getlist(field) for v in raw.split(",") if v.strip()]
+        values = [v for v in values if v.lower() != "all"]
+        if values:
+            selected[field] = list(dict.fromkeys(values))
+    return selected
+
+
+def _facet_etag(signature, request):
+    query = request.GET.urlencode()
+    return '"facets-' + hashlib.md5(f"{signature}|{query}".encode("utf-8")).hexdigest()[:16] + '"'
+
+
+@compress_response
+@require_http_methods(["GET"])
+def api_projects_filter(request):
+    """
+    ``/api/projects/filter/?category=&genre=&quality=&tag=&q=&page_size=&cursor=&fields=``:
+    the matching projects, newest first, and the facet counts for the selection.
+    ``format=html`` renders the project sections like ``api_projects``.
+    """
+    options, errors = _parse_list_query(request.GET, PROJECT_FIELDS, _decode_created_cursor, PROJECT_PAGE_MAX)
+    if errors:
+        return JsonResponse({"errors": errors}, status=400)
+    index = _projects_facet_index()
+    selected = _parse_facet_selection(request.GET)
+    result = index.query(
+        selected, request.GET.get("q", "").strip(),
+        limit=options["page_size"] or WORKS_PAGE_SIZE, after=options["cursor"],
+    )
+    surrogate.tag(request, surrogate.WORKS, *(surrogate.project_key(p.get("id")) for p in result.items))
+    payload = {
+        "total": result.total,
+        "counts": result.counts,
+        "selected": selected,
+        "next_cursor": _encode_cursor(result.next_key) if result.next_key else None,
+    }
+    if request.GET.get("format") == "html":
+        payload["html"] = render_to_string("partials/project_sections.html", {
+            "projects": [_project_card(p) for p in result.items],
+            "is_admin": True,  # POC: Always admin mode
+        }, request=request)
+    else:
+        fields = options["fields"] or PROJECT_FIELDS
+        payload["items"] = [_project_item(project, fields) for project in result.items]
+    return _conditional_json(request, payload, _facet_etag(index.signature, request))
+
+
+@compress_response
+@require_http_methods(["GET"])
+def api_gallery_items_filter(request, gallery_id):
+    """``/api/galleries/<id>/items/filter/?genre=&quality=&tag=&q=&page_size=&cursor=&fields=``."""
+    gallery_id = _slugify(gallery_id)
+    options, errors = _parse_gallery_query(request.GET)
+    if errors:
+        return JsonResponse({"errors": errors}, status=400)
+    index = _gallery_facet_index(gallery_id)
+    selected = _parse_facet_selection(request.GET)
+    result = index.query(
+        selected, request.GET.get("q", "").strip(),
+        limit=options["page_size"], after=options["cursor"],
+    )
+    surrogate.tag(request, surrogate.gallery_key(gallery_id))
+    items = result.items
+    if not options["fields"] or "meta" in options["fields"]:
+        items = _with_image_meta(items)
+    if options["fields"]:
+        items = [{f: item.get(f) for f in options["fields"]} for item in items]
+    return _conditional_json(request, {
+        "items": items,
+        "total": result.total,
+        "counts": result.counts,
+        "selected": selected,
+        "next_cursor": _encode_cursor(result.next_key) if result.next_key else None,
+    }, _facet_etag((index.signature, imagemeta.version()), request))
+
+
+@require_http_methods(["POST"])
+def api_articles_bulk(request):
+    """
+    JSON ``{"action": "retag|delete|cover|republish", "ids": [...], ...}`` with
+    ``tags``/``mode`` (retag), ``cover`` (URL or null) or ``date`` (republish).
+    Multipart with a ``cover`` file is also accepted for the cover action.
+    """
+    # POC: All users have admin access
+    if request.content_type == "multipart/form-data":
+        body = {
+            "action": request.POST.get("action", ""),
+            "ids": request.POST.getlist("ids"),
+            "cover_file": uploads.files_from_request(request, "cover"),
+        }
+    else:
+        body = _json_body(request)
+        if body is None:
+            return JsonResponse({"errors": {"body": "Expected a JSON object."}}, status=400)
+        body.pop("cover_file", None)  # Uploaded covers only come from multipart requests
+    action, ids = body.get("action"), body.get("ids")
+    errors = _validate_bulk_articles(action, ids, body)
+    if request.content_type == "multipart/form-data" and _upload_rejections(request).get("cover"):
+        errors["cover"] = _upload_rejections(request)["cover"]
+    if errors:
+        return JsonResponse({"errors": errors}, status=400)
+    if os.environ.get('VERCEL'):
+        return JsonResponse({"errors": {"general": "Read-only deployment."}}, status=403)
+    results = _bulk_article_action(action, ids, body)
+    return JsonResponse({"results": results, "summary": _bulk_article_summary(results)})
+
+
+SUGGEST_LIMIT_DEFAULT = 8
+SUGGEST_LIMIT_MAX = 20
+# Other workers' saves are picked up by comparing store signatures this often
+SUGGEST_RECHECK_SECONDS = 2.0
+
+_SUGGEST_INDEX = search.PrefixIndex(kind_order=("tag", "article", "project"))
+_SUGGEST_STATE = {"ready": False, "checked": 0.0, "articles": None, "projects": None}
+
+
+def _article_suggestion(article):
+    return article.get("title") or article["id"], reverse("article_detail", args=[article["id"]])
+
+
+def _project_suggestion(project):
+    # The works page only renders its first page, so search for the project and then jump to it
+    title = project.get("title") or project["id"]
+    return title, f"{reverse('works')}?{urlencode({'q': title})}#{project['id']}"
+
+
+def _index_article(record):
+    if _SUGGEST_STATE["ready"]:
+        _SUGGEST_INDEX.upsert("article", record["id"], *_article_suggestion(record))
+
+
+def _index_article_changes(saved, removed_ids):
+    if _SUGGEST_STATE["ready"]:
+        for article_id in removed_ids:
+            _SUGGEST_INDEX.remove("article", article_id)
+        for record in saved:
+            _SUGGEST_INDEX.upsert("article", record["id"], *_article_suggestion(record))
+
+
+def _index_projects(projects):
+    if _SUGGEST_STATE["ready"]:
+        _SUGGEST_INDEX.sync("project", {p["id"]: _project_suggestion(p) for p in projects if p.get("id")})
+
+
+def _projects_signature():
+    try:
+        st = _projects_file().stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _suggest_index():
+    """The worker's suggestion index, built on first use and resynced when the stores change."""
+    now = time.monotonic()
+    state = _SUGGEST_STATE
+    if state["ready"] and now - state["checked"] < SUGGEST_RECHECK_SECONDS:
+        return _SUGGEST_INDEX
+    state["checked"] = now
+    if not state["ready"]:
+        for tag in TAG_CHOICES:
+            _SUGGEST_INDEX.upsert("tag", tag, tag, f"{reverse('articles')}?tag={quote(tag)}")
+        state["ready"] = True  # From here on saves in this worker update the index directly
+
+    articles_etag, records = _article_records()
+    if articles_etag != state["articles"]:
+        _SUGGEST_INDEX.sync("article", {a["id"]: _article_suggestion(a) for a in records})
+        state["articles"] = articles_etag
+
+    projects_signature = _projects_signature()
+    if projects_signature != state["projects"]:
+        _index_projects(_load_projects())
+        state["projects"] = projects_signature
+    return _SUGGEST_INDEX
+
+
+@require_http_methods(["GET"])
+def api_search_suggest(request):
+    """``/api/search/suggest/?q=&limit=`` — prefix matches over articles, tags and projects."""
+    query = request.GET.get("q", "").strip()
+    raw_limit = request.GET.get("limit", "").strip()
+    if raw_limit and not raw_limit.isdigit():
+        return JsonResponse({"errors": {"limit": "limit must be a positive integer."}}, status=400)
+    limit = min(int(raw_limit or SUGGEST_LIMIT_DEFAULT), SUGGEST_LIMIT_MAX) or SUGGEST_LIMIT_DEFAULT
+    suggestions = _suggest_index().suggest(query, limit) if query else []
+    response = JsonResponse({"query": query, "suggestions": suggestions})
+    response["Cache-Control"] = f"max-age={int(SUGGEST_RECHECK_SECONDS)}"
+    return response
+
+
 # Project management views
 def add_project(request):
     """Add a new project"""
@@ -882,7 +2236,7 @@ def add_project(request):
         title = request.POST.get('title', '').strip()
         description = request.POST.get('description', '').strip()
         category = request.POST.get('category', '').strip()
-        uploaded_images = request.FILES.getlist('images')
+        uploaded_images = uploads.files_from_request(request, 'images', many=True)
         
         errors = {}
         if not title:
@@ -897,6 +2251,8 @@ def add_project(request):
             if Path(img.name).suffix.lower() not in IMAGE_EXTS:
                 errors['images'] = f'Invalid file type: {img.name}. Only image files are allowed.'
                 break
+        if _upload_rejections(request).get('images'):
+            errors['images'] = _upload_rejections(request)['images']
         
         if not errors:
             projects = _load_projects()
@@ -908,6 +2264,7 @@ def add_project(request):
             else:
                 # Save uploaded images
                 saved_filenames = []
+                warnings = _duplicate_warnings(uploaded_images)
                 try:
                     for img_file in uploaded_images:
                         filename = _save_project_image(img_file)
@@ -921,10 +2278,21 @@ def add_project(request):
                         "images": saved_filenames,
                         "created_at": datetime.utcnow().isoformat()
                     }
-                    projects.append(new_project)
-                    _save_projects(projects)
-                    messages.success(request, f'Project added successfully with {len(saved_filenames)} images!')
-                    return redirect('works')
+
+                    def _append(current):
+                        # Re-check under the lock: another worker may have added it meanwhile
+                        if any(p.get('id') == project_id for p in current):
+                            return None, False
+                        current.append(new_project)
+                        return current, True
+
+                    if _update_projects(_append):
+                        uploads.release(uploaded_images)
+                        messages.success(request, f'Project added successfully with {len(saved_filenames)} images!')
+                        for warning in warnings:
+                            messages.warning(request, warning)
+                        return redirect('works')
+                    errors['title'] = 'A project with this title already exists.'
                 except Exception as e:
                     errors['general'] = f'Error saving images: {str(e)}'
         
@@ -946,7 +2314,7 @@ def edit_project(request, project_id):
         title = request.POST.get('title', '').strip()
         description = request.POST.get('description', '').strip()
         category = request.POST.get('category', '').strip()
-        uploaded_images = request.FILES.getlist('new_images')
+        uploaded_images = uploads.files_from_request(request, 'new_images', many=True)
         keep_existing = request.POST.get('keep_existing', 'true') == 'true'
         
         errors = {}
@@ -964,6 +2332,8 @@ def edit_project(request, project_id):
             if Path(img.name).suffix.lower() not in IMAGE_EXTS:
                 errors['images'] = f'Invalid file type: {img.name}. Only image files are allowed.'
                 break
+        if _upload_rejections(request).get('new_images'):
+            errors['images'] = _upload_rejections(request)['new_images']
         
         if not errors:
             # Save new uploaded images
@@ -973,21 +2343,23 @@ def edit_project(request, project_id):
                     filename = _save_project_image(img_file)
                     new_filenames.append(filename)
                 
-                projects = _load_projects()
-                for p in projects:
-                    if p.get('id') == project_id:
-                        p['title'] = title.upper()
-                        p['description'] = description
-                        p['category'] = category
-                        # Keep existing images if checkbox is checked, otherwise replace with new ones
-                        if keep_existing and new_filenames:
-                            p['images'] = p.get('images', []) + new_filenames
-                        elif new_filenames:
-                            p['images'] = new_filenames
-                        # If keeping existing and no new uploads, keep current images
-                        break
-                
-                _save_projects(projects)
+                def _apply(projects):
+                    for p in projects:
+                        if p.get('id') == project_id:
+                            p['title'] = title.upper()
+                            p['description'] = description
+                            p['category'] = category
+                            # Keep existing images if checkbox is checked, otherwise replace with new ones
+                            if keep_existing and new_filenames:
+                                p['images'] = p.get('images', []) + new_filenames
+                            elif new_filenames:
+                                p['images'] = new_filenames
+                            # If keeping existing and no new uploads, keep current images
+                            break
+                    return projects, None
+
+                _update_projects(_apply)
+                uploads.release(uploaded_images)
                 if new_filenames:
                     messages.success(request, f'Project updated with {len(new_filenames)} new images!')
                 else:
@@ -1011,9 +2383,9 @@ def delete_project(request, project_id):
         return redirect('works')
     
     if request.method == 'POST':
-        projects = _load_projects()
-        projects = [p for p in projects if p.get('id') != project_id]
-        _save_projects(projects)
+        _update_projects(
+            lambda projects: ([p for p in projects if p.get('id') != project_id], None)
+        )
         messages.success(request, 'Project deleted successfully!')
     
     return redirect('works')
@@ -0,0 +1,15 @@
+#!/bin/sh
+# Container entrypoint (see Dockerfile). Release steps run here, against the
+# mounted content stores, rather than at image build time.
+set -e
+
+WORKERS="${WEB_CONCURRENCY:-3}"
+
+# Compile stale articles, build thumbnails and the image metadata index
+python manage.py warm_caches --only articles --only thumbnails --only image_meta
+
+# Once gunicorn answers, warm every worker's indexes and pages over HTTP
+python manage.py warm_caches --only indexes --only pages \
+    --base-url http://127.0.0.1:8000 --workers "$WORKERS" --wait 120 &
+
+exec gunicorn --bind 0.0.0.0:8000 --workers "$WORKERS" rijmenbaskara.wsgi:application
@@ -46,4 +46,7 @@
   }
 
   enforceLimit();
+
+  // Uploads (straight to storage, or in resumable chunks) are handled by
+  // direct-upload.js: the form opts in with data-direct-upload.
 })();
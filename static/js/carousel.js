@@ -1,8 +1,15 @@
 // Carousel functionality for project galleries
 document.addEventListener('DOMContentLoaded', function() {
-  const carousels = document.querySelectorAll('.project-carousel');
-  
-  carousels.forEach(carousel => {
+  document.querySelectorAll('.project-carousel').forEach(initCarousel);
+
+  // Project sections appended by projects-loader.js
+  document.addEventListener('projects:added', (e) => {
+    e.detail.root.querySelectorAll('.project-carousel').forEach(initCarousel);
+  });
+
+  function initCarousel(carousel) {
+    if (carousel.dataset.carouselReady) return;
+    carousel.dataset.carouselReady = 'true';
     const slides = carousel.querySelectorAll('.carousel-slide');
     const thumbs = carousel.querySelectorAll('.pagination-thumb');
     const prevBtn = carousel.querySelector('.carousel-prev');
@@ -74,5 +81,5 @@ document.addEventListener('DOMContentLoaded', function() {
         }
       });
     });
-  });
+  }
 });
@@ -0,0 +1,34 @@
+// Forms on cached pages may carry no CSRF token ({% cacheable_csrf_token %}
+// leaves `data-csrf-fill` inputs empty behind the edge cache) or an old one
+// (pages from the service worker's cache). On submit, use the csrftoken
+// cookie, or fetch a token from /api/csrf/ first when there is none.
+(function () {
+  const tokenUrl = '/api/csrf/';
+
+  function cookieToken() {
+    const match = document.cookie.match(/(?:^|;\s*)csrftoken=([^;]+)/);
+    return match ? decodeURIComponent(match[1]) : '';
+  }
+
+  document.addEventListener('submit', async (event) => {
+    const form = event.target;
+    const input = form.querySelector('input[name="csrfmiddlewaretoken"]');
+    if (!input || event.defaultPrevented) return;
+
+    const token = cookieToken();
+    if (token) {
+      input.value = token;
+      return;
+    }
+    event.preventDefault();
+    try {
+      const res = await fetch(tokenUrl, { credentials: 'same-origin', cache: 'no-store' });
+      const data = await res.json();
+      input.value = data.token || cookieToken();
+    } catch (err) {
+      input.value = cookieToken();
+    }
+    // submit() skips the submit event (and inline onsubmit confirmations, already answered)
+    form.submit();
+  });
+})();
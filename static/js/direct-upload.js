@@ -0,0 +1,187 @@
+// Uploads that keep large bodies off Django workers. Forms opt in with
+// `data-direct-upload`; file inputs describe themselves with `data-purpose`
+// (project | gallery | cover) and, for gallery items, `data-gallery` and
+// `data-variant` (full | thumb).
+//
+// - With object storage the site presigns a POST per file, the bytes go
+//   straight to the bucket and the form is submitted with `<field>_key`
+//   claim tokens, so the server only commits metadata.
+// - Otherwise (media stored on this site) files go up as resumable chunks:
+//   initiate -> PUT parts at offset -> complete, and the form is submitted
+//   with `<field>_upload` ids. Upload ids are remembered per file so a retry
+//   after a dropped connection continues from the last acknowledged offset.
+(function () {
+  const presignUrl = '/api/media/uploads/';
+  const uploadsUrl = '/api/uploads/';
+
+  function getCSRFToken(form) {
+    const input = form?.querySelector('input[name="csrfmiddlewaretoken"]');
+    if (input) return input.value;
+    const match = document.cookie.match(/csrftoken=([^;]+)/);
+    return match ? match[1] : '';
+  }
+
+  async function api(form, url, options = {}) {
+    const res = await fetch(url, {
+      ...options,
+      headers: { 'X-CSRFToken': getCSRFToken(form), ...(options.headers || {}) },
+    });
+    const data = await res.json().catch(() => ({}));
+    return { res, data };
+  }
+
+  // A presigned object-store POST for `file`, or null when media is stored
+  // on this site and the file should be sent in chunks instead
+  async function presign(form, input, file) {
+    const { res, data } = await api(form, presignUrl, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        purpose: input.dataset.purpose,
+        gallery_id: input.dataset.gallery || '',
+        variant: input.dataset.variant || 'full',
+        filename: file.name,
+        content_type: file.type || 'application/octet-stream',
+        size: file.size,
+      }),
+    });
+    if (res.status === 409) return null;
+    if (!res.ok) throw new Error(Object.values(data.errors || {}).join(' ') || data.error || 'Presign failed');
+    return data.upload?.method === 'POST' ? data : null;
+  }
+
+  async function sendDirect(upload, file) {
+    // S3 presigned POST: policy fields first, the file last
+    const body = new FormData();
+    Object.entries(upload.fields || {}).forEach(([name, value]) => body.append(name, value));
+    body.append('file', file);
+    const res = await fetch(upload.url, { method: 'POST', body });
+    if (!res.ok) throw new Error(`Upload failed (${res.status})`);
+  }
+
+  function resumeKey(file) {
+    return `chunked-upload:${file.name}:${file.size}:${file.lastModified}`;
+  }
+
+  async function sha256Hex(file) {
+    if (!window.crypto?.subtle) return '';
+    const digest = await crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+    return Array.from(new Uint8Array(digest)).map((b) => b.toString(16).padStart(2, '0')).join('');
+  }
+
+  async function startOrResume(form, file) {
+    const saved = localStorage.getItem(resumeKey(file));
+    if (saved) {
+      const { res, data } = await api(form, `${uploadsUrl}${saved}/`);
+      if (res.ok && !data.complete) return data;
+      localStorage.removeItem(resumeKey(file));
+    }
+    const { res, data } = await api(form, uploadsUrl, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ filename: file.name, size: file.size, sha256: await sha256Hex(file) }),
+    });
+    if (!res.ok) throw new Error(data.error || 'Unable to start upload');
+    localStorage.setItem(resumeKey(file), data.upload_id);
+    return data;
+  }
+
+  async function sendChunked(form, file, onProgress) {
+    const state = await startOrResume(form, file);
+    const base = `${uploadsUrl}${state.upload_id}/`;
+    let offset = state.offset || 0;
+    let retries = 0;
+    while (offset < file.size) {
+      const part = file.slice(offset, offset + state.chunk_size);
+      try {
+        const { res, data } = await api(form, base, {
+          method: 'PUT',
+          headers: { 'Upload-Offset': String(offset), 'Content-Type': 'application/octet-stream' },
+          body: part,
+        });
+        if (res.status === 409 && typeof data.offset === 'number') {
+          offset = data.offset;  // Server has more (or less) than we thought; realign
+          continue;
+        }
+        if (!res.ok) throw new Error(data.error || 'Upload failed');
+        offset = data.offset;
+        retries = 0;
+        if (onProgress) onProgress(file, offset / file.size);
+      } catch (err) {
+        if (++retries > 5) throw err;
+        await new Promise((resolve) => setTimeout(resolve, 500 * 2 ** retries));
+        const { res, data } = await api(form, base);
+        if (res.ok) offset = data.offset;
+      }
+    }
+    const { res, data } = await api(form, `${base}complete/`, { method: 'POST' });
+    localStorage.removeItem(resumeKey(file));
+    if (!res.ok) throw new Error(data.error || 'Upload verification failed');
+    return state.upload_id;
+  }
+
+  // Upload every selected file of `inputs`; resolves true once all keys or
+  // upload ids are in the form, false if anything failed (the form is left
+  // untouched, so the files go up with a normal multipart post).
+  // `onProgress(file, ratio)`; `ratio` is only known for chunked uploads.
+  async function uploadInputs(form, inputs, onProgress) {
+    const fields = [];
+    let direct = true;  // Until the site says media is stored locally
+    try {
+      for (const input of inputs) {
+        const name = input.dataset.fieldName || input.name;
+        for (const file of Array.from(input.files || [])) {
+          if (onProgress) onProgress(file, null);
+          const grant = direct ? await presign(form, input, file) : null;
+          if (grant) {
+            await sendDirect(grant.upload, file);
+            fields.push([`${name}_key`, grant.claim]);
+          } else {
+            direct = false;
+            fields.push([`${name}_upload`, await sendChunked(form, file, onProgress)]);
+          }
+        }
+      }
+    } catch (err) {
+      console.error(err);
+      return false;
+    }
+    fields.forEach(([name, value]) => {
+      const hidden = document.createElement('input');
+      hidden.type = 'hidden';
+      hidden.name = name;
+      hidden.value = value;
+      form.appendChild(hidden);
+    });
+    inputs.forEach((input) => {
+      input.dataset.fieldName = input.dataset.fieldName || input.name;
+      input.removeAttribute('required');
+      input.removeAttribute('name');  // Bytes are already stored
+    });
+    return true;
+  }
+
+  window.DirectUpload = { uploadInputs };
+
+  document.querySelectorAll('form[data-direct-upload]').forEach((form) => {
+    if (!window.fetch || !window.FormData || !window.Blob) return;
+    form.addEventListener('submit', async (event) => {
+      if (form.dataset.directDone) return;
+      const inputs = Array.from(form.querySelectorAll('input[type="file"][data-purpose]'))
+        .filter((input) => input.name && input.files?.length);
+      if (!inputs.length) return;
+      event.preventDefault();
+      const button = form.querySelector('[type="submit"]');
+      const label = button?.textContent;
+      button?.setAttribute('disabled', 'true');
+      await uploadInputs(form, inputs, (file, ratio) => {
+        if (!button) return;
+        button.textContent = ratio == null ? `Uploading ${file.name}…` : `Uploading ${file.name}… ${Math.round(ratio * 100)}%`;
+      });
+      // On failure the files are still attached and go up as a normal multipart post
+      form.dataset.directDone = 'true';
+      if (button) button.textContent = label;
+      form.submit();
+    });
+  });
+})();
@@ -1,13 +1,20 @@
-// Search and filter functionality for gallery
+// Search and filter for the works gallery. The server's facet index answers
+// each selection (/api/projects/filter/), returning only the matching
+// project sections and the updated counts, so the page never needs the
+// whole catalogue; projects-loader.js keeps paging within the selection.
 document.addEventListener('DOMContentLoaded', function() {
+  const DEBOUNCE_MS = 200;
   const searchInput = document.getElementById('searchInput');
   const filterButtons = document.querySelectorAll('.filter-btn');
-  const projects = document.querySelectorAll('.project-section[data-project]');
   const gallery = document.querySelector('.works-gallery-grid');
-  
-  let currentFilter = 'all';
-  let currentSearch = '';
-  
+  if (!gallery || !gallery.dataset.filterUrl) return;
+
+  const activeButton = document.querySelector('.filter-btn.active');
+  let currentFilter = activeButton ? activeButton.dataset.filter : 'all';
+  let currentSearch = searchInput ? searchInput.value : '';
+  let controller = null;
+  let timer = null;
+
   // Create no results message if it doesn't exist
   let noResults = gallery.querySelector('.no-results');
   if (!noResults) {
@@ -16,61 +23,79 @@ document.addEventListener('DOMContentLoaded', function() {
     noResults.textContent = 'No projects found matching your criteria.';
     gallery.appendChild(noResults);
   }
-  
-  // Filter and search function
-  function filterProjects() {
-    let visibleCount = 0;
-    
-    projects.forEach(project => {
-      const title = project.dataset.title || '';
-      const category = project.dataset.category || 'all';
-      
-      // Check if project matches search
-      const matchesSearch = title.includes(currentSearch.toLowerCase());
-      
-      // Check if project matches filter
-      const matchesFilter = currentFilter === 'all' || category === currentFilter;
-      
-      // Show/hide project
-      if (matchesSearch && matchesFilter) {
-        project.classList.remove('hidden');
-        visibleCount++;
-      } else {
-        project.classList.add('hidden');
-      }
+
+  function filterParams() {
+    const params = new URLSearchParams();
+    if (currentFilter !== 'all') params.set('category', currentFilter);
+    if (currentSearch.trim()) params.set('q', currentSearch.trim());
+    return params;
+  }
+
+  function updateCounts(counts) {
+    let all = 0;
+    Object.values(counts).forEach(n => { all += n; });
+    filterButtons.forEach(button => {
+      const count = button.querySelector('.filter-count');
+      if (!count) return;
+      const value = button.dataset.filter;
+      count.textContent = value === 'all' ? all : (counts[value] || 0);
     });
-    
-    // Show/hide no results message
-    if (visibleCount === 0) {
-      noResults.classList.add('show');
-    } else {
-      noResults.classList.remove('show');
+  }
+
+  async function filterProjects() {
+    if (controller) controller.abort();
+    controller = new AbortController();
+    const params = filterParams();
+    try {
+      const response = await fetch(`${gallery.dataset.filterUrl}?format=html&${params}`, {
+        headers: { 'Accept': 'application/json' },
+        signal: controller.signal,
+      });
+      if (!response.ok) throw new Error(`HTTP ${response.status}`);
+      const data = await response.json();
+
+      gallery.querySelectorAll('.project-section, .works-page, .no-projects').forEach(el => el.remove());
+      const holder = document.createElement('div');
+      holder.innerHTML = data.html;
+      const added = document.createElement('div');
+      added.className = 'works-page';
+      added.style.display = 'contents';
+      added.append(...holder.childNodes);
+      gallery.insertBefore(added, noResults);
+
+      noResults.classList.toggle('show', data.total === 0);
+      updateCounts((data.counts && data.counts.category) || {});
+      history.replaceState(null, '', params.toString() ? `?${params}` : window.location.pathname);
+      document.dispatchEvent(new CustomEvent('projects:added', { detail: { root: added } }));
+      document.dispatchEvent(new CustomEvent('projects:filtered', {
+        detail: { root: added, cursor: data.next_cursor, query: params.toString() },
+      }));
+    } catch (err) {
+      if (err.name !== 'AbortError') noResults.classList.add('show');
     }
   }
-  
+
   // Search input handler
   if (searchInput) {
     searchInput.addEventListener('input', (e) => {
       currentSearch = e.target.value;
-      filterProjects();
+      clearTimeout(timer);
+      timer = setTimeout(filterProjects, DEBOUNCE_MS);
     });
   }
-  
+
   // Filter button handlers
   filterButtons.forEach(button => {
     button.addEventListener('click', () => {
       // Update active state
       filterButtons.forEach(btn => btn.classList.remove('active'));
       button.classList.add('active');
-      
+
       // Update current filter
       currentFilter = button.dataset.filter;
-      
+
       // Apply filter
       filterProjects();
     });
   });
-  
-  // Initialize
-  filterProjects();
 });
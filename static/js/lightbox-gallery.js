@@ -294,7 +294,26 @@
       if (!item) return;
 
       this.mainImg.classList.remove('is-loaded');
-      this.mainImg.onload = () => this.mainImg.classList.add('is-loaded');
+      // Reserve the image's box and show its placeholder (gallery API `meta`)
+      const meta = item.meta || {};
+      if (meta.width && meta.height) {
+        this.mainImg.width = meta.width;
+        this.mainImg.height = meta.height;
+      } else {
+        this.mainImg.removeAttribute('width');
+        this.mainImg.removeAttribute('height');
+      }
+      const placeholder = [meta.color, meta.lqip && `url(${meta.lqip})`].filter(Boolean).join(' ');
+      if (placeholder) {
+        this.mainImg.style.setProperty('--placeholder', placeholder);
+        this.mainImg.setAttribute('data-placeholder', '');
+      } else {
+        this.mainImg.removeAttribute('data-placeholder');
+      }
+      this.mainImg.onload = () => {
+        this.mainImg.classList.add('is-loaded');
+        this.mainImg.removeAttribute('data-placeholder');
+      };
       this.mainImg.src = item.src;
       this.mainImg.alt = item.alt || item.title || 'Gallery image';
       if (this.mainImg.complete && this.mainImg.naturalWidth) {
@@ -8,6 +8,27 @@ const closeBtn = document.querySelector('.lightbox-close');
 const prevBtn = document.querySelector('.lightbox-prev');
 const nextBtn = document.querySelector('.lightbox-next');
 
+// Size and blur placeholder of the carousel image being enlarged ({% image_attrs %})
+function showImage(src) {
+  const source = document.querySelector(`.carousel-slide[data-image="${CSS.escape(src)}"] img`);
+  ['width', 'height'].forEach(name => {
+    if (source && source.hasAttribute(name)) {
+      lightboxImage.setAttribute(name, source.getAttribute(name));
+    } else {
+      lightboxImage.removeAttribute(name);
+    }
+  });
+  const placeholder = source && source.style.getPropertyValue('--placeholder');
+  if (placeholder) {
+    lightboxImage.style.setProperty('--placeholder', placeholder);
+    lightboxImage.setAttribute('data-placeholder', '');
+    lightboxImage.onload = () => lightboxImage.removeAttribute('data-placeholder');
+  } else {
+    lightboxImage.removeAttribute('data-placeholder');
+  }
+  lightboxImage.src = src;
+}
+
 function openLightbox(src, images = null) {
   if (images) {
     currentImages = images;
@@ -17,7 +38,7 @@ function openLightbox(src, images = null) {
     currentIndex = 0;
   }
   
-  lightboxImage.src = src;
+  showImage(src);
   lightbox.classList.add('is-open');
   document.body.style.overflow = 'hidden';
 }
@@ -29,12 +50,12 @@ function closeLightbox() {
 
 function showNext() {
   currentIndex = (currentIndex + 1) % currentImages.length;
-  lightboxImage.src = currentImages[currentIndex];
+  showImage(currentImages[currentIndex]);
 }
 
 function showPrev() {
   currentIndex = (currentIndex - 1 + currentImages.length) % currentImages.length;
-  lightboxImage.src = currentImages[currentIndex];
+  showImage(currentImages[currentIndex]);
 }
 
 // Event listeners
@@ -0,0 +1,110 @@
+// Incremental works page: fetch further project sections (of the current
+// filter selection) on scroll and load thumbnail strips (small
+// derivatives) only when they come into view
+document.addEventListener('DOMContentLoaded', function() {
+  const gallery = document.querySelector('.works-gallery-grid');
+  const more = document.querySelector('[data-projects-more]');
+
+  const thumbObserver = 'IntersectionObserver' in window
+    ? new IntersectionObserver((entries, observer) => {
+        entries.forEach(entry => {
+          if (!entry.isIntersecting) return;
+          loadThumbs(entry.target);
+          observer.unobserve(entry.target);
+        });
+      }, { rootMargin: '200px 0px' })
+    : null;
+
+  function loadThumbs(strip) {
+    strip.querySelectorAll('img[data-src]').forEach(img => {
+      img.src = img.dataset.src;
+      img.removeAttribute('data-src');
+    });
+  }
+
+  function watchThumbs(root) {
+    root.querySelectorAll('[data-lazy-thumbs]').forEach(strip => {
+      if (thumbObserver) {
+        thumbObserver.observe(strip);
+      } else {
+        loadThumbs(strip);
+      }
+    });
+  }
+
+  watchThumbs(document);
+
+  if (!gallery || !more) return;
+
+  let cursor = more.dataset.cursor;
+  let query = more.dataset.query || '';
+  let loading = false;
+  let failed = false;
+
+  async function loadMore() {
+    if (loading || !cursor) return;
+    loading = true;
+    try {
+      const filter = query ? `&${query}` : '';
+      const response = await fetch(`${more.dataset.url}?format=html&cursor=${encodeURIComponent(cursor)}${filter}`, {
+        headers: { 'Accept': 'application/json' }
+      });
+      if (!response.ok) throw new Error(`HTTP ${response.status}`);
+      const data = await response.json();
+
+      const holder = document.createElement('div');
+      holder.innerHTML = data.html;
+      const added = document.createElement('div');
+      added.className = 'works-page';
+      added.style.display = 'contents';
+      added.append(...holder.childNodes);
+      gallery.insertBefore(added, gallery.querySelector('.no-results'));
+
+      watchThumbs(added);
+      document.dispatchEvent(new CustomEvent('projects:added', { detail: { root: added } }));
+      cursor = data.next_cursor;
+    } catch (err) {
+      cursor = null;
+      failed = true;
+      more.textContent = 'Could not load more projects.';
+    } finally {
+      loading = false;
+    }
+
+    if (!cursor) {
+      pageObserver && pageObserver.disconnect();
+      if (!failed) more.hidden = true;
+    } else if (isNearViewport()) {
+      loadMore();  // Sentinel still visible (short pages or filtered sections)
+    }
+  }
+
+  function isNearViewport() {
+    const rect = more.getBoundingClientRect();
+    return rect.top < window.innerHeight + 600;
+  }
+
+  const pageObserver = 'IntersectionObserver' in window
+    ? new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) loadMore();
+      }, { rootMargin: '600px 0px' })
+    : null;
+
+  // filter.js replaced the sections: continue paging within the new selection
+  document.addEventListener('projects:filtered', (e) => {
+    watchThumbs(e.detail.root);
+    cursor = e.detail.cursor;
+    query = e.detail.query;
+    failed = false;
+    more.textContent = '';
+    more.hidden = !cursor;
+    if (cursor && pageObserver) pageObserver.observe(more);
+  });
+
+  if (pageObserver) {
+    pageObserver.observe(more);
+  } else {
+    // The page scrolls inside .page-scroll, so listen in the capture phase
+    document.addEventListener('scroll', () => { if (isNearViewport()) loadMore(); }, { capture: true, passive: true });
+  }
+});
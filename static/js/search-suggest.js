@@ -0,0 +1,122 @@
+// Search-as-you-type suggestions for inputs marked with data-suggest-url
+document.addEventListener('DOMContentLoaded', function() {
+  const DEBOUNCE_MS = 150;
+  const MIN_CHARS = 1;
+
+  document.querySelectorAll('input[data-suggest-url]').forEach(setupSuggest);
+
+  function setupSuggest(input) {
+    const endpoint = input.dataset.suggestUrl;
+    const form = input.closest('form');
+    const list = document.createElement('ul');
+    list.className = 'suggest-list';
+    list.id = `${input.name || 'search'}-suggestions`;
+    list.setAttribute('role', 'listbox');
+    list.hidden = true;
+    input.insertAdjacentElement('afterend', list);
+    input.setAttribute('autocomplete', 'off');
+    input.setAttribute('role', 'combobox');
+    input.setAttribute('aria-autocomplete', 'list');
+    input.setAttribute('aria-controls', list.id);
+    input.setAttribute('aria-expanded', 'false');
+
+    const cache = new Map();
+    let timer = null;
+    let controller = null;
+    let active = -1;
+
+    function close() {
+      list.hidden = true;
+      list.innerHTML = '';
+      active = -1;
+      input.setAttribute('aria-expanded', 'false');
+      input.removeAttribute('aria-activedescendant');
+    }
+
+    function highlight(index) {
+      const options = list.querySelectorAll('[role="option"]');
+      if (!options.length) return;
+      active = (index + options.length) % options.length;
+      options.forEach((option, n) => option.setAttribute('aria-selected', n === active ? 'true' : 'false'));
+      input.setAttribute('aria-activedescendant', options[active].id);
+    }
+
+    function render(suggestions) {
+      list.innerHTML = '';
+      active = -1;
+      if (!suggestions.length) {
+        close();
+        return;
+      }
+      suggestions.forEach((suggestion, n) => {
+        const option = document.createElement('li');
+        option.id = `${list.id}-${n}`;
+        option.setAttribute('role', 'option');
+        option.setAttribute('aria-selected', 'false');
+        const link = document.createElement('a');
+        link.href = suggestion.url;
+        link.textContent = suggestion.label;
+        const kind = document.createElement('span');
+        kind.className = 'suggest-kind';
+        kind.textContent = suggestion.kind;
+        link.appendChild(kind);
+        option.appendChild(link);
+        list.appendChild(option);
+      });
+      list.hidden = false;
+      input.setAttribute('aria-expanded', 'true');
+    }
+
+    async function fetchSuggestions(query) {
+      if (cache.has(query)) {
+        render(cache.get(query));
+        return;
+      }
+      if (controller) controller.abort();
+      controller = new AbortController();
+      try {
+        const response = await fetch(`${endpoint}?q=${encodeURIComponent(query)}`, {
+          signal: controller.signal,
+          headers: { 'Accept': 'application/json' }
+        });
+        if (!response.ok) return;
+        const data = await response.json();
+        cache.set(query, data.suggestions);
+        if (input.value.trim() === query) render(data.suggestions);
+      } catch (err) {
+        if (err.name !== 'AbortError') close();
+      }
+    }
+
+    input.addEventListener('input', () => {
+      clearTimeout(timer);
+      const query = input.value.trim();
+      if (query.length < MIN_CHARS) {
+        if (controller) controller.abort();
+        close();
+        return;
+      }
+      timer = setTimeout(() => fetchSuggestions(query), DEBOUNCE_MS);
+    });
+
+    input.addEventListener('keydown', (e) => {
+      if (list.hidden) return;
+      if (e.key === 'ArrowDown') {
+        e.preventDefault();
+        highlight(active + 1);
+      } else if (e.key === 'ArrowUp') {
+        e.preventDefault();
+        highlight(active - 1);
+      } else if (e.key === 'Enter' && active >= 0) {
+        e.preventDefault();
+        window.location.href = list.querySelectorAll('a')[active].href;
+      } else if (e.key === 'Escape') {
+        close();
+      }
+    });
+
+    document.addEventListener('click', (e) => {
+      if (!(form || input.parentElement).contains(e.target)) close();
+    });
+  }
+});
@@ -0,0 +1,6 @@
+// Registers the site's service worker (served from /sw.js, see static/js/sw.js)
+if ('serviceWorker' in navigator) {
+  window.addEventListener('load', () => {
+    navigator.serviceWorker.register('/sw.js', { scope: '/' }).catch(() => {});
+  });
+}
@@ -0,0 +1,158 @@
+// Service worker for repeat visits and offline reading. Served from /sw.js,
+// which prepends CONFIG (see views._service_worker_config). Its version
+// changes with every asset build, so page and bundle caches from older
+// builds are dropped on activate.
+//
+// - pages: stale-while-revalidate (the navigation right after a form post,
+//   and hard reloads, go to the network so flash messages and edits show;
+//   the page after a post is not stored, or its messages would come back);
+// - content-hashed images and static files: cache-first, they never change;
+// - other images: stale-while-revalidate.
+// Each cache is capped at CONFIG.limits entries, evicting the least
+// recently used.
+const PAGES = `rb-pages-${CONFIG.version}`;
+const ASSETS = `rb-assets-${CONFIG.version}`;
+const IMAGES = 'rb-images-v1';  // Keyed by URL, so it survives asset builds
+const CURRENT = [PAGES, ASSETS, IMAGES];
+
+// Same rule as mediaserve._HASHED_NAME_RE: only names the site generates with
+// a hash or random token in a fixed place (and collectstatic manifest names)
+const HASHED_NAME = new RegExp(
+  '^(?:project_\\d{14}_[0-9a-f]{8}|(?:bulk|direct)-\\d{14}-[0-9a-f]{8}|[\\w-]+\\.[0-9a-f]{8}'
+  + '|\\d{14}-[\\w-]*-[0-9a-f]{6}-(?:full|thumb)|.+\\.[0-9a-f]{12})(?:-\\d+)?$',
+);
+const IMAGE_EXT = /\.(?:avif|gif|jpe?g|png|svg|webp)$/i;
+
+let bypassNextPage = false;
+
+self.addEventListener('install', (event) => {
+  event.waitUntil((async () => {
+    const cache = await caches.open(ASSETS);
+    // A bundle that fails to load must not block the new version
+    await Promise.allSettled(CONFIG.precache.map((url) => cache.add(url)));
+    await self.skipWaiting();
+  })());
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil((async () => {
+    const names = await caches.keys();
+    await Promise.all(names
+      .filter((name) => name.startsWith('rb-') && !CURRENT.includes(name))
+      .map((name) => caches.delete(name)));
+    await self.clients.claim();
+  })());
+});
+
+self.addEventListener('fetch', (event) => {
+  const { request } = event;
+  const url = new URL(request.url);
+  if (request.method !== 'GET') {
+    if (request.mode === 'navigate') bypassNextPage = true;
+    return;
+  }
+  if (url.origin !== self.location.origin || request.headers.has('Range')) return;
+
+  if (request.mode === 'navigate' && isPage(url.pathname)) {
+    const afterPost = bypassNextPage;
+    const bypass = afterPost || request.cache === 'reload' || request.cache === 'no-cache';
+    bypassNextPage = false;
+    event.respondWith(bypass ? networkFirst(event, PAGES, !afterPost) : staleWhileRevalidate(event, PAGES));
+  } else if (isImage(url.pathname)) {
+    const hashed = HASHED_NAME.test(basename(url.pathname));
+    event.respondWith(hashed ? cacheFirst(event, IMAGES) : staleWhileRevalidate(event, IMAGES));
+  } else if (url.pathname.startsWith(CONFIG.staticUrl) && HASHED_NAME.test(basename(url.pathname))) {
+    event.respondWith(cacheFirst(event, ASSETS));
+  }
+});
+
+function basename(path) {
+  const name = path.slice(path.lastIndexOf('/') + 1);
+  const dot = name.lastIndexOf('.');
+  return dot > 0 ? name.slice(0, dot) : name;
+}
+
+function isPage(path) {
+  if (CONFIG.pages.includes(path)) return true;
+  if (!path.startsWith(CONFIG.articlePrefix) || CONFIG.exclude.includes(path)) return false;
+  return /^[\w-]+\/$/.test(path.slice(CONFIG.articlePrefix.length));
+}
+
+function isImage(path) {
+  return IMAGE_EXT.test(path) && CONFIG.imagePrefixes.some((prefix) => path.startsWith(prefix));
+}
+
+function cacheable(response) {
+  if (!response || response.status !== 200 || response.type !== 'basic') return false;
+  return !/no-store|private/.test(response.headers.get('Cache-Control') || '');
+}
+
+async function store(cacheName, request, response) {
+  const cache = await caches.open(cacheName);
+  await cache.put(request, response);
+  await trim(cache, CONFIG.limits[cacheName.split('-')[1]]);
+}
+
+// Cache.keys() is in insertion order: re-inserting on use keeps the least
+// recently used entries at the front. Entries already among the newest
+// quarter are left alone to save rewriting them on every hit.
+async function touch(cacheName, request, response) {
+  const cache = await caches.open(cacheName);
+  const keys = await cache.keys();
+  const index = keys.findIndex((key) => key.url === request.url);
+  if (index === -1 || index >= keys.length * 0.75) return;
+  await cache.delete(keys[index]);
+  await cache.put(keys[index], response);
+}
+
+async function trim(cache, limit) {
+  const keys = await cache.keys();
+  await Promise.all(keys.slice(0, Math.max(0, keys.length - limit)).map((key) => cache.delete(key)));
+}
+
+async function cacheFirst(event, cacheName) {
+  const { request } = event;
+  const cached = await caches.match(request, { cacheName });
+  if (cached) {
+    event.waitUntil(touch(cacheName, request, cached.clone()));
+    return cached;
+  }
+  const response = await fetch(request);
+  if (cacheable(response)) event.waitUntil(store(cacheName, request, response.clone()));
+  return response;
+}
+
+async function staleWhileRevalidate(event, cacheName) {
+  const { request } = event;
+  const cached = await caches.match(request, { cacheName });
+  const network = fetch(request).then((response) => {
+    if (cacheable(response)) event.waitUntil(store(cacheName, request, response.clone()));
+    return response;
+  });
+  if (cached) {
+    event.waitUntil(network.catch(() => null));
+    event.waitUntil(touch(cacheName, request, cached.clone()));
+    return cached;
+  }
+  return network.catch(() => offline(request));
+}
+
+async function networkFirst(event, cacheName, save = true) {
+  const { request } = event;
+  try {
+    const response = await fetch(request);
+    if (save && cacheable(response)) event.waitUntil(store(cacheName, request, response.clone()));
+    return response;
+  } catch (err) {
+    return (await caches.match(request, { cacheName })) || offline(request);
+  }
+}
+
+function offline(request) {
+  if (request.mode !== 'navigate') return Response.error();
+  return new Response(
+    '<!doctype html><meta charset="utf-8"><title>Offline</title>' +
+    '<p style="font-family:sans-serif;padding:2rem">You are offline and this page has not been saved yet.</p>',
+    { status: 503, headers: { 'Content-Type': 'text/html; charset=utf-8' } },
+  );
+}
@@ -1,31 +1,44 @@
-// Works page: single inline gallery that fetches by galleryId and enforces per-instance caps.
+// Works page: inline galleries fetched by galleryId with per-instance caps.
+// First screens for every gallery come from one batch request; remaining pages
+// are fetched lazily by cursor once a gallery scrolls into view.
 (function () {
-  const mountEl = document.getElementById('worksInlineGallery');
-  if (!mountEl || typeof GalleryViewer !== 'function') return;
+  const mountEls = Array.from(
+    document.querySelectorAll('#worksInlineGallery, [data-works-gallery]')
+  );
+  if (!mountEls.length || typeof GalleryViewer !== 'function') return;
 
-  const galleryId = mountEl.dataset.galleryId || 'default';
-  const addUrl = mountEl.dataset.addUrl || `/works/${galleryId}/add/`;
-  const userRole = mountEl.dataset.userRole || 'viewer';
-  const apiBase = `/api/galleries/${galleryId}/items/`;
-  const selectId = mountEl.dataset.selectId || '';
-  let viewer = null;
+  const FIRST_PAGE_SIZE = 12;
+  const PAGE_SIZE = 48;
+  const batchUrl = '/api/galleries/batch/';
+  const galleries = new Map();
 
   function getCSRFToken() {
     const match = document.cookie.match(/csrftoken=([^;]+)/);
     return match ? match[1] : '';
   }
 
-  async function fetchItems() {
-    const res = await fetch(apiBase, { headers: { Accept: 'application/json' } });
+  async function fetchJSON(url) {
+    const res = await fetch(url, { headers: { Accept: 'application/json' } });
     if (!res.ok) throw new Error('Failed to load gallery items');
     return res.json();
   }
 
-  async function deleteItem(itemId) {
-    if (userRole !== 'admin') return;
+  function fetchFirstPages(ids) {
+    const params = new URLSearchParams({ ids: ids.join(','), page_size: FIRST_PAGE_SIZE });
+    return fetchJSON(`${batchUrl}?${params}`);
+  }
+
+  function fetchPage(gallery, cursor) {
+    const params = new URLSearchParams({ page_size: PAGE_SIZE });
+    if (cursor) params.set('cursor', cursor);
+    return fetchJSON(`${gallery.apiBase}?${params}`);
+  }
+
+  async function deleteItem(gallery, itemId) {
+    if (gallery.userRole !== 'admin') return;
     const confirmDelete = window.confirm('Remove this picture?');
     if (!confirmDelete) return;
-    const res = await fetch(`${apiBase}${encodeURIComponent(itemId)}/`, {
+    const res = await fetch(`${gallery.apiBase}${encodeURIComponent(itemId)}/`, {
       method: 'DELETE',
       headers: { 'X-CSRFToken': getCSRFToken() },
     });
@@ -33,35 +46,108 @@
       alert('Unable to delete. Please try again.');
       return;
     }
-    await loadAndRender();
+    await reload(gallery);
   }
 
-  function initViewer(items, limit) {
-    if (viewer) {
-      viewer.setItems(items, limit);
-      if (selectId) viewer.goToId(selectId);
+  function render(gallery) {
+    if (gallery.viewer) {
+      gallery.viewer.setItems(gallery.items, gallery.limit);
+      if (gallery.selectId) gallery.viewer.goToId(gallery.selectId);
       return;
     }
-    viewer = new GalleryViewer({
-      mountEl,
-      galleryId,
-      items,
-      limit,
-      currentUserRole: userRole,
+    gallery.viewer = new GalleryViewer({
+      mountEl: gallery.mountEl,
+      galleryId: gallery.id,
+      items: gallery.items,
+      limit: gallery.limit,
+      currentUserRole: gallery.userRole,
       enableFilters: true,
       enableSearch: true,
-      onAddItem: () => window.location.href = addUrl,
-      onDeleteItem: (itemId) => deleteItem(itemId),
+      onAddItem: () => window.location.href = gallery.addUrl,
+      onDeleteItem: (itemId) => deleteItem(gallery, itemId),
     });
-    if (selectId) viewer.goToId(selectId);
+    if (gallery.selectId) gallery.viewer.goToId(gallery.selectId);
+  }
+
+  function applyPage(gallery, data, append) {
+    const items = Array.isArray(data.items) ? data.items : [];
+    gallery.items = append ? gallery.items.concat(items) : items;
+    gallery.limit = data.limit;
+    gallery.nextCursor = data.next_cursor || null;
+    render(gallery);
+  }
+
+  async function loadRemaining(gallery) {
+    if (gallery.loading) return;
+    gallery.loading = true;
+    try {
+      while (gallery.nextCursor) {
+        const data = await fetchPage(gallery, gallery.nextCursor);
+        applyPage(gallery, data, true);
+      }
+    } catch (err) {
+      console.error(err);
+    } finally {
+      gallery.loading = false;
+    }
   }
 
+  async function reload(gallery) {
+    try {
+      const data = await fetchPage(gallery, null);
+      applyPage(gallery, data, false);
+      await loadRemaining(gallery);
+    } catch (err) {
+      console.error(err);
+    }
+  }
+
+  function watchForRest(gallery) {
+    if (!gallery.nextCursor) return;
+    if (!('IntersectionObserver' in window)) {
+      loadRemaining(gallery);
+      return;
+    }
+    const observer = new IntersectionObserver((entries) => {
+      if (entries.some((entry) => entry.isIntersecting)) {
+        observer.disconnect();
+        loadRemaining(gallery);
+      }
+    }, { rootMargin: '400px' });
+    observer.observe(gallery.mountEl);
+  }
+
+  mountEls.forEach((mountEl) => {
+    const id = mountEl.dataset.galleryId || 'default';
+    galleries.set(id, {
+      id,
+      mountEl,
+      addUrl: mountEl.dataset.addUrl || `/works/${id}/add/`,
+      userRole: mountEl.dataset.userRole || 'viewer',
+      apiBase: `/api/galleries/${id}/items/`,
+      selectId: mountEl.dataset.selectId || '',
+      items: [],
+      limit: null,
+      nextCursor: null,
+      viewer: null,
+      loading: false,
+    });
+  });
+
   async function loadAndRender() {
     try {
-      const data = await fetchItems();
-      const items = Array.isArray(data.items) ? data.items : [];
-      const limit = data.limit;
-      initViewer(items, limit);
+      const data = await fetchFirstPages(Array.from(galleries.keys()));
+      galleries.forEach((gallery, id) => {
+        const page = data.galleries && data.galleries[id];
+        if (!page) return;
+        applyPage(gallery, page, false);
+        // A deep-linked item may live beyond the first page
+        if (gallery.selectId && !gallery.items.some((item) => item.id === gallery.selectId)) {
+          loadRemaining(gallery);
+        } else {
+          watchForRest(gallery);
+        }
+      });
     } catch (err) {
       console.error(err);
     }